@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: per-object Indicator updates vs the cross-sectional engine.
+
+Builds a random universe of InstrumentInterval histories and times updating
+every signals.indicator class per instrument against compute_indicators on
+(instrument x lookback) arrays.
+
+Usage:
+    python scripts/benchmark_indicator_engine.py --instruments 3000 --lookback 10
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from signals.indicator_config import IndicatorConfig
+from signals.indicator_engine import compute_indicators, history_arrays
+from state.instrument_interval import InstrumentInterval
+
+
+def make_history(n_instruments: int, lookback: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    low = rng.uniform(50, 100, (n_instruments, lookback))
+    high = low + rng.uniform(0, 5, (n_instruments, lookback))
+    close = low + (high - low) * rng.random((n_instruments, lookback))
+    ok = rng.random((n_instruments, lookback)) > 0.02
+    base = datetime(2024, 1, 1)
+    history = {
+        iid: [
+            InstrumentInterval(iid, base + timedelta(days=d), base + timedelta(days=d), low[iid, d],
+                               high[iid, d], low[iid, d], close[iid, d], 100, 1000, 'ok' if ok[iid, d] else 'invalid')
+            for d in range(lookback)
+        ]
+        for iid in range(n_instruments)
+    }
+    return history, (high, low, close, ok)
+
+
+def run(n_instruments: int, lookback: int, repeat: int) -> None:
+    history, (high, low, close, ok) = make_history(n_instruments, lookback)
+    config = IndicatorConfig.default_config()
+
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for iid, intervals in history.items():
+            for indicator in config.create_indicator_instances().values():
+                indicator.update(intervals)
+    per_object = (time.perf_counter() - t0) / repeat
+
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        compute_indicators(high, low, close, ok)
+    engine = (time.perf_counter() - t0) / repeat
+
+    t0 = time.perf_counter()
+    history_arrays(history, lookback)
+    packing = time.perf_counter() - t0
+
+    print(f"{n_instruments} instruments x {lookback} intervals, {len(config)} indicators")
+    print(f"per-object: {per_object * 1000:8.2f} ms")
+    print(f"engine:     {engine * 1000:8.2f} ms  ({per_object / engine:,.0f}x)")
+    print(f"history_arrays packing from InstrumentInterval lists: {packing * 1000:.2f} ms (one-off per history)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the cross-sectional indicator engine")
+    parser.add_argument("--instruments", type=int, default=3000)
+    parser.add_argument("--lookback", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.instruments, args.lookback, args.repeat)
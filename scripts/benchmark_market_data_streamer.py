@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for MarketDataStreamer tick processing.
+
+Feeds synthetic ticks for N symbols (default 500) through the per-interval
+rolling statistics and through the full on_tick path, and reports ticks/sec.
+
+Usage:
+    python scripts/benchmark_market_data_streamer.py --symbols 500 --ticks 200000 [--workers 4] [--replay data/ticks]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from market_data import MarketDataStreamer, ShardedMarketDataStreamer
+from market_data.tick_recorder import TickReplay
+
+
+class Tick:
+    __slots__ = ('contract', 'last', 'lastSize', 'time', 'bid', 'ask')
+
+    def __init__(self, contract, price, size, time):
+        self.contract = contract
+        self.last = price
+        self.lastSize = size
+        self.time = time
+        self.bid = price - 0.01
+        self.ask = price + 0.01
+
+
+def make_ticks(n_symbols: int, n_ticks: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    symbols = [f"SYM{i:04d}" for i in range(n_symbols)]
+    contracts = [SimpleNamespace(symbol=s) for s in symbols]
+    sym_idx = rng.integers(0, n_symbols, n_ticks)
+    prices = 100 + np.cumsum(rng.normal(0, 0.05, n_ticks))
+    sizes = rng.integers(1, 1000, n_ticks)
+    # ~8 hours of ticks so the short windows evict continuously
+    start = datetime(2025, 7, 18, 8, 0)
+    step = timedelta(seconds=8 * 3600 / n_ticks)
+    ticks = [
+        Tick(contracts[i], float(p), int(v), start + k * step)
+        for k, (i, p, v) in enumerate(zip(sym_idx, prices, sizes))
+    ]
+    return symbols, ticks
+
+
+async def run_sharded(symbols, ticks, workers: int) -> float:
+    sharded = ShardedMarketDataStreamer(symbols, workers=workers, queue_maxsize=0)
+    await sharded.start()
+    t0 = time.perf_counter()
+    for tick in ticks:
+        sharded.on_tick(tick)
+    await sharded.stop()
+    elapsed = time.perf_counter() - t0
+    assert sharded.queue_stats()['enqueued'] == len(ticks)
+    return len(ticks) / elapsed
+
+
+def run(n_symbols: int, n_ticks: int, workers: int, replay: str = None) -> None:
+    if replay:
+        # Recorded ticks (TickRecorder output) instead of synthetic ones
+        ticks = list(TickReplay(replay))
+        symbols = sorted({tick.contract.symbol for tick in ticks})
+        n_symbols, n_ticks = len(symbols), len(ticks)
+    else:
+        symbols, ticks = make_ticks(n_symbols, n_ticks)
+
+    streamer = MarketDataStreamer(MagicMock(), symbols)
+    t0 = time.perf_counter()
+    for tick in ticks:
+        streamer._update_interval_signals(tick.contract.symbol, tick.time, tick.last, tick.lastSize)
+    elapsed = time.perf_counter() - t0
+    print(f"interval stats: {n_ticks / elapsed:,.0f} ticks/sec "
+          f"({n_symbols} symbols, {len(streamer.intervals)} intervals, {n_ticks} ticks)")
+
+    streamer = MarketDataStreamer(MagicMock(), symbols)
+    sample = ticks[: min(n_ticks, 20000)]
+    t0 = time.perf_counter()
+    for tick in sample:
+        streamer.on_tick(tick)
+        streamer._queue.get_nowait()
+    elapsed = time.perf_counter() - t0
+    print(f"full on_tick:   {len(sample) / elapsed:,.0f} ticks/sec (includes LSE session lookup on the real calendar)")
+
+    if workers > 1:
+        rate = asyncio.run(run_sharded(symbols, ticks, workers))
+        print(f"sharded:        {rate:,.0f} ticks/sec ({workers} worker processes, end to end)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark MarketDataStreamer tick processing")
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--ticks", type=int, default=200000)
+    parser.add_argument("--workers", type=int, default=0, help="also benchmark ShardedMarketDataStreamer")
+    parser.add_argument("--replay", help="directory of recorded .arrows tick files to replay instead")
+    args = parser.parse_args()
+    run(args.symbols, args.ticks, args.workers, args.replay)
@@ -1,19 +1,79 @@
+import asyncio
+import os
+import shutil
 import pandas as pd
-from datetime import datetime, timedelta
-from typing import List, Callable, Optional, Any
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, List, Callable, Optional, Any, Tuple
 
 from config.environment import Environment
+from db.pool_registry import enable_shared_pool, close_pool
 from market_data.market_data_manager import MarketDataManager
 from market_data.daily_price_market_data_manager import DailyPriceMarketDataManager
 from secmaster.security_master import SecurityMaster
 from state.universe_state_manager import UniverseStateManager
+from calendars.exchange_calendar import ExchangeCalendar
 from calendars.time_duration import TimeDuration
 from universe.universe_manager import UniverseManager
 
+async def _maybe_await(result):
+    if hasattr(result, '__await__'):
+        return await result
+    return result
+
+
+async def run_dependency_graph(jobs: Dict[Hashable, Callable[[], Any]], depends_on: Dict[Hashable, Iterable[Hashable]]) -> None:
+    """
+    Run ``jobs`` concurrently, starting each one once the jobs it depends on
+    have finished. Jobs may be plain callables or return awaitables; plain
+    callables run inline in declaration order. Dependencies on names that
+    are not in ``jobs`` are ignored.
+
+    Raises:
+        ValueError: If the dependencies contain a cycle
+    """
+    deps = {name: [d for d in depends_on.get(name, ()) if d in jobs] for name in jobs}
+    order, state = [], {}
+    def visit(name):
+        if state.get(name) == 'done':
+            return
+        if state.get(name) == 'visiting':
+            raise ValueError(f"Dependency cycle involving '{name}'")
+        state[name] = 'visiting'
+        for d in deps[name]:
+            visit(d)
+        state[name] = 'done'
+        order.append(name)
+    for name in jobs:
+        visit(name)
+
+    tasks: Dict[Hashable, asyncio.Future] = {}
+    async def run(name, upstream):
+        if upstream:
+            await asyncio.gather(*upstream)
+        await _maybe_await(jobs[name]())
+    for name in order:
+        tasks[name] = asyncio.ensure_future(run(name, [tasks[d] for d in deps[name]]))
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        raise
+
+
 class RunnerCallback:
     """
     Base class for runner callbacks. Users should subclass and implement desired hooks.
+    Hooks may be plain methods or coroutines. Callbacks run concurrently unless
+    they list the names of callbacks they must follow in ``depends_on``; a
+    callback's name is ``name`` if set (unique per runner), otherwise its
+    class name.
     """
+    name: Optional[str] = None
+    depends_on: Tuple[str, ...] = ()
+
     def handleStart(self, runner, current_time: datetime):
         pass
     def handleStartOfDay(self, runner, current_time: datetime):
@@ -36,7 +96,12 @@ class Runner:
         self.security_master = SecurityMaster(self.env)
         self.universe_state_manager = UniverseStateManager(self.env)
         self.universe_manager = UniverseManager(self.env)
-        self.market_data_manager = DailyPriceMarketDataManager(self.env)
+        self.market_data_manager = DailyPriceMarketDataManager(env=self.env)
+        exchange = self.env.get('trading', 'exchange', None)
+        self.exchange_calendar: Optional[ExchangeCalendar] = ExchangeCalendar(exchange) if exchange else None
+        # Parallel chunks other than the last one stop at their final EOD: the
+        # sequential run has no 'end' event there, so nothing may be flushed.
+        self.handle_end_event = True
 
     def _init_callbacks(self) -> List[RunnerCallback]:
         # Expect config to contain a list of callback classes/instances
@@ -73,10 +138,35 @@ class Runner:
         """
         Yields (datetime, type) tuples for each simulation event.
         'start' at the first second of the start date,
-        'interval' for each interval step,
-        'sod' at the first second of each day,
-        'eod' at the last second of each day,
+        'sod' at each session open,
+        'interval' for each interval step within the session,
+        'eod' at each session close,
         'end' at the last second of the end date.
+
+        Sessions come from ``self.exchange_calendar`` (``trading.exchange``),
+        so weekends, holidays and out-of-hours steps are skipped and early
+        closes end the day early. Without a calendar every calendar day is
+        treated as a 24h session (see ``_iter_calendar_day_events``).
+        """
+        if self.exchange_calendar is None:
+            yield from self._iter_calendar_day_events()
+            return
+        start_time = self.start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        yield (start_time, "start")
+        for _, market_open, market_close in self.exchange_calendar.sessions(self.start_date.date(), self.end_date.date()):
+            yield (market_open, "sod")
+            current_time = market_open
+            while current_time < market_close:
+                yield (current_time, "interval")
+                current_time = self._advance_time(current_time)
+            yield (market_close, "eod")
+        end_time = self.end_date.replace(hour=23, minute=59, second=59, microsecond=0)
+        yield (end_time, "end")
+
+    def _iter_calendar_day_events(self):
+        """
+        Legacy schedule: 'sod' at the first second and 'eod' at the last second
+        of every calendar day, with intervals stepping around the clock.
         """
         # START event
         start_time = self.start_date.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -106,95 +196,199 @@ class Runner:
         yield (end_time, "end")
 
     async def run(self):
+        # All DAOs used during the run share one pool; it is closed when the run ends.
+        enable_shared_pool(self.env)
+        try:
+            await self._run_events()
+        finally:
+            cancel_prefetch = getattr(self.market_data_manager, 'cancel_prefetch', None)
+            if cancel_prefetch is not None:
+                cancel_prefetch()
+            await close_pool(self.env)
+
+    def trading_days(self) -> List[date]:
+        """Dates the schedule covers: exchange sessions, or every calendar day without a calendar."""
+        if self.exchange_calendar is not None:
+            return [d for d, _, _ in self.exchange_calendar.sessions(self.start_date.date(), self.end_date.date())]
+        days = (self.end_date.date() - self.start_date.date()).days + 1
+        return [self.start_date.date() + timedelta(days=i) for i in range(days)]
+
+    def plan_chunks(self, chunks: int, warmup_days: int) -> List[Tuple[date, date, date]]:
+        """
+        Split the run into contiguous date chunks for parallel execution.
+
+        Returns (run_start, emit_start, end) per chunk: each chunk is replayed
+        from ``run_start``, up to ``warmup_days`` trading days before the
+        dates it owns, so indicator and ADV windows are primed; only output
+        from ``emit_start`` to ``end`` is kept. Warm-up never reaches before
+        the run's own start date, matching the sequential run.
+        """
+        days = self.trading_days()
+        if not days:
+            return []
+        chunks = max(1, min(chunks, len(days)))
+        size, extra = divmod(len(days), chunks)
+        plan = []
+        first = 0
+        for i in range(chunks):
+            last = first + size + (1 if i < extra else 0) - 1
+            plan.append((days[max(0, first - warmup_days)], days[first], days[last]))
+            first = last + 1
+        return plan
+
+    async def run_parallel(self, workers: Optional[int] = None, warmup_days: Optional[int] = None,
+                           executor: Optional[Executor] = None) -> List[str]:
+        """
+        Run the backtest as date chunks in a process pool and merge the
+        UniverseStateManager outputs in chronological order.
+
+        Each worker builds its own Runner (same class, environment and
+        universe) over ``run_start..end`` and writes state files to a private
+        chunk directory; warm-up output is discarded during the merge. The
+        environment is pickled into each job, so config overrides made on
+        ``self.env`` apply to the workers. Only the last chunk handles the
+        'end' event, as in a sequential run.
+
+        Args:
+            workers: Number of chunks/processes (default ``runner.parallel_workers`` or CPU count)
+            warmup_days: Trading days replayed before each chunk (default
+                ``runner.warmup_days``, then ``trading.indicator_lookback_days``)
+            executor: Executor to use instead of a new ProcessPoolExecutor
+
+        Returns:
+            Merged universe state timestamps, oldest first
+        """
+        if workers is None:
+            workers = int(self.env.get('runner', 'parallel_workers', os.cpu_count() or 1))
+        if warmup_days is None:
+            warmup_days = int(self.env.get('runner', 'warmup_days', self.env.get('trading', 'indicator_lookback_days', 0)))
+        plan = self.plan_chunks(workers, warmup_days)
+        chunks_dir = self.universe_state_manager.base_path / "chunks"
+        jobs = [
+            (type(self), self.env, self.universe_id, run_start, emit_start, end,
+             str(chunks_dir / f"{i:04d}"), i == len(plan) - 1)
+            for i, (run_start, emit_start, end) in enumerate(plan)
+        ]
+        loop = asyncio.get_running_loop()
+        own_executor = executor is None
+        executor = executor or ProcessPoolExecutor(max_workers=workers)
+        try:
+            await asyncio.gather(*(loop.run_in_executor(executor, _run_chunk, job) for job in jobs))
+        finally:
+            if own_executor:
+                executor.shutdown()
+        merged = []
+        for _, _, _, _, emit_start, end, chunk_dir, _ in jobs:
+            merged.extend(self._merge_chunk(Path(chunk_dir), emit_start, end))
+        shutil.rmtree(chunks_dir, ignore_errors=True)
+        return merged
+
+    def _merge_chunk(self, chunk_dir: Path, emit_start: date, end: date) -> List[str]:
+        """Move a chunk's state and metadata files for ``emit_start..end`` into this runner's state manager."""
+        usm = self.universe_state_manager
+        lo, hi = emit_start.strftime('%Y%m%d_000000'), end.strftime('%Y%m%d_235959')
+        merged = []
+        for path in sorted((chunk_dir / "states").glob("universe_state_*.parquet")):
+            timestamp = path.stem.replace("universe_state_", "")
+            if not lo <= timestamp <= hi:
+                continue
+            shutil.move(str(path), usm.states_dir / path.name)
+            meta = chunk_dir / "metadata" / f"metadata_{timestamp}.json"
+            if meta.exists():
+                shutil.move(str(meta), usm.metadata_dir / meta.name)
+            merged.append(timestamp)
+        return merged
+
+    # Manager SOD/EOD hooks and the managers each one must wait for; managers
+    # without a dependency between them are updated concurrently.
+    SOD_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+        'universe_manager': (),
+        'security_master': (),
+        'market_data_manager': (),
+        'universe_state_manager': ('universe_manager', 'security_master', 'market_data_manager'),
+    }
+    EOD_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+        'universe_state_manager': (),
+        'universe_manager': ('universe_state_manager',),
+        'security_master': ('universe_state_manager',),
+        'market_data_manager': ('universe_state_manager',),
+    }
+
+    async def _run_events(self):
         for event_time, event_type in self.iter_events():
             if event_type == "start":
-                for cb in self.callbacks:
-                    if hasattr(cb, 'handleStart'):
-                        cb.handleStart(self, event_time)
+                await self.dispatch('handleStart', event_time)
             elif event_type == "sod":
-                update = self.update_for_sod(event_time)
-                if hasattr(update, '__await__'):
-                    await update
-                for cb in self.callbacks:
-                    if hasattr(cb, 'handleStartOfDay'):
-                        cb.handleStartOfDay(self, event_time)
+                await self.update_for_sod(event_time)
+                await self.dispatch('handleStartOfDay', event_time)
             elif event_type == "interval":
-                for cb in self.callbacks:
-                    cb.handleInterval(self, event_time)
+                await self.dispatch('handleInterval', event_time)
             elif event_type == "eod":
-                update = self.update_for_eod(event_time)
-                if hasattr(update, '__await__'):
-                    await update
-                for cb in self.callbacks:
-                    cb.handleEndOfDay(self, event_time)
-            elif event_type == "end":
-                end_update = self.update_for_eod(event_time)
-                if hasattr(end_update, '__await__'):
-                    await end_update
-                for cb in self.callbacks:
-                    if hasattr(cb, 'handleEnd'):
-                        cb.handleEnd(self, event_time)
+                await self.update_for_eod(event_time)
+                await self.dispatch('handleEndOfDay', event_time)
+            elif event_type == "end" and self.handle_end_event:
+                await self.update_for_eod(event_time)
+                await self.dispatch('handleEnd', event_time)
+
+    async def dispatch(self, hook: str, current_time: datetime):
+        """
+        Invoke ``hook`` on every callback that defines it, honouring each
+        callback's ``depends_on`` and running coroutine hooks concurrently.
+
+        Jobs are keyed by callback position, so several instances of one class
+        all run; a dependency on a class name waits for every instance.
+
+        Raises:
+            ValueError: If two callbacks declare the same ``name``
+        """
+        labels: Dict[str, List[int]] = {}
+        declared = set()
+        for i, cb in enumerate(self.callbacks):
+            name = getattr(cb, 'name', None)
+            if name:
+                if name in declared:
+                    raise ValueError(f"Duplicate runner callback name '{name}'")
+                declared.add(name)
+            labels.setdefault(name or type(cb).__name__, []).append(i)
+        jobs, depends_on = {}, {}
+        for i, cb in enumerate(self.callbacks):
+            method = getattr(cb, hook, None)
+            if method is None:
+                continue
+            jobs[i] = (lambda method=method: method(self, current_time))
+            depends_on[i] = [j for label in getattr(cb, 'depends_on', ()) for j in labels.get(label, ()) if j != i]
+        await run_dependency_graph(jobs, depends_on)
 
     async def update_for_sod(self, current_time: datetime):
         """
-        Call update_for_sod on universe_state_manager, universe_manager, and security_master if available.
+        Call update_for_sod on universe_manager, security_master, market_data_manager and
+        universe_state_manager, concurrently where SOD_DEPENDENCIES allows.
         """
         import logging
         logger = logging.getLogger(__name__)
-        # UniverseManager SOD
-        if hasattr(self.universe_manager, 'update_for_sod'):
-            logger.info(f"Runner.update_forun: Calling universe_manager.update_for_sod at {current_time}, universe_id: {self.universe_id}, date: {current_time.date()}")
-            await self.universe_manager.update_for_sod(self, current_time)
-
-        if hasattr(self.security_master, 'update_for_sod'):
-            # If security_master.update_for_sod is async, await it; otherwise, call directly
-            sm_update = self.security_master.update_for_sod(self, current_time)
-            if hasattr(sm_update, '__await__'):
-                await sm_update
-
-        if hasattr(self.market_data_manager, 'update_for_sod'):
-            logger.info(f"Runner.update_forun: Calling market_data_manager.update_for_sod at {current_time}, universe_id: {self.universe_id}, date: {current_time.date()}")
-            mdm_update = self.market_data_manager.update_for_sod(self, current_time)
-            if hasattr(mdm_update, '__await__'):
-                await mdm_update
-
-        logger.info(f"Runner.update_forun: Calling universe_state_manager.update_for_sod at {current_time}, universe_id: {self.universe_id}, date: {current_time.date()}")
-        if hasattr(self.universe_state_manager, 'update_for_sod'):
-            usm_update = self.universe_state_manager.update_for_sod(self, current_time)
-            if hasattr(usm_update, '__await__'):
-                await usm_update
-
+        logger.info(f"Runner.update_for_sod at {current_time}, universe_id: {self.universe_id}, date: {current_time.date()}")
+        await self._update_managers('update_for_sod', current_time, self.SOD_DEPENDENCIES)
 
     async def update_for_eod(self, current_time: datetime):
         """
-        Call update_for_eod on universe_state_manager, universe_manager, and security_master if available.
+        Call update_for_eod on universe_state_manager first, then universe_manager,
+        security_master and market_data_manager concurrently (see EOD_DEPENDENCIES).
         """
         import logging
         logger = logging.getLogger(__name__)
         saved_dir = None
         if hasattr(self.env, 'get'):
             saved_dir = self.env.get('runner', 'saved_dir', None)
-        logger.info(f"saved_dir:{saved_dir}")
-        if hasattr(self.universe_state_manager, 'handleEnd'):
-            logger.info(f"Runner.run: Calling universe_state_manager.handleEnd at {current_time}, saved_dir: {saved_dir}")
-            usm_update = self.universe_state_manager.update_for_eod(self, current_time)
-            if hasattr(usm_update, '__await__'):
-                await usm_update
-        # UniverseManager EOD
-        if hasattr(self.universe_manager, 'update_for_eod'):
-            logger.info(f"Runner.run: Calling universe_manager.update_for_eod at {current_time}, universe_id: {self.universe_id}, date: {current_time.date()}")
-            um_update = self.universe_manager.update_for_eod(self, current_time)
-            if hasattr(um_update, '__await__'):
-                await um_update
-        if hasattr(self.security_master, 'update_for_eod'):
-            sm_update = self.security_master.update_for_eod(self, current_time)
-            if hasattr(sm_update, '__await__'):
-                await sm_update
-        if hasattr(self.market_data_manager, 'update_for_eod'):
-            logger.info(f"Runner.run: Calling market_data_manager.update_for_eod at {current_time}, universe_id: {self.universe_id}, date: {current_time.date()}")
-            mdm_update = self.market_data_manager.update_for_eod(self, current_time)
-            if hasattr(mdm_update, '__await__'):
-                await mdm_update
+        logger.info(f"Runner.update_for_eod at {current_time}, universe_id: {self.universe_id}, saved_dir: {saved_dir}")
+        await self._update_managers('update_for_eod', current_time, self.EOD_DEPENDENCIES)
+
+    async def _update_managers(self, hook: str, current_time: datetime, dependencies: Dict[str, Tuple[str, ...]]):
+        jobs = {}
+        for attr in dependencies:
+            method = getattr(getattr(self, attr), hook, None)
+            if method is not None:
+                jobs[attr] = (lambda method=method: method(self, current_time))
+        await run_dependency_graph(jobs, dependencies)
 
 
     def _advance_time(self, current_time: datetime) -> datetime:
@@ -211,3 +405,13 @@ class Runner:
             # Add more as needed
             else:
                 raise NotImplementedError(f"Unsupported duration type: {self.duration.duration_type}")
+
+
+def _run_chunk(job) -> str:
+    """Process-pool entry point: replay one date chunk into its own state directory."""
+    runner_cls, env, universe_id, run_start, emit_start, end, chunk_dir, is_last = job
+    runner = runner_cls(run_start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"), env, universe_id)
+    runner.universe_state_manager = UniverseStateManager(env, base_path=chunk_dir)
+    runner.handle_end_event = is_last
+    asyncio.run(runner.run())
+    return chunk_dir
@@ -1,5 +1,5 @@
 import datetime
-from typing import Iterator, List, Optional
+from typing import Iterator, List, Optional, Tuple
 
 try:
     import pandas as pd
@@ -51,3 +51,21 @@ class ExchangeCalendar:
 
     def all_trading_days(self, start_date: datetime.date, end_date: datetime.date) -> List[datetime.date]:
         return list(self.trading_days(start_date, end_date))
+
+    def sessions(self, start_date: datetime.date, end_date: datetime.date) -> List[Tuple[datetime.date, datetime.datetime, datetime.datetime]]:
+        """
+        Return (session_date, market_open, market_close) for each session in range.
+
+        Open/close are naive datetimes in the exchange's local time zone and
+        reflect early closes; holidays and weekends have no entry.
+        """
+        sched = self.calendar.schedule(str(start_date), str(end_date))
+        if sched.empty:
+            return []
+        tz = self.calendar.tz
+        opens = sched['market_open'].dt.tz_convert(tz).dt.tz_localize(None)
+        closes = sched['market_close'].dt.tz_convert(tz).dt.tz_localize(None)
+        return [
+            (d, o.to_pydatetime(), c.to_pydatetime())
+            for d, o, c in zip(sched.index.date, opens, closes)
+        ]
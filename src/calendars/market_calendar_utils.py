@@ -1,3 +1,4 @@
+import numpy as np
 import pandas_market_calendars as mcal
 import pandas as pd
 from typing import Optional, Tuple
@@ -37,3 +38,80 @@ def get_next_open_close(mkt_calendar, dt: pd.Timestamp) -> Tuple[Optional[pd.Tim
         next_close = schedule['market_close'].iloc[0]
         return next_open, next_close
     return None, None
+
+
+class SessionScheduleCache:
+    """
+    Precomputed session lookups for a market calendar.
+
+    Session labels, opens and closes are held as int64 epoch-nanosecond arrays
+    and last/next sessions are found with ``searchsorted`` instead of slicing
+    the schedule DataFrame on every call. Answers match get_last_open_close /
+    get_next_open_close (sessions are matched on their date label).
+
+    ``mkt_calendar.schedule`` may be a pandas_market_calendars method
+    (``schedule(start_date, end_date)``), in which case ``horizon_days`` of
+    sessions are fetched around the requested time and refetched lazily once a
+    lookup falls outside them, or a precomputed DataFrame, which is used as is.
+    """
+
+    def __init__(self, mkt_calendar, horizon_days: int = 366, lookback_days: int = 14):
+        self.calendar = mkt_calendar
+        self.horizon_days = horizon_days
+        self.lookback_days = lookback_days
+        self._static = not callable(mkt_calendar.schedule)
+        self._lo = self._hi = None  # epoch ns range answerable without a refetch
+        self._labels = self._opens = self._closes = np.empty(0, dtype=np.int64)
+        self._tz = None
+        self._sessions = {}  # index -> (open, close) Timestamps
+        if self._static:
+            self._load(mkt_calendar.schedule)
+
+    def _load(self, schedule: pd.DataFrame) -> None:
+        self._labels = pd.DatetimeIndex(schedule.index).as_unit('ns').asi8
+        opens = pd.DatetimeIndex(schedule['market_open']).as_unit('ns')
+        self._opens = opens.asi8
+        self._closes = pd.DatetimeIndex(schedule['market_close']).as_unit('ns').asi8
+        self._tz = opens.tz
+        self._sessions = {}
+
+    def _ensure(self, ns: int) -> None:
+        if self._static or (self._lo is not None and self._lo <= ns <= self._hi):
+            return
+        day = pd.Timestamp(ns).normalize()
+        lookback = pd.Timedelta(days=self.lookback_days)
+        start, end = day - lookback, day + pd.Timedelta(days=self.horizon_days)
+        self._load(self.calendar.schedule(start_date=start, end_date=end))
+        # Keep lookback_days of sessions on either side of any answered time
+        self._lo = (start + lookback).value
+        self._hi = (end - lookback).value
+
+    @staticmethod
+    def _to_ns(dt) -> int:
+        ts = pd.Timestamp(dt)
+        if ts.tzinfo is not None:
+            ts = ts.tz_convert(None)
+        return ts.value
+
+    def _session(self, i: int) -> Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+        if i < 0 or i >= len(self._labels):
+            return None, None
+        session = self._sessions.get(i)
+        if session is None:
+            session = self._sessions[i] = (
+                pd.Timestamp(self._opens[i], tz=self._tz),
+                pd.Timestamp(self._closes[i], tz=self._tz),
+            )
+        return session
+
+    def last_open_close(self, dt) -> Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+        """Open and close of the last session labelled at or before dt."""
+        ns = self._to_ns(dt)
+        self._ensure(ns)
+        return self._session(int(np.searchsorted(self._labels, ns, side='right')) - 1)
+
+    def next_open_close(self, dt) -> Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+        """Open and close of the first session labelled at or after dt."""
+        ns = self._to_ns(dt)
+        self._ensure(ns)
+        return self._session(int(np.searchsorted(self._labels, ns, side='left')))
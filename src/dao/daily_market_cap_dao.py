@@ -1,5 +1,5 @@
 from config.environment import Environment
-import asyncpg
+from db.pool_registry import acquire, iter_table_chunks
 
 class DailyMarketCapDAO:
     def __init__(self, db_url=None, env=None):
@@ -7,43 +7,38 @@ class DailyMarketCapDAO:
         self.env = env
         print(f"[DAO DEBUG] DailyMarketCapDAO using db_url: {self.db_url}")
     async def list_market_caps_for_date(self, as_of_date, instrument_id=None):
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                if instrument_id is not None:
-                    return await conn.fetch(f"SELECT * FROM {self.table_name} WHERE date = $1 AND instrument_id = $2", as_of_date, instrument_id)
-                else:
-                    return await conn.fetch(f"SELECT * FROM {self.table_name} WHERE date = $1", as_of_date)
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            if instrument_id is not None:
+                return await conn.fetch(f"SELECT * FROM {self.table_name} WHERE date = $1 AND instrument_id = $2", as_of_date, instrument_id)
+            else:
+                return await conn.fetch(f"SELECT * FROM {self.table_name} WHERE date = $1", as_of_date)
     def __init__(self, env: Environment):
         self.env = env
         self.table_name = self.env.get_table_name('daily_market_cap')
         self.db_url = self.env.get_database_url()
 
     async def insert_market_cap(self, date, instrument_id, market_cap):
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                await conn.execute(f"""
-                    INSERT INTO {self.table_name} (date, instrument_id, market_cap)
-                    VALUES ($1, $2, $3)
-                """, date, instrument_id, market_cap)
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            await conn.execute(f"""
+                INSERT INTO {self.table_name} (date, instrument_id, market_cap)
+                VALUES ($1, $2, $3)
+            """, date, instrument_id, market_cap)
 
     async def get_market_cap(self, date, instrument_id):
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                return await conn.fetchrow(f"SELECT * FROM {self.table_name} WHERE date = $1 AND instrument_id = $2", date, instrument_id)
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            return await conn.fetchrow(f"SELECT * FROM {self.table_name} WHERE date = $1 AND instrument_id = $2", date, instrument_id)
 
     async def list_market_caps(self, instrument_id):
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                return await conn.fetch(f"SELECT * FROM {self.table_name} WHERE instrument_id = $1", instrument_id)
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            return await conn.fetch(f"SELECT * FROM {self.table_name} WHERE instrument_id = $1", instrument_id)
+
+    async def iter_market_caps(self, instrument_id=None, start_date=None, end_date=None, chunk_size=None):
+        """
+        Stream market caps in chunks through a server-side cursor, ordered by instrument_id and date.
+        The optional instrument_id and inclusive date range are filtered in SQL.
+        """
+        async for rows in iter_table_chunks(
+            self.env, self.table_name, instrument_id=instrument_id,
+            start_date=start_date, end_date=end_date, chunk_size=chunk_size,
+        ):
+            yield rows
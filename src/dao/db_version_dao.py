@@ -1,5 +1,5 @@
 from config.environment import Environment
-import asyncpg
+from db.pool_registry import acquire
 
 class DBVersionDAO:
     def __init__(self, env: Environment):
@@ -8,24 +8,16 @@ class DBVersionDAO:
         self.db_url = self.env.get_database_url()
 
     async def get_version(self):
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                return await conn.fetch(f"SELECT * FROM {self.table_name} ORDER BY version DESC")
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            return await conn.fetch(f"SELECT * FROM {self.table_name} ORDER BY version DESC")
 
     async def insert_version(self, version: int, description: str, migration_file: str):
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                await conn.execute(f"""
-                    INSERT INTO {self.table_name} (version, description, migration_file, applied_at)
-                    VALUES ($1, $2, $3, now())
-                    ON CONFLICT (version) DO UPDATE SET
-                        description = EXCLUDED.description,
-                        migration_file = EXCLUDED.migration_file,
-                        applied_at = now()
-                """, version, description, migration_file)
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            await conn.execute(f"""
+                INSERT INTO {self.table_name} (version, description, migration_file, applied_at)
+                VALUES ($1, $2, $3, now())
+                ON CONFLICT (version) DO UPDATE SET
+                    description = EXCLUDED.description,
+                    migration_file = EXCLUDED.migration_file,
+                    applied_at = now()
+            """, version, description, migration_file)
@@ -1,5 +1,5 @@
 from config.environment import Environment
-import asyncpg
+from db.pool_registry import acquire
 
 class DividendsDAO:
     def __init__(self, env: Environment):
@@ -8,28 +8,16 @@ class DividendsDAO:
         self.db_url = self.env.get_database_url()
 
     async def insert_dividend(self, instrument_id, ex_date, pay_date, record_date, amount, currency='USD', dividend_type='regular', source=None):
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                await conn.execute(f"""
-                    INSERT INTO {self.table_name} (instrument_id, ex_date, pay_date, record_date, amount, currency, dividend_type, source)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                """, instrument_id, ex_date, pay_date, record_date, amount, currency, dividend_type, source)
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            await conn.execute(f"""
+                INSERT INTO {self.table_name} (instrument_id, ex_date, pay_date, record_date, amount, currency, dividend_type, source)
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+            """, instrument_id, ex_date, pay_date, record_date, amount, currency, dividend_type, source)
 
     async def get_dividend(self, instrument_id, ex_date, dividend_type='regular'):
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                return await conn.fetchrow(f"SELECT * FROM {self.table_name} WHERE instrument_id = $1 AND ex_date = $2 AND dividend_type = $3", instrument_id, ex_date, dividend_type)
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            return await conn.fetchrow(f"SELECT * FROM {self.table_name} WHERE instrument_id = $1 AND ex_date = $2 AND dividend_type = $3", instrument_id, ex_date, dividend_type)
 
     async def list_dividends(self, instrument_id):
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                return await conn.fetch(f"SELECT * FROM {self.table_name} WHERE instrument_id = $1", instrument_id)
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            return await conn.fetch(f"SELECT * FROM {self.table_name} WHERE instrument_id = $1", instrument_id)
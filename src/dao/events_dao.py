@@ -1,5 +1,5 @@
 from config.environment import Environment
-import asyncpg
+from db.pool_registry import acquire
 from typing import Optional, List
 
 class EventsDAO:
@@ -9,39 +9,31 @@ class EventsDAO:
         self.db_url = self.env.get_database_url()
 
     async def get_events(self, instrument_id: Optional[int]=None, event_type: Optional[str]=None, start: Optional[str]=None, end: Optional[str]=None) -> List[dict]:
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                query = f"SELECT * FROM {self.table_name} WHERE TRUE"
-                params = []
-                if instrument_id is not None:
-                    query += f" AND instrument_id = ${{len(params) + 1}}"
-                    params.append(instrument_id)
-                if event_type:
-                    query += f" AND event_type = ${{len(params) + 1}}"
-                    params.append(event_type)
-                if start:
-                    query += f" AND event_time >= ${{len(params) + 1}}"
-                    params.append(start)
-                if end:
-                    query += f" AND event_time <= ${{len(params) + 1}}"
-                    params.append(end)
-                query += " ORDER BY event_time DESC LIMIT 1000"
-                rows = await conn.fetch(query, *params)
-                return [dict(row) for row in rows]
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            query = f"SELECT * FROM {self.table_name} WHERE TRUE"
+            params = []
+            if instrument_id is not None:
+                query += f" AND instrument_id = ${{len(params) + 1}}"
+                params.append(instrument_id)
+            if event_type:
+                query += f" AND event_type = ${{len(params) + 1}}"
+                params.append(event_type)
+            if start:
+                query += f" AND event_time >= ${{len(params) + 1}}"
+                params.append(start)
+            if end:
+                query += f" AND event_time <= ${{len(params) + 1}}"
+                params.append(end)
+            query += " ORDER BY event_time DESC LIMIT 1000"
+            rows = await conn.fetch(query, *params)
+            return [dict(row) for row in rows]
 
     async def insert_event(self, event_type, instrument_id, event_time, reported_time, source, data) -> dict:
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                row = await conn.fetchrow(
-                    f"""INSERT INTO {self.table_name} (event_type, instrument_id, event_time, reported_time, source, data)
-                       VALUES ($1, $2, $3, $4, $5, $6)
-                       RETURNING *""",
-                    event_type, instrument_id, event_time, reported_time, source, data
-                )
-                return dict(row)
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            row = await conn.fetchrow(
+                f"""INSERT INTO {self.table_name} (event_type, instrument_id, event_time, reported_time, source, data)
+                   VALUES ($1, $2, $3, $4, $5, $6)
+                   RETURNING *""",
+                event_type, instrument_id, event_time, reported_time, source, data
+            )
+            return dict(row)
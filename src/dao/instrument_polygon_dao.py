@@ -1,5 +1,5 @@
 from config.environment import Environment
-import asyncpg
+from db.pool_registry import acquire, iter_chunks
 
 class InstrumentPolygonDAO:
     def __init__(self, env: Environment):
@@ -8,43 +8,39 @@ class InstrumentPolygonDAO:
         self.db_url = self.env.get_database_url()
 
     async def insert_instrument(self, instrument_id, symbol, name, exchange, type_, currency, figi, isin, cusip, composite_figi, active, list_date, delist_date, raw):
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                await conn.execute(f"""
-                    INSERT INTO {self.table_name} (instrument_id, symbol, name, exchange, type, currency, figi, isin, cusip, composite_figi, active, list_date, delist_date, raw)
-                    VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9,$10,$11,$12,$13,$14)
-                    ON CONFLICT (instrument_id) DO UPDATE SET
-                        symbol=EXCLUDED.symbol,
-                        name=EXCLUDED.name,
-                        exchange=EXCLUDED.exchange,
-                        type=EXCLUDED.type,
-                        currency=EXCLUDED.currency,
-                        figi=EXCLUDED.figi,
-                        isin=EXCLUDED.isin,
-                        cusip=EXCLUDED.cusip,
-                        composite_figi=EXCLUDED.composite_figi,
-                        active=EXCLUDED.active,
-                        list_date=EXCLUDED.list_date,
-                        delist_date=EXCLUDED.delist_date,
-                        raw=EXCLUDED.raw,
-                        updated_at=now()
-                """, instrument_id, symbol, name, exchange, type_, currency, figi, isin, cusip, composite_figi, active, list_date, delist_date, raw)
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            await conn.execute(f"""
+                INSERT INTO {self.table_name} (instrument_id, symbol, name, exchange, type, currency, figi, isin, cusip, composite_figi, active, list_date, delist_date, raw)
+                VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9,$10,$11,$12,$13,$14)
+                ON CONFLICT (instrument_id) DO UPDATE SET
+                    symbol=EXCLUDED.symbol,
+                    name=EXCLUDED.name,
+                    exchange=EXCLUDED.exchange,
+                    type=EXCLUDED.type,
+                    currency=EXCLUDED.currency,
+                    figi=EXCLUDED.figi,
+                    isin=EXCLUDED.isin,
+                    cusip=EXCLUDED.cusip,
+                    composite_figi=EXCLUDED.composite_figi,
+                    active=EXCLUDED.active,
+                    list_date=EXCLUDED.list_date,
+                    delist_date=EXCLUDED.delist_date,
+                    raw=EXCLUDED.raw,
+                    updated_at=now()
+            """, instrument_id, symbol, name, exchange, type_, currency, figi, isin, cusip, composite_figi, active, list_date, delist_date, raw)
 
     async def get_instrument(self, instrument_id):
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                return await conn.fetchrow(f"SELECT * FROM {self.table_name} WHERE instrument_id = $1", instrument_id)
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            return await conn.fetchrow(f"SELECT * FROM {self.table_name} WHERE instrument_id = $1", instrument_id)
 
     async def list_instruments(self):
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                return await conn.fetch(f"SELECT * FROM {self.table_name}")
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            return await conn.fetch(f"SELECT * FROM {self.table_name}")
+
+    async def iter_instruments(self, chunk_size=None):
+        """
+        Stream all instruments in chunks through a server-side cursor, ordered by instrument_id.
+        """
+        query = f"SELECT * FROM {self.table_name} ORDER BY instrument_id"
+        async for rows in iter_chunks(self.env, query, chunk_size=chunk_size):
+            yield rows
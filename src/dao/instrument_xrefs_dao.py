@@ -1,5 +1,5 @@
 from config.environment import Environment
-import asyncpg
+from db.pool_registry import acquire
 from typing import Optional, List, Dict, Any
 
 class InstrumentXrefsDAO:
@@ -12,80 +12,60 @@ class InstrumentXrefsDAO:
         from datetime import date
         if start_at is None:
             start_at = date.today().isoformat()
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                result = await conn.fetchrow(f"""
-                    INSERT INTO {self.table_name} (instrument_id, vendor_id, symbol, type, start_at, end_at)
-                    VALUES ($1, $2, $3, $4, $5, $6)
-                    RETURNING id
-                """, instrument_id, vendor_id, symbol, type, start_at, end_at)
-                return result['id'] if result else None
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            result = await conn.fetchrow(f"""
+                INSERT INTO {self.table_name} (instrument_id, vendor_id, symbol, type, start_at, end_at)
+                VALUES ($1, $2, $3, $4, $5, $6)
+                RETURNING id
+            """, instrument_id, vendor_id, symbol, type, start_at, end_at)
+            return result['id'] if result else None
 
     async def get_xref(self, xref_id: int) -> Optional[Dict[str, Any]]:
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                row = await conn.fetchrow(f"SELECT * FROM {self.table_name} WHERE id = $1", xref_id)
-                if row:
-                    d = dict(row)
-                    if hasattr(d.get('start_at'), 'date'):
-                        d['start_at'] = d['start_at'].date()
-                    if d.get('end_at') is not None and hasattr(d['end_at'], 'date'):
-                        d['end_at'] = d['end_at'].date()
-                    return d
-                return None
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            row = await conn.fetchrow(f"SELECT * FROM {self.table_name} WHERE id = $1", xref_id)
+            if row:
+                d = dict(row)
+                if hasattr(d.get('start_at'), 'date'):
+                    d['start_at'] = d['start_at'].date()
+                if d.get('end_at') is not None and hasattr(d['end_at'], 'date'):
+                    d['end_at'] = d['end_at'].date()
+                return d
+            return None
 
     async def list_xrefs_for_instrument(self, instrument_id: int) -> List[Dict[str, Any]]:
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                rows = await conn.fetch(f"SELECT * FROM {self.table_name} WHERE instrument_id = $1", instrument_id)
-                result = []
-                for row in rows:
-                    d = dict(row)
-                    if hasattr(d.get('start_at'), 'date'):
-                        d['start_at'] = d['start_at'].date()
-                    if d.get('end_at') is not None and hasattr(d['end_at'], 'date'):
-                        d['end_at'] = d['end_at'].date()
-                    result.append(d)
-                return result
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            rows = await conn.fetch(f"SELECT * FROM {self.table_name} WHERE instrument_id = $1", instrument_id)
+            result = []
+            for row in rows:
+                d = dict(row)
+                if hasattr(d.get('start_at'), 'date'):
+                    d['start_at'] = d['start_at'].date()
+                if d.get('end_at') is not None and hasattr(d['end_at'], 'date'):
+                    d['end_at'] = d['end_at'].date()
+                result.append(d)
+            return result
 
     async def list_xrefs_for_vendor(self, vendor_id: int) -> List[Dict[str, Any]]:
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                rows = await conn.fetch(f"SELECT * FROM {self.table_name} WHERE vendor_id = $1", vendor_id)
-                result = []
-                for row in rows:
-                    d = dict(row)
-                    if hasattr(d.get('start_at'), 'date'):
-                        d['start_at'] = d['start_at'].date()
-                    if d.get('end_at') is not None and hasattr(d['end_at'], 'date'):
-                        d['end_at'] = d['end_at'].date()
-                    result.append(d)
-                return result
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            rows = await conn.fetch(f"SELECT * FROM {self.table_name} WHERE vendor_id = $1", vendor_id)
+            result = []
+            for row in rows:
+                d = dict(row)
+                if hasattr(d.get('start_at'), 'date'):
+                    d['start_at'] = d['start_at'].date()
+                if d.get('end_at') is not None and hasattr(d['end_at'], 'date'):
+                    d['end_at'] = d['end_at'].date()
+                result.append(d)
+            return result
 
     async def find_xref(self, vendor_id: int, symbol: str) -> Optional[Dict[str, Any]]:
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                row = await conn.fetchrow(f"SELECT * FROM {self.table_name} WHERE vendor_id = $1 AND symbol = $2", vendor_id, symbol)
-                if row:
-                    d = dict(row)
-                    if hasattr(d.get('start_at'), 'date'):
-                        d['start_at'] = d['start_at'].date()
-                    if d.get('end_at') is not None and hasattr(d['end_at'], 'date'):
-                        d['end_at'] = d['end_at'].date()
-                    return d
-                return None
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            row = await conn.fetchrow(f"SELECT * FROM {self.table_name} WHERE vendor_id = $1 AND symbol = $2", vendor_id, symbol)
+            if row:
+                d = dict(row)
+                if hasattr(d.get('start_at'), 'date'):
+                    d['start_at'] = d['start_at'].date()
+                if d.get('end_at') is not None and hasattr(d['end_at'], 'date'):
+                    d['end_at'] = d['end_at'].date()
+                return d
+            return None
@@ -0,0 +1,85 @@
+"""
+Columnar reads via PostgreSQL binary ``COPY ... TO STDOUT``.
+
+When every selected column is fixed width and non-NULL, each tuple of the
+binary COPY stream has the same size, so the whole payload can be viewed as a
+NumPy structured array and split into columns without creating a Python object
+per row. Queries should therefore cast value columns to ``float8`` and
+``COALESCE`` NULLs to ``'NaN'``.
+"""
+
+import io
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from config.environment import Environment
+from db.pool_registry import acquire
+
+PGCOPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+
+# PostgreSQL binary type -> (wire dtype, output dtype)
+FIELD_TYPES = {
+    "int4": (">i4", np.int64),
+    "int8": (">i8", np.int64),
+    "float8": (">f8", np.float64),
+    "date": (">i4", "datetime64[D]"),
+}
+
+_PG_EPOCH = np.datetime64("2000-01-01", "D")
+
+
+def decode_binary_copy(payload: bytes, fields: Sequence[Tuple[str, str]]) -> Dict[str, np.ndarray]:
+    """
+    Decode a binary COPY payload of fixed-width, non-NULL columns.
+
+    Args:
+        payload: Raw bytes written by ``COPY ... TO STDOUT (FORMAT binary)``
+        fields: (name, pg_type) pairs in column order; pg_type is a key of FIELD_TYPES
+
+    Returns:
+        Dict of column name -> NumPy array
+
+    Raises:
+        ValueError: On a malformed payload or a NULL/variable-width value
+    """
+    if not payload.startswith(PGCOPY_SIGNATURE):
+        raise ValueError("Not a PostgreSQL binary COPY payload")
+    header_ext = int.from_bytes(payload[15:19], "big", signed=False)
+    body = memoryview(payload)[19 + header_ext:]
+    # Trailer is a single int16 -1
+    if len(body) < 2 or bytes(body[-2:]) != b"\xff\xff":
+        raise ValueError("Truncated binary COPY payload")
+    body = body[:-2]
+    layout = [("nfields", ">i2")]
+    for i, (name, pg_type) in enumerate(fields):
+        wire, _ = FIELD_TYPES[pg_type]
+        layout.append((f"len{i}", ">i4"))
+        layout.append((name, wire))
+    dtype = np.dtype(layout)
+    if len(body) % dtype.itemsize:
+        raise ValueError("Binary COPY rows are not fixed width; cast and COALESCE NULL columns")
+    records = np.frombuffer(body, dtype=dtype)
+    if len(records) and (records["nfields"] != len(fields)).any():
+        raise ValueError("Unexpected field count in binary COPY payload")
+    columns = {}
+    for i, (name, pg_type) in enumerate(fields):
+        wire, out = FIELD_TYPES[pg_type]
+        if len(records) and (records[f"len{i}"] != np.dtype(wire).itemsize).any():
+            raise ValueError(f"Column {name} contains NULL or variable-width values")
+        raw = records[name]
+        if pg_type == "date":
+            columns[name] = _PG_EPOCH + raw.astype(np.int64)
+        else:
+            columns[name] = raw.astype(out)
+    return columns
+
+
+async def fetch_columns(env: Environment, query: str, *args, fields: Sequence[Tuple[str, str]]) -> Dict[str, np.ndarray]:
+    """
+    Run ``query`` with binary COPY and return its columns as NumPy arrays.
+    """
+    buf = io.BytesIO()
+    async with acquire(env) as conn:
+        await conn.copy_from_query(query, *args, output=buf, format="binary")
+    return decode_binary_copy(buf.getvalue(), fields)
@@ -0,0 +1,133 @@
+"""
+COPY-based bulk upsert helpers.
+
+Rows are streamed into a temporary staging table with ``copy_records_to_table``
+and merged into the target table with a single ``INSERT ... ON CONFLICT``.
+Rows that carry a symbol but no instrument_id are resolved against
+instrument_xrefs in the same transaction, so a batch costs a fixed number of
+round trips regardless of its size.
+"""
+
+import math
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+
+def _clean(value: Any) -> Any:
+    # DataFrames carry missing values as NaN/NaT; COPY needs None
+    if value is None:
+        return None
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if type(value).__name__ in ("NaTType", "NAType"):
+        return None
+    if hasattr(value, "to_pydatetime"):
+        return value.to_pydatetime()
+    if hasattr(value, "item") and not isinstance(value, (str, bytes)):
+        return value.item()
+    return value
+
+
+def to_records(rows: Any, fields: Sequence[str]) -> List[Tuple[Any, ...]]:
+    """
+    Convert a batch of rows into COPY records ordered by ``fields``.
+
+    Args:
+        rows: Iterable of dicts, a pandas DataFrame or a pyarrow Table
+        fields: Row keys (or column names) to extract, in order
+
+    Returns:
+        List of tuples; missing keys/columns become None
+    """
+    if hasattr(rows, "to_pylist"):
+        rows = rows.to_pylist()
+    elif hasattr(rows, "itertuples") and hasattr(rows, "columns"):
+        present = [f for f in fields if f in rows.columns]
+        records = []
+        for values in rows[present].itertuples(index=False, name=None):
+            row = dict(zip(present, values))
+            records.append(tuple(_clean(row.get(f)) for f in fields))
+        return records
+    return [tuple(_clean(row.get(f)) for f in fields) for row in rows]
+
+
+async def copy_upsert(
+    conn,
+    table_name: str,
+    columns: Sequence[str],
+    records: Iterable[Tuple[Any, ...]],
+    conflict_columns: Sequence[str],
+    xref_table: Optional[str] = None,
+    vendor_id: Optional[int] = None,
+) -> int:
+    """
+    Upsert ``records`` into ``table_name`` via a COPY-loaded staging table.
+
+    Args:
+        conn: asyncpg connection
+        table_name: Target table
+        columns: Target column names matching the record layout
+        records: Tuples ordered like ``columns``
+        conflict_columns: Columns of the unique constraint to merge on
+        xref_table: If given, rows with a symbol but no instrument_id are
+            resolved point-in-time against this instrument_xrefs table
+        vendor_id: Optional vendor filter for symbol resolution
+
+    Returns:
+        Number of rows inserted or updated. Records sharing a conflict key
+        within one batch collapse to a single row; the last one in the batch wins.
+
+    Raises:
+        ValueError: If symbols cannot be resolved to an instrument_id
+    """
+    records = list(records)
+    if not records:
+        return 0
+    staging = f"{table_name}_staging"
+    column_list = ", ".join(columns)
+    conflict_list = ", ".join(conflict_columns)
+    update_columns = [c for c in columns if c not in conflict_columns]
+    if update_columns:
+        conflict_action = "DO UPDATE SET " + ", ".join(f"{c} = EXCLUDED.{c}" for c in update_columns)
+    else:
+        conflict_action = "DO NOTHING"
+    async with conn.transaction():
+        # CREATE TABLE AS drops NOT NULL constraints so unresolved ids can be staged;
+        # staging_seq keeps batch order so duplicate keys merge deterministically
+        await conn.execute(
+            f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+            f"SELECT {column_list}, 0::bigint AS staging_seq FROM {table_name} WITH NO DATA"
+        )
+        await conn.copy_records_to_table(
+            staging,
+            records=[(*record, seq) for seq, record in enumerate(records)],
+            columns=[*columns, "staging_seq"],
+        )
+        if xref_table is not None and "instrument_id" in columns and "symbol" in columns:
+            vendor_filter = "AND x.vendor_id = $1" if vendor_id is not None else ""
+            await conn.execute(
+                f"""
+                UPDATE {staging} s SET instrument_id = (
+                    SELECT x.instrument_id FROM {xref_table} x
+                    WHERE x.symbol = s.symbol {vendor_filter}
+                      AND x.start_at <= s.date AND (x.end_at IS NULL OR x.end_at >= s.date)
+                    ORDER BY x.start_at DESC LIMIT 1
+                )
+                WHERE s.instrument_id IS NULL AND s.symbol IS NOT NULL
+                """,
+                *([vendor_id] if vendor_id is not None else []),
+            )
+            unresolved = await conn.fetch(
+                f"SELECT DISTINCT symbol FROM {staging} WHERE instrument_id IS NULL"
+            )
+            if unresolved:
+                symbols = sorted(str(row["symbol"]) for row in unresolved)
+                raise ValueError(f"No instrument_id found for symbols={symbols}, vendor_id={vendor_id}")
+        result = await conn.execute(
+            f"""
+            INSERT INTO {table_name} ({column_list})
+            SELECT DISTINCT ON ({conflict_list}) {column_list} FROM {staging}
+            ORDER BY {conflict_list}, staging_seq DESC
+            ON CONFLICT ({conflict_list}) {conflict_action}
+            """
+        )
+    return int(result.split()[-1]) if result else 0
@@ -0,0 +1,208 @@
+"""
+Process-wide asyncpg connection pool registry.
+
+DAOs historically created and closed a pool for every call, paying a TCP and
+auth handshake per query. The registry keeps one pool per environment, sized
+from ``Environment.get_database_config()``, and hands out connections from it.
+
+Long-lived processes (the Runner, the FastAPI app) call ``enable_shared_pool``
+on startup and ``close_pool``/``close_all_pools`` on shutdown. The pool itself
+is created lazily on first use so enabling it never opens connections that are
+not needed. When no shared pool is enabled for an environment, ``acquire``
+falls back to a short-lived pool so one-off scripts keep working unchanged.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Tuple
+
+import asyncpg
+
+from config.environment import Environment
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, str]
+
+_pools: Dict[PoolKey, Optional[asyncpg.Pool]] = {}
+_locks: Dict[PoolKey, asyncio.Lock] = {}
+
+
+def _pool_key(env: Environment) -> PoolKey:
+    return (env.env_type.value, env.get_database_url())
+
+
+def enable_shared_pool(env: Environment) -> None:
+    """
+    Register a shared pool for ``env``. The pool is created on first ``acquire``.
+
+    Args:
+        env: Environment whose DAOs should share a single pool
+    """
+    _pools.setdefault(_pool_key(env), None)
+
+
+def is_shared_pool_enabled(env: Environment) -> bool:
+    """Return True if DAOs for ``env`` use the shared pool."""
+    return _pool_key(env) in _pools
+
+
+async def get_pool(env: Environment) -> asyncpg.Pool:
+    """
+    Get the shared pool for ``env``, creating it on first use.
+
+    Args:
+        env: Environment the pool belongs to
+
+    Returns:
+        The process-wide asyncpg pool for the environment
+
+    Raises:
+        RuntimeError: If no shared pool was enabled for the environment
+    """
+    key = _pool_key(env)
+    if key not in _pools:
+        raise RuntimeError(f"No shared pool enabled for {env}; call enable_shared_pool() first")
+    pool = _pools[key]
+    if pool is not None:
+        return pool
+    lock = _locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        pool = _pools.get(key)
+        if pool is None:
+            config = env.get_database_config()
+            logger.info(f"Creating shared asyncpg pool for {env} (min_size={config['min_size']}, max_size={config['max_size']})")
+            pool = await asyncpg.create_pool(
+                env.get_database_url(),
+                min_size=config["min_size"],
+                max_size=config["max_size"],
+                command_timeout=config["command_timeout"],
+            )
+            _pools[key] = pool
+    return pool
+
+
+async def open_pool(env: Environment) -> asyncpg.Pool:
+    """Enable the shared pool for ``env`` and create it eagerly."""
+    enable_shared_pool(env)
+    return await get_pool(env)
+
+
+async def close_pool(env: Environment) -> None:
+    """Close and unregister the shared pool for ``env``, if any."""
+    key = _pool_key(env)
+    _locks.pop(key, None)
+    pool = _pools.pop(key, None)
+    if pool is not None:
+        await pool.close()
+
+
+async def close_all_pools() -> None:
+    """Close and unregister every shared pool."""
+    pools = [pool for pool in _pools.values() if pool is not None]
+    _pools.clear()
+    _locks.clear()
+    for pool in pools:
+        await pool.close()
+
+
+@asynccontextmanager
+async def acquire(env: Environment):
+    """
+    Acquire a connection for ``env``.
+
+    Uses the shared pool when one is enabled for the environment; otherwise a
+    temporary pool is created and closed around the connection.
+    """
+    if is_shared_pool_enabled(env):
+        pool = await get_pool(env)
+        async with pool.acquire() as conn:
+            yield conn
+        return
+    pool = await asyncpg.create_pool(env.get_database_url())
+    try:
+        async with pool.acquire() as conn:
+            yield conn
+    finally:
+        await pool.close()
+
+
+async def iter_chunks(env: Environment, query: str, *args, chunk_size: Optional[int] = None):
+    """
+    Stream ``query`` results in fixed-size chunks through a server-side cursor.
+
+    The cursor lives in a transaction on a single connection, so memory stays
+    bounded by ``chunk_size`` regardless of the result size. Callers that stop
+    early should close the generator (e.g. ``contextlib.aclosing``) to release
+    the connection promptly.
+
+    Args:
+        env: Environment to connect with
+        query: SQL query
+        *args: Query parameters
+        chunk_size: Rows per chunk; defaults to ``performance.batch_size``
+
+    Yields:
+        Lists of asyncpg Records
+    """
+    if chunk_size is None:
+        chunk_size = int(env.get("performance", "batch_size", "1000"))
+    async with acquire(env) as conn:
+        async with conn.transaction():
+            cursor = await conn.cursor(query, *args)
+            while True:
+                rows = await cursor.fetch(chunk_size)
+                if not rows:
+                    break
+                yield rows
+
+
+async def iter_table_chunks(
+    env: Environment,
+    table_name: str,
+    symbol=None,
+    instrument_id=None,
+    start_date=None,
+    end_date=None,
+    columns=None,
+    chunk_size: Optional[int] = None,
+):
+    """
+    Stream rows of a daily table in chunks, ordered by instrument_id and date.
+
+    Filters by instrument_id (preferred) or symbol, and by an inclusive date
+    range in SQL. With neither instrument_id nor symbol, walks the whole table.
+
+    Args:
+        env: Environment to connect with
+        table_name: Fully qualified table with instrument_id and date columns (and symbol,
+            when filtering by it)
+        symbol: Optional symbol filter, ignored when instrument_id is given
+        instrument_id: Optional instrument_id filter
+        start_date: Optional inclusive lower date bound
+        end_date: Optional inclusive upper date bound
+        columns: Columns to select; defaults to all
+        chunk_size: Rows per chunk; defaults to ``performance.batch_size``
+
+    Yields:
+        Lists of asyncpg Records
+    """
+    conditions, params = [], []
+    if instrument_id is not None:
+        params.append(instrument_id)
+        conditions.append(f"instrument_id = ${len(params)}")
+    elif symbol is not None:
+        params.append(symbol)
+        conditions.append(f"symbol = ${len(params)}")
+    if start_date is not None:
+        params.append(start_date)
+        conditions.append(f"date >= ${len(params)}")
+    if end_date is not None:
+        params.append(end_date)
+        conditions.append(f"date <= ${len(params)}")
+    select = ", ".join(columns) if columns else "*"
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    query = f"SELECT {select} FROM {table_name}{where} ORDER BY instrument_id, date"
+    async for rows in iter_chunks(env, query, *params, chunk_size=chunk_size):
+        yield rows
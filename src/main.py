@@ -1,5 +1,17 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from events.api import router as events_router
+from config.environment import get_environment
+from db.pool_registry import enable_shared_pool, close_all_pools
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    enable_shared_pool(get_environment())
+    yield
+    await close_all_pools()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 app.include_router(events_router)
@@ -1 +1,2 @@
 from .market_data import MarketDataStreamer
+from .sharded_streamer import ShardedMarketDataStreamer
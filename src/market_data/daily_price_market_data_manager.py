@@ -1,14 +1,35 @@
-from typing import List, Dict, Optional
+import asyncio
+from bisect import bisect_right
+from pathlib import Path
+from typing import List, Dict, Optional, Sequence, Tuple
 from datetime import datetime, date, time, timedelta
 
-from market_data.market_data_manager import MarketDataManager
+import numpy as np
+
+from market_data.market_data_manager import MarketDataManager, OHLC_FIELDS
+from market_data.price_cube import PriceCube
 from market_data.eod.daily_prices_dao import DailyPricesDAO
 from config.environment import get_environment
 from calendars.exchange_calendar import ExchangeCalendar
 from state.instrument_interval import InstrumentInterval
 
 class DailyPriceMarketDataManager(MarketDataManager):
-    def __init__(self, db=None, env=None, exchange="NYSE", start_date: Optional[date]=None):
+    # Trading dates fetched from the calendar per lookup when prefetching
+    SESSION_LOOKAHEAD_DAYS = 366
+
+    def __init__(self, db=None, env=None, exchange="NYSE", start_date: Optional[date]=None, prefetch_depth: Optional[int]=None):
+        """
+        Args:
+            prefetch_depth: Number of upcoming sessions to load in the background
+                after each SOD (default ``performance.prefetch_depth``, 0 = off).
+                The next SOD then swaps in the prefetched buffer instead of
+                querying ``daily_prices`` while the Runner waits.
+
+        Interval bounds come from the session open/close of the runner's
+        ``exchange_calendar`` (this manager's own calendar otherwise), so early
+        closes are honoured; sessions are read from the calendar in bulk and
+        resolved together with each prefetched day.
+        """
         super().__init__(db)
         self.env = env or get_environment()
         self.exchange = exchange
@@ -17,6 +38,14 @@ class DailyPriceMarketDataManager(MarketDataManager):
         self._intervals: Dict[int, InstrumentInterval] = {}
         self._last_prices: Dict[int, Dict[str, float]] = {}
         self._start_date = start_date
+        if prefetch_depth is None:
+            prefetch_depth = int(self.env.get('performance', 'prefetch_depth', 0))
+        self.prefetch_depth = prefetch_depth
+        self._prefetch: Dict[date, asyncio.Task] = {}
+        self._session_calendar: Optional[ExchangeCalendar] = None
+        self._session_dates: List[date] = []
+        self._session_bounds: Dict[date, Tuple[datetime, datetime]] = {}
+        self.cube: Optional[PriceCube] = None
         # Note: _load_last_prices_before_start should be called by user after construction if needed, as it is now async.
 
     async def _load_last_prices_before_start(self):
@@ -43,20 +72,34 @@ class DailyPriceMarketDataManager(MarketDataManager):
         import logging
         logger = logging.getLogger(__name__)
         logger.debug(f"update_for_sod: cur_date={cur_date}")
-        # Load daily_prices for cur_date and store as InstrumentInterval
+        for stale in [d for d in self._prefetch if d < cur_date]:
+            self._prefetch.pop(stale).cancel()
+        calendar = getattr(runner, 'exchange_calendar', None) or self.calendar
+        task = self._prefetch.pop(cur_date, None)
+        if task is not None:
+            logger.debug(f"update_for_sod: using prefetched buffer for {cur_date}")
+            self._intervals = await task
+        else:
+            self._intervals = await self._load_day(cur_date, self._session_open_close(calendar, cur_date))
+        if self.prefetch_depth > 0:
+            end_date = getattr(runner, 'end_date', None)
+            self._schedule_prefetch(calendar, cur_date, end_date.date() if isinstance(end_date, datetime) else end_date)
+
+    async def _load_day(self, cur_date: date, bounds: Optional[Tuple[datetime, datetime]] = None) -> Dict[int, InstrumentInterval]:
+        """Load daily_prices for cur_date as InstrumentIntervals keyed by instrument_id, spanning bounds (open, close)."""
+        import logging
+        logger = logging.getLogger(__name__)
         symbols = self._get_all_symbols()
-        logger.debug(f"update_for_sod: fetched symbols: {symbols}")
+        logger.debug(f"_load_day: fetched symbols: {symbols}")
         results = await self.dao.list_prices_for_symbols_and_date(symbols, cur_date)
-        logger.debug(f"update_for_sod: got {len(results)} price records from DB for date {cur_date}")
-        open_time, close_time = self._get_exchange_open_close(cur_date)
-        logger.debug(f"update_for_sod: open_time={open_time}, close_time={close_time}")
+        logger.debug(f"_load_day: got {len(results)} price records from DB for date {cur_date}")
+        open_time, close_time = bounds or self._get_exchange_open_close(cur_date)
+        logger.debug(f"_load_day: open_time={open_time}, close_time={close_time}")
+        intervals = {}
         for row in results:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.warning(f"update_for_sod: row keys={list(row.keys())}, row values={list(row.values())}")
             instrument_id = self._symbol_to_id(row['symbol'])
-            logger.debug(f"update_for_sod: Creating interval for instrument_id={instrument_id}, symbol={row['symbol']} with row={row}")
-            interval = InstrumentInterval(
+            logger.debug(f"_load_day: Creating interval for instrument_id={instrument_id}, symbol={row['symbol']} with row={row}")
+            intervals[instrument_id] = InstrumentInterval(
                 instrument_id=instrument_id,
                 start_date_time=open_time,
                 end_date_time=close_time,
@@ -68,7 +111,44 @@ class DailyPriceMarketDataManager(MarketDataManager):
                 traded_dollar=row['volume'] * row['close'] if row['volume'] is not None and row['close'] is not None else 0.0,
                 status='ok'
             )
-            self._intervals[instrument_id] = interval
+        return intervals
+
+    def _schedule_prefetch(self, calendar: ExchangeCalendar, cur_date: date, end_date: Optional[date] = None):
+        """Start background loads (prices and session bounds) for up to prefetch_depth sessions after cur_date."""
+        for next_date in self._upcoming_sessions(calendar, cur_date, self.prefetch_depth):
+            if end_date is not None and next_date > end_date:
+                break
+            if next_date not in self._prefetch:
+                bounds = self._session_bounds[next_date]
+                self._prefetch[next_date] = asyncio.ensure_future(self._load_day(next_date, bounds))
+
+    def _load_sessions(self, calendar: ExchangeCalendar, from_date: date):
+        """Read SESSION_LOOKAHEAD_DAYS of sessions starting at from_date from calendar."""
+        sessions = calendar.sessions(from_date, from_date + timedelta(days=self.SESSION_LOOKAHEAD_DAYS))
+        self._session_calendar = calendar
+        self._session_dates = [d for d, _, _ in sessions]
+        self._session_bounds = {d: (o, c) for d, o, c in sessions}
+
+    def _upcoming_sessions(self, calendar: ExchangeCalendar, cur_date: date, count: int) -> List[date]:
+        idx = bisect_right(self._session_dates, cur_date)
+        if calendar is not self._session_calendar or idx + count > len(self._session_dates):
+            self._load_sessions(calendar, cur_date)
+            idx = bisect_right(self._session_dates, cur_date)
+        return self._session_dates[idx:idx + count]
+
+    def _session_open_close(self, calendar: ExchangeCalendar, cur_date: date) -> Tuple[datetime, datetime]:
+        """Session (open, close) for cur_date; the default hours if the calendar has no session that day."""
+        if calendar is not self._session_calendar or not self._session_dates \
+                or not self._session_dates[0] <= cur_date <= self._session_dates[-1]:
+            self._load_sessions(calendar, cur_date)
+        bounds = self._session_bounds.get(cur_date)
+        return bounds if bounds is not None else self._get_exchange_open_close(cur_date)
+
+    def cancel_prefetch(self):
+        """Cancel outstanding background loads, e.g. when the run ends."""
+        for task in self._prefetch.values():
+            task.cancel()
+        self._prefetch.clear()
 
     async def update_for_eod(self, runner=None, current_time=None):
         # Compatible with both legacy and new signatures
@@ -85,6 +165,55 @@ class DailyPriceMarketDataManager(MarketDataManager):
         # Can be used to flush, persist, or clear intervals if needed
         self._intervals.clear()
 
+    async def load_cube(self, instrument_ids: Sequence[int], start_date: date, end_date: date,
+                        cache_dir: Optional[str] = None) -> PriceCube:
+        """
+        Preload every daily bar for instrument_ids in [start_date, end_date] into a PriceCube.
+
+        The cube is cached under ``cache_dir`` (default ``performance.price_cube_dir``)
+        keyed by table, range and instruments, and reopened memory-mapped, so a
+        rerun over the same range never queries ``daily_prices``. While the cube
+        covers a date, get_ohlc_batch/get_ohlc_columns answer from it for
+        intervals that span that date's whole session (a daily base bar); shorter
+        intraday intervals fall back to the regular lookup, since a daily bar
+        cannot be split into them.
+        """
+        cache_dir = Path(cache_dir or self.env.get('performance', 'price_cube_dir', 'data/price_cube'))
+        path = cache_dir / PriceCube.cache_key(self.dao.table_name, start_date, end_date, instrument_ids)
+        cube = PriceCube.load(path)
+        if cube is None:
+            panel = await self.dao.get_price_panel(list(instrument_ids), start_date, end_date, columns=OHLC_FIELDS)
+            PriceCube.from_panel(panel, instrument_ids, OHLC_FIELDS).save(path)
+            cube = PriceCube.load(path)
+        self.cube = cube
+        return cube
+
+    def _cube_serves(self, start: datetime, end: datetime) -> bool:
+        """True if the loaded cube covers start's date and [start, end) spans that session."""
+        if self.cube is None or not self.cube.covers(start.date()):
+            return False
+        open_time, close_time = self._session_open_close(self._session_calendar or self.calendar, start.date())
+        return start <= open_time and end >= close_time
+
+    def get_ohlc_columns(self, instrument_ids: List[int], start: datetime, end: datetime) -> Dict[str, np.ndarray]:
+        if self._cube_serves(start, end):
+            return self.cube.slice(start.date(), instrument_ids)
+        return super().get_ohlc_columns(instrument_ids, start, end)
+
+    def get_ohlc_batch(self, instrument_ids: List[int], start: datetime, end: datetime) -> Dict[int, Optional[Dict[str, float]]]:
+        if not self._cube_serves(start, end):
+            return super().get_ohlc_batch(instrument_ids, start, end)
+        columns = self.cube.slice(start.date(), instrument_ids)
+        batch = {}
+        for i, iid in enumerate(instrument_ids):
+            if np.isnan(columns['close'][i]):
+                batch[iid] = None
+                continue
+            ohlc = {f: float(columns[f][i]) for f in OHLC_FIELDS}
+            ohlc['traded_dollar'] = ohlc['close'] * ohlc['volume'] if not np.isnan(ohlc['volume']) else 0.0
+            batch[iid] = ohlc
+        return batch
+
     def get_ohlc(self, instrument_id: int, start: datetime, end: datetime) -> Optional[Dict[str, float]]:
         import logging
         logger = logging.getLogger(__name__)
@@ -113,7 +242,7 @@ class DailyPriceMarketDataManager(MarketDataManager):
         return fallback
 
     def _get_exchange_open_close(self, cur_date: date):
-        # For NYSE, open=9:30, close=16:00
+        # Default regular hours, used when no calendar session is available: open=9:30, close=16:00
         open_dt = datetime.combine(cur_date, time(9, 30))
         close_dt = datetime.combine(cur_date, time(16, 0))
         return open_dt, close_dt
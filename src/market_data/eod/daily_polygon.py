@@ -5,7 +5,7 @@ from datetime import datetime, timedelta
 import time
 
 from src.config.environment import get_environment, set_environment, EnvironmentType
-from db.dao.daily_prices_polygon_dao import DailyPricesPolygonDAO
+from market_data.eod.daily_prices_polygon_dao import DailyPricesPolygonDAO
 import asyncpg
 import argparse
 
@@ -52,28 +52,31 @@ CREATE TABLE IF NOT EXISTS daily_prices_polygon (
 
 async def insert_prices(prices, ticker, shares_outstanding, env, dao: DailyPricesPolygonDAO):
     if not prices:
-        return
-    for row in prices:
-        date_val = datetime.utcfromtimestamp(row['t']/1000).date()
-        await dao.insert_price(
-            date=date_val,
-            symbol=ticker,
-            open_=row['o'],
-            high=row['h'],
-            low=row['l'],
-            close=row['c'],
-            volume=row['v'],
-            market_cap=(row['c'] * shares_outstanding if shares_outstanding else None)
-        )
+        return 0
+    rows = [
+        {
+            'date': datetime.utcfromtimestamp(row['t']/1000).date(),
+            'symbol': ticker,
+            'open': row['o'],
+            'high': row['h'],
+            'low': row['l'],
+            'close': row['c'],
+            'volume': row['v'],
+            'market_cap': (row['c'] * shares_outstanding if shares_outstanding else None),
+        }
+        for row in prices
+    ]
+    return await dao.upsert_prices(rows)
 
 import argparse
 
 from calendars.exchange_calendar import ExchangeCalendar
 
 async def get_existing_dates_polygon(dao: DailyPricesPolygonDAO, symbol, start_date, end_date):
-    # Use list_prices and filter by date range
-    all_prices = await dao.list_prices(symbol)
-    return set(row['date'] for row in all_prices if start_date <= row['date'] <= end_date)
+    existing_dates = set()
+    async for rows in dao.iter_prices(symbol=symbol, start_date=start_date, end_date=end_date, columns=('date',)):
+        existing_dates.update(row['date'] for row in rows)
+    return existing_dates
 
 def group_contiguous_dates(dates):
     # Given a sorted list of dates, group into contiguous ranges
@@ -1,20 +1,24 @@
+import numpy as np
+
 from config.environment import Environment
-import asyncpg
+from db.pool_registry import acquire, iter_table_chunks
+from secmaster.instrument_resolver import get_instrument_resolver
+from db.bulk_copy import copy_upsert, to_records
+from db.binary_copy import fetch_columns
 
 class DailyPricesDAO:
+    BULK_FIELDS = ('date', 'symbol', 'instrument_id', 'open', 'high', 'low', 'close', 'volume', 'adjusted_price', 'source', 'status', 'note')
+    BULK_COLUMNS = BULK_FIELDS
+    PANEL_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
     def __init__(self, env: Environment):
         self.env = env
         self.table_name = self.env.get_table_name('daily_prices')
         self.db_url = self.env.get_database_url()
 
     async def list_prices_for_symbols_and_date(self, symbols, as_of_date):
-        import asyncpg
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                return await conn.fetch(f"SELECT * FROM {self.table_name} WHERE date = $1 AND symbol = ANY($2)", as_of_date, symbols)
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            return await conn.fetch(f"SELECT * FROM {self.table_name} WHERE date = $1 AND symbol = ANY($2)", as_of_date, symbols)
 
     async def insert_price(self, date, symbol=None, instrument_id=None, open_=None, high=None, low=None, close=None, volume=None, adjusted_price=None, source=None, status=None, note=None, vendor_id=None, at_date=None):
         """
@@ -22,71 +26,114 @@ class DailyPricesDAO:
         """
         if instrument_id is None and symbol is not None:
             instrument_id = await self.resolve_instrument_id(symbol, vendor_id, at_date or date)
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                await conn.execute(f"""
-                    INSERT INTO {self.table_name} (date, symbol, instrument_id, open, high, low, close, volume, adjusted_price, source, status, note)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
-                """, date, symbol, instrument_id, open_, high, low, close, volume, adjusted_price, source, status, note)
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            await conn.execute(f"""
+                INSERT INTO {self.table_name} (date, symbol, instrument_id, open, high, low, close, volume, adjusted_price, source, status, note)
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
+            """, date, symbol, instrument_id, open_, high, low, close, volume, adjusted_price, source, status, note)
+
+    async def upsert_prices(self, rows, vendor_id=None) -> int:
+        """
+        Bulk insert/update price rows via COPY into a staging table and one ON CONFLICT merge.
+        Rows are dicts (or DataFrame/Arrow columns) keyed by ``date``, ``symbol``, ``instrument_id``,
+        ``open``, ``high``, ``low``, ``close``, ``volume``, ``adjusted_price``, ``source``, ``status`` and ``note``.
+        Rows without instrument_id are resolved from instrument_xrefs (point-in-time on ``date``).
+        Returns the number of rows written.
+        """
+        records = to_records(rows, self.BULK_FIELDS)
+        if not records:
+            return 0
+        async with acquire(self.env) as conn:
+            return await copy_upsert(
+                conn, self.table_name, self.BULK_COLUMNS, records,
+                conflict_columns=('date', 'instrument_id'),
+                xref_table=self.env.get_table_name('instrument_xrefs'),
+                vendor_id=vendor_id,
+            )
 
     async def resolve_instrument_id(self, symbol, vendor_id=None, at_date=None):
         """
-        Lookup instrument_id from instrument_xref using symbol (and vendor_id, at_date if provided).
-        """
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                q = f"SELECT instrument_id FROM instrument_xref WHERE symbol = $1"
-                params = [symbol]
-                if vendor_id is not None:
-                    q += " AND vendor_id = $2"
-                    params.append(vendor_id)
-                if at_date is not None:
-                    if vendor_id is not None:
-                        q += " AND (start_at <= $3 AND (end_at IS NULL OR end_at >= $3))"
-                        params.append(at_date)
-                    else:
-                        q += " AND (start_at <= $2 AND (end_at IS NULL OR end_at >= $2))"
-                        params.append(at_date)
-                q += " ORDER BY start_at DESC LIMIT 1"
-                row = await conn.fetchrow(q, *params)
-                if not row:
-                    raise ValueError(f"No instrument_id found for symbol={symbol}, vendor_id={vendor_id}, at_date={at_date}")
-                return row['instrument_id']
-        finally:
-            await pool.close()
+        Lookup instrument_id for symbol (and vendor_id, at_date if provided) from the in-memory instrument_xrefs index.
+        """
+        return await get_instrument_resolver(self.env).lookup(symbol, vendor_id, at_date)
 
     async def get_price(self, date, symbol=None, instrument_id=None):
         """
         Get price row by date and instrument_id (preferred), or symbol (legacy).
         """
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                if instrument_id is not None:
-                    return await conn.fetchrow(f"SELECT * FROM {self.table_name} WHERE date = $1 AND instrument_id = $2", date, instrument_id)
-                elif symbol is not None:
-                    return await conn.fetchrow(f"SELECT * FROM {self.table_name} WHERE date = $1 AND symbol = $2", date, symbol)
-                else:
-                    raise ValueError("Must provide symbol or instrument_id")
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            if instrument_id is not None:
+                return await conn.fetchrow(f"SELECT * FROM {self.table_name} WHERE date = $1 AND instrument_id = $2", date, instrument_id)
+            elif symbol is not None:
+                return await conn.fetchrow(f"SELECT * FROM {self.table_name} WHERE date = $1 AND symbol = $2", date, symbol)
+            else:
+                raise ValueError("Must provide symbol or instrument_id")
 
     async def list_prices(self, symbol=None, instrument_id=None):
         """
         List all prices for an instrument_id (preferred) or symbol (legacy).
         """
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                if instrument_id is not None:
-                    return await conn.fetch(f"SELECT * FROM {self.table_name} WHERE instrument_id = $1", instrument_id)
-                elif symbol is not None:
-                    return await conn.fetch(f"SELECT * FROM {self.table_name} WHERE symbol = $1", symbol)
-                else:
-                    raise ValueError("Must provide symbol or instrument_id")
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            if instrument_id is not None:
+                return await conn.fetch(f"SELECT * FROM {self.table_name} WHERE instrument_id = $1", instrument_id)
+            elif symbol is not None:
+                return await conn.fetch(f"SELECT * FROM {self.table_name} WHERE symbol = $1", symbol)
+            else:
+                raise ValueError("Must provide symbol or instrument_id")
+
+    async def iter_prices(self, symbol=None, instrument_id=None, start_date=None, end_date=None, columns=None, chunk_size=None):
+        """
+        Stream prices in chunks through a server-side cursor, ordered by instrument_id and date.
+        Filters by instrument_id (preferred) or symbol, and by an inclusive date range in SQL.
+        """
+        async for rows in iter_table_chunks(
+            self.env, self.table_name, symbol=symbol, instrument_id=instrument_id,
+            start_date=start_date, end_date=end_date, columns=columns, chunk_size=chunk_size,
+        ):
+            yield rows
+
+    async def get_price_panel(self, instrument_ids, start_date, end_date, columns=None, as_arrow=False):
+        """
+        Columnar price read for instruments over an inclusive date range.
+        Rows are decoded from a binary COPY straight into NumPy arrays (no per-row Python objects),
+        ordered by instrument_id and date. Value columns are float64 with NaN for NULL.
+        Returns a dict of arrays ('date', 'instrument_id', *columns), or a pyarrow.Table if as_arrow.
+        """
+        columns = tuple(columns or self.PANEL_COLUMNS)
+        values = ', '.join(f"COALESCE({c}::float8, 'NaN'::float8) AS {c}" for c in columns)
+        query = (
+            f"SELECT date, instrument_id, {values} FROM {self.table_name} "
+            f"WHERE instrument_id = ANY($1::int[]) AND date >= $2 AND date <= $3 "
+            f"ORDER BY instrument_id, date"
+        )
+        fields = [('date', 'date'), ('instrument_id', 'int4')] + [(c, 'float8') for c in columns]
+        panel = await fetch_columns(self.env, query, list(instrument_ids), start_date, end_date, fields=fields)
+        if as_arrow:
+            import pyarrow as pa
+            return pa.table(panel)
+        return panel
+
+    async def get_price_matrix(self, instrument_ids, start_date, end_date, column='close'):
+        """
+        Dense date x instrument matrix for one column.
+        Returns (dates, instrument_ids, matrix): dates are the sorted distinct dates with data,
+        instrument_ids follow the requested order, and missing cells are NaN.
+        """
+        panel = await self.get_price_panel(instrument_ids, start_date, end_date, columns=(column,))
+        return to_dense_matrix(panel, instrument_ids, column)
+
+
+def to_dense_matrix(panel, instrument_ids, column):
+    """
+    Pivot a long price panel (dict of arrays) into (dates, instrument_ids, date x instrument matrix).
+    """
+    ids = np.asarray(list(instrument_ids), dtype=np.int64)
+    dates, row_idx = np.unique(panel['date'], return_inverse=True)
+    order = np.argsort(ids, kind='stable')
+    pos = np.searchsorted(ids, panel['instrument_id'], sorter=order)
+    pos = np.clip(pos, 0, max(len(ids) - 1, 0))
+    col_idx = order[pos] if len(ids) else pos
+    known = ids[col_idx] == panel['instrument_id'] if len(ids) else np.zeros(len(pos), dtype=bool)
+    matrix = np.full((len(dates), len(ids)), np.nan, dtype=np.float64)
+    matrix[row_idx[known], col_idx[known]] = panel[column][known]
+    return dates, ids, matrix
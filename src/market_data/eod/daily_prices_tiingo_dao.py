@@ -1,7 +1,13 @@
 from config.environment import Environment
-import asyncpg
+from db.pool_registry import acquire, iter_table_chunks
+from secmaster.instrument_resolver import get_instrument_resolver
+from db.bulk_copy import copy_upsert, to_records
 
 class DailyPricesTiingoDAO:
+    BULK_FIELDS = ('date', 'symbol', 'instrument_id', 'open', 'high', 'low', 'close', 'adjClose', 'volume', 'status_id')
+    # Unquoted adjClose in the DDL folds to adjclose; COPY quotes column names
+    BULK_COLUMNS = ('date', 'symbol', 'instrument_id', 'open', 'high', 'low', 'close', 'adjclose', 'volume', 'status_id')
+
     def __init__(self, env: Environment):
         self.env = env
         self.table_name = self.env.get_table_name('daily_prices_tiingo')
@@ -13,71 +19,68 @@ class DailyPricesTiingoDAO:
         """
         if instrument_id is None and symbol is not None:
             instrument_id = await self.resolve_instrument_id(symbol, vendor_id, at_date or date)
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                await conn.execute(f"""
-                    INSERT INTO {self.table_name} (date, symbol, instrument_id, open, high, low, close, adjClose, volume, status_id)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
-                """, date, symbol, instrument_id, open_, high, low, close, adj_close, volume, status_id)
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            await conn.execute(f"""
+                INSERT INTO {self.table_name} (date, symbol, instrument_id, open, high, low, close, adjClose, volume, status_id)
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+            """, date, symbol, instrument_id, open_, high, low, close, adj_close, volume, status_id)
+
+    async def upsert_prices(self, rows, vendor_id=None) -> int:
+        """
+        Bulk insert/update price rows via COPY into a staging table and one ON CONFLICT merge.
+        Rows are dicts (or DataFrame/Arrow columns) keyed by ``date``, ``symbol``, ``instrument_id``,
+        ``open``, ``high``, ``low``, ``close``, ``adjClose``, ``volume`` and ``status_id``.
+        Rows without instrument_id are resolved from instrument_xrefs (point-in-time on ``date``).
+        Returns the number of rows written.
+        """
+        records = to_records(rows, self.BULK_FIELDS)
+        if not records:
+            return 0
+        async with acquire(self.env) as conn:
+            return await copy_upsert(
+                conn, self.table_name, self.BULK_COLUMNS, records,
+                conflict_columns=('date', 'instrument_id'),
+                xref_table=self.env.get_table_name('instrument_xrefs'),
+                vendor_id=vendor_id,
+            )
 
     async def resolve_instrument_id(self, symbol, vendor_id=None, at_date=None):
         """
-        Lookup instrument_id from instrument_xref using symbol (and vendor_id, at_date if provided).
+        Lookup instrument_id for symbol (and vendor_id, at_date if provided) from the in-memory instrument_xrefs index.
         """
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                q = f"SELECT instrument_id FROM instrument_xref WHERE symbol = $1"
-                params = [symbol]
-                if vendor_id is not None:
-                    q += " AND vendor_id = $2"
-                    params.append(vendor_id)
-                if at_date is not None:
-                    if vendor_id is not None:
-                        q += " AND (start_at <= $3 AND (end_at IS NULL OR end_at >= $3))"
-                        params.append(at_date)
-                    else:
-                        q += " AND (start_at <= $2 AND (end_at IS NULL OR end_at >= $2))"
-                        params.append(at_date)
-                q += " ORDER BY start_at DESC LIMIT 1"
-                row = await conn.fetchrow(q, *params)
-                if not row:
-                    raise ValueError(f"No instrument_id found for symbol={symbol}, vendor_id={vendor_id}, at_date={at_date}")
-                return row['instrument_id']
-        finally:
-            await pool.close()
+        return await get_instrument_resolver(self.env).lookup(symbol, vendor_id, at_date)
 
     async def get_price(self, date, symbol=None, instrument_id=None):
         """
         Get price row by date and instrument_id (preferred), or symbol (legacy).
         """
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                if instrument_id is not None:
-                    return await conn.fetchrow(f"SELECT * FROM {self.table_name} WHERE date = $1 AND instrument_id = $2", date, instrument_id)
-                elif symbol is not None:
-                    return await conn.fetchrow(f"SELECT * FROM {self.table_name} WHERE date = $1 AND symbol = $2", date, symbol)
-                else:
-                    raise ValueError("Must provide symbol or instrument_id")
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            if instrument_id is not None:
+                return await conn.fetchrow(f"SELECT * FROM {self.table_name} WHERE date = $1 AND instrument_id = $2", date, instrument_id)
+            elif symbol is not None:
+                return await conn.fetchrow(f"SELECT * FROM {self.table_name} WHERE date = $1 AND symbol = $2", date, symbol)
+            else:
+                raise ValueError("Must provide symbol or instrument_id")
 
     async def list_prices(self, symbol=None, instrument_id=None):
         """
         List all prices for an instrument_id (preferred) or symbol (legacy).
         """
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                if instrument_id is not None:
-                    return await conn.fetch(f"SELECT * FROM {self.table_name} WHERE instrument_id = $1", instrument_id)
-                elif symbol is not None:
-                    return await conn.fetch(f"SELECT * FROM {self.table_name} WHERE symbol = $1", symbol)
-                else:
-                    raise ValueError("Must provide symbol or instrument_id")
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            if instrument_id is not None:
+                return await conn.fetch(f"SELECT * FROM {self.table_name} WHERE instrument_id = $1", instrument_id)
+            elif symbol is not None:
+                return await conn.fetch(f"SELECT * FROM {self.table_name} WHERE symbol = $1", symbol)
+            else:
+                raise ValueError("Must provide symbol or instrument_id")
+
+    async def iter_prices(self, symbol=None, instrument_id=None, start_date=None, end_date=None, columns=None, chunk_size=None):
+        """
+        Stream prices in chunks through a server-side cursor, ordered by instrument_id and date.
+        Filters by instrument_id (preferred) or symbol, and by an inclusive date range in SQL.
+        """
+        async for rows in iter_table_chunks(
+            self.env, self.table_name, symbol=symbol, instrument_id=instrument_id,
+            start_date=start_date, end_date=end_date, columns=columns, chunk_size=chunk_size,
+        ):
+            yield rows
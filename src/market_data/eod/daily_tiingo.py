@@ -6,7 +6,7 @@ from datetime import datetime, timedelta
 import pandas as pd
 import argparse
 from src.config.environment import get_environment, set_environment, EnvironmentType
-from db.dao.daily_prices_tiingo_dao import DailyPricesTiingoDAO
+from market_data.eod.daily_prices_tiingo_dao import DailyPricesTiingoDAO
 
 def parse_env_type(env_str):
     env_map = {
@@ -44,8 +44,10 @@ def tiingo_url(symbol, start_date, end_date):
     )
 
 async def get_existing_dates(dao: DailyPricesTiingoDAO, symbol, start_date, end_date):
-    all_prices = await dao.list_prices(symbol)
-    return set(row['date'] for row in all_prices if start_date <= row['date'] <= end_date)
+    existing_dates = set()
+    async for rows in dao.iter_prices(symbol=symbol, start_date=start_date, end_date=end_date, columns=('date',)):
+        existing_dates.update(row['date'] for row in rows)
+    return existing_dates
 
 from calendars.exchange_calendar import ExchangeCalendar
 
@@ -113,37 +115,31 @@ async def fetch_and_insert_symbol(dao: DailyPricesTiingoDAO, session, symbol, st
                 print(f"[WARNING] No data returned for {symbol} from {range_start} to {range_end}")
                 # Insert a row for each missing trading day in this range with status NO_DATA
                 missing_days = [d for d in trading_days if range_start <= d <= range_end]
-                for d in missing_days:
-                    await dao.insert_price(
-                        date=d,
-                        symbol=symbol,
-                        open_=None,
-                        high=None,
-                        low=None,
-                        close=None,
-                        adj_close=None,
-                        volume=None,
-                        status_id=no_data_status_id
-                    )
+                await dao.upsert_prices([
+                    {'date': d, 'symbol': symbol, 'status_id': no_data_status_id}
+                    for d in missing_days
+                ])
                 print(f"[INFO] Inserted {len(missing_days)} NO_DATA rows for {symbol} from {range_start} to {range_end}")
                 continue
+            rows = []
             for row in data:
                 # Robustly parse Tiingo ISO date string (e.g., '2020-01-02T00:00:00.000Z')
                 date_val = pd.to_datetime(row['date']).date()
                 if date_val not in trading_days:
                     continue  # Only insert if NYSE is open
-                await dao.insert_price(
-                    date=date_val,
-                    symbol=symbol,
-                    open_=row.get('open'),
-                    high=row.get('high'),
-                    low=row.get('low'),
-                    close=row.get('close'),
-                    adj_close=row.get('adjClose'),
-                    volume=row.get('volume'),
-                    status_id=ok_status_id
-                )
-            print(f"[INFO] Inserted {len(data)} rows for {symbol} from {range_start} to {range_end}")
+                rows.append({
+                    'date': date_val,
+                    'symbol': symbol,
+                    'open': row.get('open'),
+                    'high': row.get('high'),
+                    'low': row.get('low'),
+                    'close': row.get('close'),
+                    'adjClose': row.get('adjClose'),
+                    'volume': row.get('volume'),
+                    'status_id': ok_status_id,
+                })
+            inserted = await dao.upsert_prices(rows)
+            print(f"[INFO] Inserted {inserted} rows for {symbol} from {range_start} to {range_end}")
 
 # --- MAIN FUNCTION AND ENTRYPOINT ---
 async def get_instrument_dates(env, symbol):
@@ -1,5 +1,6 @@
 from config.environment import Environment
-import asyncpg
+from db.pool_registry import acquire
+from secmaster.instrument_resolver import get_instrument_resolver
 from typing import Optional
 
 class StockSplitsDAO:
@@ -14,50 +15,24 @@ class StockSplitsDAO:
         """
         if instrument_id is None and symbol is not None:
             instrument_id = await self.resolve_instrument_id(symbol, vendor_id, at_date or ex_date)
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                await conn.execute(f"""
-                    INSERT INTO {self.table_name} (symbol, instrument_id, ex_date, split_ratio, split_from, split_to, source)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7)
-                """, symbol, instrument_id, ex_date, split_ratio, split_from, split_to, source)
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            await conn.execute(f"""
+                INSERT INTO {self.table_name} (symbol, instrument_id, ex_date, split_ratio, split_from, split_to, source)
+                VALUES ($1, $2, $3, $4, $5, $6, $7)
+            """, symbol, instrument_id, ex_date, split_ratio, split_from, split_to, source)
 
     async def list_splits(self, symbol: Optional[str] = None, instrument_id: Optional[int] = None):
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                if instrument_id is not None:
-                    rows = await conn.fetch(f"SELECT * FROM {self.table_name} WHERE instrument_id = $1 ORDER BY ex_date ASC", instrument_id)
-                elif symbol is not None:
-                    rows = await conn.fetch(f"SELECT * FROM {self.table_name} WHERE symbol = $1 ORDER BY ex_date ASC", symbol)
-                else:
-                    raise ValueError("Must provide symbol or instrument_id")
-                return [dict(row) for row in rows]
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            if instrument_id is not None:
+                rows = await conn.fetch(f"SELECT * FROM {self.table_name} WHERE instrument_id = $1 ORDER BY ex_date ASC", instrument_id)
+            elif symbol is not None:
+                rows = await conn.fetch(f"SELECT * FROM {self.table_name} WHERE symbol = $1 ORDER BY ex_date ASC", symbol)
+            else:
+                raise ValueError("Must provide symbol or instrument_id")
+            return [dict(row) for row in rows]
 
     async def resolve_instrument_id(self, symbol, vendor_id=None, at_date=None):
-        pool = await asyncpg.create_pool(self.db_url)
-        try:
-            async with pool.acquire() as conn:
-                q = f"SELECT instrument_id FROM instrument_xref WHERE symbol = $1"
-                params = [symbol]
-                if vendor_id is not None:
-                    q += " AND vendor_id = $2"
-                    params.append(vendor_id)
-                if at_date is not None:
-                    if vendor_id is not None:
-                        q += " AND (start_at <= $3 AND (end_at IS NULL OR end_at >= $3))"
-                        params.append(at_date)
-                    else:
-                        q += " AND (start_at <= $2 AND (end_at IS NULL OR end_at >= $2))"
-                        params.append(at_date)
-                q += " ORDER BY start_at DESC LIMIT 1"
-                row = await conn.fetchrow(q, *params)
-                if not row:
-                    raise ValueError(f"No instrument_id found for symbol={symbol}, vendor_id={vendor_id}, at_date={at_date}")
-                return row['instrument_id']
-        finally:
-            await pool.close()
+        """
+        Lookup instrument_id for symbol (and vendor_id, at_date if provided) from the in-memory instrument_xrefs index.
+        """
+        return await get_instrument_resolver(self.env).lookup(symbol, vendor_id, at_date)
@@ -11,16 +11,26 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 from collections import deque, defaultdict
-from calendars.market_calendar_utils import get_market_calendar, get_last_open_close
+from calendars.market_calendar_utils import get_market_calendar, SessionScheduleCache
+from dateutil.relativedelta import relativedelta
+from market_data.rolling_window import BarWindow, RollingWindow, choose_resolution
+from market_data.tick_queue import TickQueue
 from datetime import timedelta
 import pandas as pd
 
 class MarketDataStreamer:
-    def __init__(self, ib: IB, symbols: List[str], vwap_window: int = 100):
+    def __init__(self, ib: IB, symbols: List[str], vwap_window: int = 100, max_bars_per_window: int = 2048,
+                 queue_maxsize: int = 0, overflow: str = 'drop_oldest', recorder=None):
         self.ib = ib
+        # Optional TickRecorder: raw tick fields are appended before processing
+        self.recorder = recorder
         self.symbols = symbols
         self.contracts = [Contract(symbol=s, secType='STK', exchange='SMART', currency='USD') for s in symbols]
-        self._queue = asyncio.Queue()
+        # Tick queue, unbounded unless queue_maxsize is set; see TickQueue for the
+        # overflow policies. on_tick is a synchronous IB callback and cannot wait, so
+        # under 'block' a tick arriving at a full queue is rejected (counted in
+        # queue_stats()['rejected']).
+        self._queue = TickQueue(maxsize=queue_maxsize, overflow=overflow)
         # Multi-interval support
         self.intervals = {
             '5m': pd.Timedelta(minutes=5),
@@ -33,19 +43,62 @@ class MarketDataStreamer:
             '1q': pd.DateOffset(months=3),
             '1y': pd.DateOffset(years=1)
         }
-        # Store bars per symbol and interval: {symbol: {interval: deque of (time, price, volume)}}
-        self.interval_bars = {symbol: {k: deque() for k in self.intervals} for symbol in symbols}
+        # Look-back per interval: fixed windows keep every tick (RollingWindow); calendar
+        # windows (1mo, 1q, 1y) fold ticks into bars (BarWindow) at the finest resolution
+        # that keeps them within max_bars_per_window, so memory per symbol is bounded.
+        self._window_deltas = {}
+        self._bar_resolutions = {}
+        for k, v in self.intervals.items():
+            if isinstance(v, pd.Timedelta):
+                self._window_deltas[k] = v.to_pytimedelta()
+            else:
+                offset = relativedelta(**{unit: value for unit, value in v.kwds.items() if unit in ('years', 'months', 'weeks', 'days')})
+                self._window_deltas[k] = offset
+                longest = timedelta(days=366 * offset.years + 31 * offset.months + 1)
+                self._bar_resolutions[k] = choose_resolution(longest, max_bars_per_window)
+        self.interval_windows = {symbol: self._new_windows() for symbol in symbols}
+        # Calendar cutoffs are recomputed once per minute (relativedelta arithmetic is
+        # slow); flooring to the minute only keeps < 1 minute of extra bar history.
+        self._calendar_cutoffs = {}
         self.previous_closes = {symbol: {k: None for k in self.intervals} for symbol in symbols}
         # Initialize LSE calendar
         self.lse_cal = get_market_calendar('LSE')
+        self._lse_sessions = None
+
+    @property
+    def lse_sessions(self) -> SessionScheduleCache:
+        """Session cache for lse_cal, rebuilt if the calendar is replaced."""
+        if self._lse_sessions is None or self._lse_sessions.calendar is not self.lse_cal:
+            self._lse_sessions = SessionScheduleCache(self.lse_cal)
+        return self._lse_sessions
+
+    def _new_windows(self) -> dict:
+        return {
+            k: BarWindow(self._bar_resolutions[k]) if k in self._bar_resolutions else RollingWindow()
+            for k in self.intervals
+        }
+
+    @staticmethod
+    def tick_fields(tick) -> tuple:
+        """(symbol, last, last size, time, bid, ask) of an IB ticker."""
+        return (
+            tick.contract.symbol,
+            tick.last,
+            getattr(tick, 'lastSize', None),
+            tick.time,
+            tick.bid if hasattr(tick, 'bid') else None,
+            tick.ask if hasattr(tick, 'ask') else None,
+        )
 
     def on_tick(self, tick):
         # Called on every tick update
-        symbol = tick.contract.symbol
-        price = tick.last
-        volume = getattr(tick, 'lastSize', None)
-        tick_time = tick.time
+        fields = self.tick_fields(tick)
+        if self.recorder is not None:
+            self.recorder.record(*fields)
+        self._queue.put_nowait(self.process_tick(*fields))
 
+    def process_tick(self, symbol: str, price, volume, tick_time, bid=None, ask=None) -> dict:
+        """Update interval state for one tick and return its tick dict."""
         # Ensure tick_time is a datetime object
         if not isinstance(tick_time, datetime):
             try:
@@ -62,56 +115,20 @@ class MarketDataStreamer:
         adjusted_dom = dom + first_day.weekday()
         week_of_month = int((adjusted_dom - 1) / 7) + 1
 
-        # Get last LSE open and close times using utility
-        lse_last_open, lse_last_close = get_last_open_close(self.lse_cal, tick_time)
+        # Get last LSE open and close times from the precomputed session arrays
+        lse_last_open, lse_last_close = self.lse_sessions.last_open_close(tick_time)
         if lse_last_open is not None:
             lse_last_open = lse_last_open.to_pydatetime()
         if lse_last_close is not None:
             lse_last_close = lse_last_close.to_pydatetime()
 
-        # Multi-interval signal computation
-        interval_signals = {}
-        for interval, delta in self.intervals.items():
-            # Maintain bar deque for this symbol/interval
-            bar_deque = self.interval_bars[symbol][interval]
-            # Remove old bars
-            cutoff = tick_time - (delta if isinstance(delta, pd.Timedelta) else pd.Timedelta(days=365))
-            while bar_deque and bar_deque[0][0] < cutoff:
-                bar_deque.popleft()
-            # Append current tick
-            if price is not None and volume is not None:
-                bar_deque.append((tick_time, price, volume))
-            # Extract prices and volumes
-            prices = [b[1] for b in bar_deque]
-            volumes = [b[2] for b in bar_deque]
-            high = max(prices) if prices else None
-            low = min(prices) if prices else None
-            close = prices[-1] if prices else None
-            # VWAP
-            total_pv = sum(p * v for _, p, v in bar_deque)
-            total_vol = sum(volumes)
-            vwap = total_pv / total_vol if total_vol > 0 else None
-            # True Range
-            prev_close = self.previous_closes[symbol][interval]
-            if high is not None and low is not None and prev_close is not None:
-                tr = max(
-                    high - low,
-                    abs(high - prev_close),
-                    abs(low - prev_close)
-                )
-            else:
-                tr = None
-            interval_signals[interval] = {
-                'high': high, 'low': low, 'close': close, 'vwap': vwap, 'true_range': tr
-            }
-            # Store for next tick
-            self.previous_closes[symbol][interval] = close
+        interval_signals = self._update_interval_signals(symbol, tick_time, price, volume)
 
         # Compose tick dict
-        tick_data = {
+        return {
             'symbol': symbol,
-            'bid': tick.bid if hasattr(tick, 'bid') else None,
-            'ask': tick.ask if hasattr(tick, 'ask') else None,
+            'bid': bid,
+            'ask': ask,
             'last': price,
             'time': tick_time,
             'volume': volume,
@@ -122,8 +139,41 @@ class MarketDataStreamer:
             'lse_last_close': lse_last_close,
             'interval_signals': interval_signals
         }
-        # Put on queue
-        self._queue.put_nowait(tick_data)
+
+    def _update_interval_signals(self, symbol: str, tick_time: datetime, price, volume) -> dict:
+        """
+        Update every interval window for symbol with this tick and return
+        {interval: {'high', 'low', 'close', 'vwap', 'true_range'}}.
+        Amortized O(1) per interval (see RollingWindow).
+        """
+        interval_signals = {}
+        windows = self.interval_windows[symbol]
+        previous_closes = self.previous_closes[symbol]
+        has_sample = price is not None and volume is not None
+        minute = tick_time.replace(second=0, microsecond=0)
+        for interval, delta in self._window_deltas.items():
+            window = windows[interval]
+            if interval in self._bar_resolutions:
+                cached = self._calendar_cutoffs.get(interval)
+                if cached is None or cached[0] != minute:
+                    cached = self._calendar_cutoffs[interval] = (minute, minute - delta)
+                window.evict_before(cached[1])
+            else:
+                window.evict_before(tick_time - delta)
+            if has_sample:
+                window.append(tick_time, price, volume)
+            high, low, close = window.high, window.low, window.close
+            prev_close = previous_closes[interval]
+            if high is not None and prev_close is not None:
+                tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+            else:
+                tr = None
+            interval_signals[interval] = {
+                'high': high, 'low': low, 'close': close, 'vwap': window.vwap, 'true_range': tr
+            }
+            # Store for next tick
+            previous_closes[interval] = close
+        return interval_signals
 
     async def stream_ticks(self, on_tick: Callable[[dict], Any] = None) -> AsyncGenerator[dict, None]:
         """
@@ -136,3 +186,16 @@ class MarketDataStreamer:
                 on_tick(tick_data)
             yield tick_data
 
+    async def stream_tick_batches(self, max_batch: int = 512, max_wait_ms: float = 5.0) -> AsyncGenerator[List[dict], None]:
+        """
+        Asynchronously yields lists of tick dicts (oldest first). Each batch is
+        emitted once max_batch ticks are available or max_wait_ms after its
+        first tick arrived, whichever comes first.
+        """
+        while True:
+            yield await self._queue.get_batch(max_batch, max_wait_ms / 1000.0)
+
+    def queue_stats(self) -> dict:
+        """Tick queue depth, drop and lag counters (see TickQueue.stats)."""
+        return self._queue.stats()
+
@@ -1,6 +1,10 @@
 from typing import List, Dict, Tuple, Optional
 from datetime import datetime
 
+import numpy as np
+
+OHLC_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
 class MarketDataManager:
     """
     Provides open, high, low, close for a given instrument and time range.
@@ -23,3 +27,24 @@ class MarketDataManager:
         Returns a dict mapping instrument_id to its ohlc dict for the given time range.
         """
         return {iid: self.get_ohlc(iid, start, end) for iid in instrument_ids}
+
+    def get_ohlc_columns(self, instrument_ids: List[int], start: datetime, end: datetime) -> Dict[str, np.ndarray]:
+        """
+        Returns OHLCV as float arrays aligned with instrument_ids (keys OHLC_FIELDS),
+        NaN where no data is available. Columnar managers override this with a slice.
+        """
+        return ohlc_columns_from_batch(self.get_ohlc_batch(instrument_ids, start, end), instrument_ids)
+
+
+def ohlc_columns_from_batch(batch: Dict[int, Optional[Dict[str, float]]], instrument_ids: List[int]) -> Dict[str, np.ndarray]:
+    """Convert a get_ohlc_batch result to OHLC_FIELDS arrays aligned with instrument_ids (NaN = missing)."""
+    columns = {f: np.full(len(instrument_ids), np.nan) for f in OHLC_FIELDS}
+    for i, iid in enumerate(instrument_ids):
+        ohlc = batch.get(iid)
+        if not ohlc:
+            continue
+        for f in OHLC_FIELDS:
+            value = ohlc.get(f)
+            if value is not None:
+                columns[f][i] = value
+    return columns
@@ -1,6 +1,10 @@
 import random
+import zlib
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
 
 def simulate_market_data(symbol: str, start_time: datetime, num_ticks: int, interval_seconds: int = 60) -> List[Dict[str, Any]]:
     """
@@ -27,3 +31,95 @@ def simulate_market_data(symbol: str, start_time: datetime, num_ticks: int, inte
         })
     return ticks
 
+
+
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+SIMULATION_FIELDS = ('open', 'high', 'low', 'close', 'volume', 'bid', 'ask')
+
+
+def _symbol_rng(seed: Optional[int], symbol: str) -> np.random.Generator:
+    # One stream per (seed, symbol): a symbol's path does not depend on which
+    # other symbols are simulated, their order, or the process generating it.
+    return np.random.default_rng(np.random.SeedSequence([0 if seed is None else seed, zlib.crc32(symbol.encode())]))
+
+
+def simulate_market_paths(symbols: Sequence[str], start_time: datetime, num_steps: int,
+                          interval_seconds: int = 60, model: str = 'random_walk', seed: Optional[int] = None,
+                          start_price: float = 100.0, drift: float = 0.05, volatility: float = 0.2,
+                          base_volume: float = 1000.0, spread: float = 0.1,
+                          as_frame: bool = False) -> Union[Dict[str, np.ndarray], pd.DataFrame]:
+    """
+    Simulate OHLCV bars for every symbol x step in one call.
+
+    Models:
+        - 'random_walk': close moves by U(-1, 1) per step, floored at 1
+          (the simulate_market_data walk)
+        - 'gbm': geometric Brownian motion with annualized drift and volatility
+
+    Args:
+        symbols: N symbols
+        start_time: Start of the first bar
+        num_steps: T bars per symbol, interval_seconds apart
+        seed: Same seed -> same paths in any process; None draws fresh entropy
+        as_frame: Return a long DataFrame (time, symbol, fields) instead of arrays
+
+    Returns:
+        {'time': (T,) datetime64[s], 'symbol': (N,) array, field: (N, T) float64 for
+        each of SIMULATION_FIELDS}, or the equivalent long DataFrame
+
+    Raises:
+        ValueError: On an unknown model
+    """
+    if model not in ('random_walk', 'gbm'):
+        raise ValueError(f"Unknown simulation model: {model}")
+    if seed is None:
+        seed = int(np.random.SeedSequence().generate_state(1)[0])
+    n, t = len(symbols), num_steps
+    # (N, 4, T) standard draws: close increment, high / low extension, volume
+    draws = np.empty((n, 4, t))
+    for i, symbol in enumerate(symbols):
+        rng = _symbol_rng(seed, symbol)
+        if model == 'random_walk':
+            draws[i, 0] = rng.uniform(-1.0, 1.0, t)
+        else:
+            draws[i, 0] = rng.standard_normal(t)
+        draws[i, 1:] = rng.standard_normal((3, t))
+
+    if model == 'random_walk':
+        # p_t = max(1, p_{t-1} + d_t) in closed form (Lindley recursion):
+        # p_t - 1 = S_t - min(1 - p_0, min_{k<=t} S_k)
+        steps = np.cumsum(draws[:, 0], axis=1)
+        close = 1.0 + steps - np.minimum(1.0 - start_price, np.minimum.accumulate(steps, axis=1))
+        extension = 0.5 * np.abs(draws[:, 1:3])
+        open_ = np.concatenate([np.full((n, 1), start_price), close[:, :-1]], axis=1)
+        high = np.maximum(open_, close) + extension[:, 0]
+        low = np.maximum(np.minimum(open_, close) - extension[:, 1], 1.0)
+    else:
+        dt = interval_seconds / SECONDS_PER_YEAR
+        step_sigma = volatility * np.sqrt(dt)
+        log_steps = (drift - 0.5 * volatility ** 2) * dt + step_sigma * draws[:, 0]
+        close = start_price * np.exp(np.cumsum(log_steps, axis=1))
+        open_ = np.concatenate([np.full((n, 1), start_price), close[:, :-1]], axis=1)
+        extension = np.exp(0.5 * step_sigma * np.abs(draws[:, 1:3]))
+        high = np.maximum(open_, close) * extension[:, 0]
+        low = np.minimum(open_, close) / extension[:, 1]
+    volume = np.maximum(1.0, np.rint(base_volume * np.exp(0.25 * draws[:, 3])))
+
+    times = np.datetime64(start_time, 's') + np.arange(t) * np.timedelta64(interval_seconds, 's')
+    result = {
+        'time': times,
+        'symbol': np.asarray(symbols, dtype=object),
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': volume,
+        'bid': close - spread / 2,
+        'ask': close + spread / 2,
+    }
+    if not as_frame:
+        return result
+    frame = {'time': np.tile(times, n), 'symbol': np.repeat(result['symbol'], t)}
+    for field in SIMULATION_FIELDS:
+        frame[field] = result[field].ravel()
+    return pd.DataFrame(frame)
@@ -0,0 +1,122 @@
+"""
+PriceCube - date x instrument x field array of daily bars.
+
+A backtest over a fixed range and universe can load every daily bar once and
+answer per-interval OHLC lookups as array slices instead of per-day queries
+and per-instrument dicts. The cube is persisted as plain ``.npy`` files in a
+cache directory and reopened with ``mmap_mode='r'``, so repeated runs share the
+OS page cache and only the dates actually touched are paged in.
+"""
+
+import hashlib
+from datetime import date
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+
+CUBE_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class PriceCube:
+    """
+    Dense float64 array of shape (dates, instruments, fields); missing bars are NaN.
+    """
+
+    def __init__(self, dates: np.ndarray, instrument_ids: np.ndarray, values: np.ndarray,
+                 fields: Sequence[str] = CUBE_FIELDS):
+        self.dates = np.asarray(dates, dtype='datetime64[D]')
+        self.instrument_ids = np.asarray(instrument_ids, dtype=np.int64)
+        self.values = values
+        self.fields = tuple(fields)
+        self._id_order = np.argsort(self.instrument_ids, kind='stable')
+        self._sorted_ids = self.instrument_ids[self._id_order]
+
+    @classmethod
+    def from_panel(cls, panel: Dict[str, np.ndarray], instrument_ids: Sequence[int],
+                   fields: Sequence[str] = CUBE_FIELDS) -> 'PriceCube':
+        """
+        Build a cube from long-format columns (``date``, ``instrument_id`` and
+        one array per field), e.g. ``DailyPricesDAO.get_price_panel``.
+        Instrument order follows ``instrument_ids``; rows for other ids are ignored.
+        """
+        ids = np.asarray(instrument_ids, dtype=np.int64)
+        row_dates = np.asarray(panel['date'], dtype='datetime64[D]')
+        dates = np.unique(row_dates)
+        values = np.full((len(dates), len(ids), len(fields)), np.nan)
+        if len(row_dates) and len(ids):
+            order = np.argsort(ids, kind='stable')
+            sorted_ids = ids[order]
+            row_ids = np.asarray(panel['instrument_id'], dtype=np.int64)
+            pos = np.minimum(np.searchsorted(sorted_ids, row_ids), len(ids) - 1)
+            known = sorted_ids[pos] == row_ids
+            d_idx = np.searchsorted(dates, row_dates[known])
+            i_idx = order[pos[known]]
+            for f_idx, field in enumerate(fields):
+                values[d_idx, i_idx, f_idx] = np.asarray(panel[field], dtype=np.float64)[known]
+        return cls(dates, ids, values, fields)
+
+    @staticmethod
+    def cache_key(table_name: str, start_date: date, end_date: date, instrument_ids: Sequence[int]) -> str:
+        """Stable cache directory name for a table, range and instrument list."""
+        digest = hashlib.sha1(np.asarray(instrument_ids, dtype=np.int64).tobytes()).hexdigest()[:16]
+        return f"{table_name}_{start_date:%Y%m%d}_{end_date:%Y%m%d}_{digest}"
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Write the cube as ``.npy`` files under ``path``."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / 'dates.npy', self.dates)
+        np.save(path / 'instrument_ids.npy', self.instrument_ids)
+        np.save(path / 'fields.npy', np.asarray(self.fields))
+        # values last: its presence marks a complete cache entry
+        np.save(path / 'values.tmp.npy', np.ascontiguousarray(self.values))
+        (path / 'values.tmp.npy').replace(path / 'values.npy')
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap_mode: Optional[str] = 'r') -> Optional['PriceCube']:
+        """Open a saved cube (memory-mapped by default); None if no complete cube is at ``path``."""
+        path = Path(path)
+        if not (path / 'values.npy').exists():
+            return None
+        return cls(
+            np.load(path / 'dates.npy'),
+            np.load(path / 'instrument_ids.npy'),
+            np.load(path / 'values.npy', mmap_mode=mmap_mode),
+            [str(f) for f in np.load(path / 'fields.npy')],
+        )
+
+    def date_index(self, as_of: date) -> Optional[int]:
+        """Row of ``as_of`` in the cube, or None if the date has no bars."""
+        d = np.datetime64(as_of, 'D')
+        idx = int(np.searchsorted(self.dates, d))
+        if idx < len(self.dates) and self.dates[idx] == d:
+            return idx
+        return None
+
+    def covers(self, as_of: date) -> bool:
+        """True if ``as_of`` falls within the cube's date range."""
+        return len(self.dates) > 0 and self.dates[0] <= np.datetime64(as_of, 'D') <= self.dates[-1]
+
+    def instrument_index(self, instrument_ids: Sequence[int]) -> np.ndarray:
+        """Column of each id in the cube, -1 for ids the cube does not hold."""
+        ids = np.asarray(instrument_ids, dtype=np.int64)
+        if not len(self._sorted_ids):
+            return np.full(len(ids), -1, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(self._sorted_ids, ids), len(self._sorted_ids) - 1)
+        return np.where(self._sorted_ids[pos] == ids, self._id_order[pos], -1)
+
+    def slice(self, as_of: date, instrument_ids: Sequence[int]) -> Dict[str, np.ndarray]:
+        """
+        Field arrays aligned with ``instrument_ids`` for one date; NaN where
+        the date or instrument has no bar.
+        """
+        n = len(instrument_ids)
+        d_idx = self.date_index(as_of)
+        if d_idx is None or not len(self.instrument_ids):
+            return {f: np.full(n, np.nan) for f in self.fields}
+        i_idx = self.instrument_index(instrument_ids)
+        row = np.asarray(self.values[d_idx])
+        block = np.where((i_idx >= 0)[:, None], row[np.maximum(i_idx, 0)], np.nan)
+        return {f: block[:, k] for k, f in enumerate(self.fields)}
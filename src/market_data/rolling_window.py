@@ -0,0 +1,183 @@
+"""
+Time-based rolling windows with O(1) amortized high / low / VWAP.
+
+High and low are kept in monotonic deques (each entry is pushed and popped at
+most once) and VWAP from running sums of price*volume and volume that are
+adjusted on append and eviction, so per-tick cost does not depend on how many
+samples the window holds.
+
+RollingWindow keeps every raw tick and is exact. BarWindow folds ticks into
+fixed-resolution bars so memory is bounded by window / resolution regardless of
+tick rate; its oldest edge is quantized to the bar resolution.
+"""
+
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Optional, Sequence
+
+# Candidate bar resolutions for BarWindow, finest first
+BAR_RESOLUTIONS = (
+    timedelta(minutes=1), timedelta(minutes=5), timedelta(minutes=15), timedelta(minutes=30),
+    timedelta(hours=1), timedelta(hours=4), timedelta(days=1),
+)
+
+
+def choose_resolution(window: timedelta, max_bars: int, resolutions: Sequence[timedelta] = BAR_RESOLUTIONS) -> timedelta:
+    """Finest resolution that keeps ``window`` within ``max_bars`` bars (coarsest if none does)."""
+    for resolution in resolutions:
+        if window / resolution <= max_bars:
+            return resolution
+    return resolutions[-1]
+
+
+class RollingWindow:
+    __slots__ = ('_samples', '_maxq', '_minq', '_pv', '_vol')
+
+    def __init__(self):
+        self._samples = deque()  # (time, price, volume)
+        self._maxq = deque()     # (time, price), prices strictly decreasing
+        self._minq = deque()     # (time, price), prices strictly increasing
+        self._pv = 0.0
+        self._vol = 0.0
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def evict_before(self, cutoff: datetime) -> None:
+        """Drop samples with time < cutoff."""
+        samples = self._samples
+        while samples and samples[0][0] < cutoff:
+            _, price, volume = samples.popleft()
+            self._pv -= price * volume
+            self._vol -= volume
+        if not samples:
+            # Reset to exact zero so float drift cannot accumulate across windows
+            self._pv = 0.0
+            self._vol = 0.0
+        maxq, minq = self._maxq, self._minq
+        while maxq and maxq[0][0] < cutoff:
+            maxq.popleft()
+        while minq and minq[0][0] < cutoff:
+            minq.popleft()
+
+    def append(self, time: datetime, price: float, volume: float) -> None:
+        self._samples.append((time, price, volume))
+        self._pv += price * volume
+        self._vol += volume
+        maxq, minq = self._maxq, self._minq
+        while maxq and maxq[-1][1] <= price:
+            maxq.pop()
+        maxq.append((time, price))
+        while minq and minq[-1][1] >= price:
+            minq.pop()
+        minq.append((time, price))
+
+    @property
+    def high(self) -> Optional[float]:
+        return self._maxq[0][1] if self._maxq else None
+
+    @property
+    def low(self) -> Optional[float]:
+        return self._minq[0][1] if self._minq else None
+
+    @property
+    def close(self) -> Optional[float]:
+        return self._samples[-1][1] if self._samples else None
+
+    @property
+    def vwap(self) -> Optional[float]:
+        return self._pv / self._vol if self._vol > 0 else None
+
+
+class BarWindow:
+    """
+    Rolling window over fixed-resolution OHLCV bars.
+
+    Ticks are folded into the bar containing their timestamp (bars are aligned
+    to midnight); a bar is evicted once it ends at or before the cutoff, so
+    the window may include up to one resolution of extra history. The most
+    recent bar is always tick-accurate, so close is exact.
+    """
+    __slots__ = ('resolution', '_bars', '_maxq', '_minq', '_pv', '_vol')
+
+    def __init__(self, resolution: timedelta):
+        if resolution <= timedelta(0) or timedelta(days=1) % resolution:
+            raise ValueError(f"Bar resolution must divide one day: {resolution}")
+        self.resolution = resolution
+        self._bars = deque()  # [start, high, low, close, pv, volume]
+        self._maxq = deque()  # (start, high), highs strictly decreasing
+        self._minq = deque()  # (start, low), lows strictly increasing
+        self._pv = 0.0
+        self._vol = 0.0
+
+    def __len__(self) -> int:
+        return len(self._bars)
+
+    def _bar_start(self, time: datetime) -> datetime:
+        day = time.replace(hour=0, minute=0, second=0, microsecond=0)
+        return day + ((time - day) // self.resolution) * self.resolution
+
+    def evict_before(self, cutoff: datetime) -> None:
+        """Drop bars that end at or before cutoff."""
+        edge = cutoff - self.resolution
+        bars = self._bars
+        while bars and bars[0][0] <= edge:
+            bar = bars.popleft()
+            self._pv -= bar[4]
+            self._vol -= bar[5]
+        if not bars:
+            self._pv = 0.0
+            self._vol = 0.0
+        maxq, minq = self._maxq, self._minq
+        while maxq and maxq[0][0] <= edge:
+            maxq.popleft()
+        while minq and minq[0][0] <= edge:
+            minq.popleft()
+
+    def append(self, time: datetime, price: float, volume: float) -> None:
+        bars = self._bars
+        start = self._bar_start(time)
+        if bars and start <= bars[-1][0]:
+            # Same bar (or a late tick, folded into the latest bar)
+            bar = bars[-1]
+            start = bar[0]
+            bar[3] = price
+            bar[4] += price * volume
+            bar[5] += volume
+            if price > bar[1]:
+                bar[1] = price
+            if price < bar[2]:
+                bar[2] = price
+            high, low = bar[1], bar[2]
+        else:
+            bars.append([start, price, price, price, price * volume, volume])
+            high = low = price
+        self._pv += price * volume
+        self._vol += volume
+        maxq, minq = self._maxq, self._minq
+        # The latest bar's high only rises and its low only falls, so it can
+        # replace its own earlier entry at the back of each deque.
+        while maxq and maxq[-1][1] <= high:
+            maxq.pop()
+        if not maxq or maxq[-1][0] != start:
+            maxq.append((start, high))
+        while minq and minq[-1][1] >= low:
+            minq.pop()
+        if not minq or minq[-1][0] != start:
+            minq.append((start, low))
+
+    @property
+    def high(self) -> Optional[float]:
+        return self._maxq[0][1] if self._maxq else None
+
+    @property
+    def low(self) -> Optional[float]:
+        return self._minq[0][1] if self._minq else None
+
+    @property
+    def close(self) -> Optional[float]:
+        return self._bars[-1][3] if self._bars else None
+
+    @property
+    def vwap(self) -> Optional[float]:
+        return self._pv / self._vol if self._vol > 0 else None
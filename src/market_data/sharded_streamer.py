@@ -0,0 +1,190 @@
+"""
+ShardedMarketDataStreamer - MarketDataStreamer state spread over worker processes.
+
+Symbols are hash-partitioned (crc32, stable across processes) over N worker
+processes, each owning a MarketDataStreamer for its shard. The parent batches
+raw tick fields per shard and ships them over a multiprocessing queue (its
+feeder thread never blocks the event loop); each worker runs
+``process_tick`` and sends the resulting tick dicts back over a pipe that the
+parent's event loop watches with ``add_reader``. All shards feed one TickQueue
+(unbounded unless queue_maxsize is set, as in MarketDataStreamer), so consumers
+see a single merged stream via ``stream_ticks`` / ``stream_tick_batches``. Ordering is preserved per symbol, not across symbols.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import zlib
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Sequence
+
+from market_data.market_data import MarketDataStreamer
+from market_data.tick_queue import TickQueue
+
+
+def shard_for(symbol: str, shards: int) -> int:
+    """Stable shard index of a symbol (unlike hash(), identical in every process)."""
+    return zlib.crc32(symbol.encode()) % shards
+
+
+def _shard_worker(symbols: List[str], streamer_kwargs: Dict[str, Any], inbox, outbox) -> None:
+    streamer = MarketDataStreamer(None, symbols, **streamer_kwargs)
+    process_tick = streamer.process_tick
+    while True:
+        batch = inbox.get()
+        if batch is None:
+            outbox.send(None)
+            outbox.close()
+            return
+        outbox.send([process_tick(*fields) for fields in batch])
+
+
+class ShardedMarketDataStreamer:
+    def __init__(self, symbols: Sequence[str], workers: Optional[int] = None, batch_size: int = 256,
+                 flush_ms: float = 2.0, queue_maxsize: int = 0, overflow: str = 'drop_oldest',
+                 streamer_kwargs: Optional[Dict[str, Any]] = None, mp_context=None):
+        """
+        Args:
+            symbols: Symbols to stream
+            workers: Worker processes (default: CPU count, at most one per symbol)
+            batch_size: Ticks per shard sent to a worker in one message
+            flush_ms: Partial batches are sent at least this often once started
+            queue_maxsize, overflow: Merged output queue bound, 0 for unbounded, and its
+                overflow policy (see TickQueue)
+            streamer_kwargs: Extra MarketDataStreamer arguments for each shard
+            mp_context: multiprocessing context (default: the platform default)
+        """
+        self.symbols = list(symbols)
+        self.workers = max(1, min(workers or os.cpu_count() or 1, len(self.symbols) or 1))
+        self.batch_size = batch_size
+        self.flush_ms = flush_ms
+        self.streamer_kwargs = dict(streamer_kwargs or {})
+        self._ctx = mp_context or multiprocessing.get_context()
+        self.shard_symbols: List[List[str]] = [[] for _ in range(self.workers)]
+        self._shard_of: Dict[str, int] = {}
+        for symbol in self.symbols:
+            shard = shard_for(symbol, self.workers)
+            self.shard_symbols[shard].append(symbol)
+            self._shard_of[symbol] = shard
+        self._queue = TickQueue(maxsize=queue_maxsize, overflow=overflow)
+        self._buffers: List[list] = [[] for _ in range(self.workers)]
+        self._inboxes = []
+        self._outboxes = []
+        self._processes = []
+        self._done: List[asyncio.Future] = []
+        self._flusher: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self) -> None:
+        """Start the worker processes and watch their result pipes on the running loop."""
+        self._loop = asyncio.get_running_loop()
+        for shard in range(self.workers):
+            inbox = self._ctx.Queue()
+            reader, writer = self._ctx.Pipe(duplex=False)
+            process = self._ctx.Process(
+                target=_shard_worker,
+                args=(self.shard_symbols[shard], self.streamer_kwargs, inbox, writer),
+                daemon=True,
+            )
+            process.start()
+            writer.close()
+            self._inboxes.append(inbox)
+            self._outboxes.append(reader)
+            self._processes.append(process)
+            self._done.append(self._loop.create_future())
+            self._loop.add_reader(reader.fileno(), self._on_readable, shard)
+        if self.flush_ms:
+            self._flusher = asyncio.create_task(self._flush_periodically())
+
+    def _on_readable(self, shard: int) -> None:
+        conn = self._outboxes[shard]
+        try:
+            while conn.poll():
+                results = conn.recv()
+                if results is None:
+                    self._finish(shard)
+                    return
+                put = self._queue.put_nowait
+                for tick_data in results:
+                    put(tick_data)
+        except (EOFError, OSError) as exc:
+            self._finish(shard, RuntimeError(f"Shard {shard} worker exited: {exc!r}"))
+
+    def _finish(self, shard: int, error: Optional[Exception] = None) -> None:
+        self._loop.remove_reader(self._outboxes[shard].fileno())
+        done = self._done[shard]
+        if not done.done():
+            if error is None:
+                done.set_result(None)
+            else:
+                done.set_exception(error)
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_ms / 1000.0)
+            self.flush()
+
+    def on_tick(self, tick) -> None:
+        """IB tick callback: route the tick to its symbol's shard."""
+        self.submit(*MarketDataStreamer.tick_fields(tick))
+
+    def submit(self, symbol: str, price, volume, tick_time, bid=None, ask=None) -> None:
+        """
+        Raises:
+            KeyError: If symbol is not one of the streamer's symbols
+        """
+        shard = self._shard_of[symbol]
+        buffer = self._buffers[shard]
+        buffer.append((symbol, price, volume, tick_time, bid, ask))
+        if len(buffer) >= self.batch_size:
+            self._send(shard)
+
+    def _send(self, shard: int) -> None:
+        batch = self._buffers[shard]
+        self._buffers[shard] = []
+        self._inboxes[shard].put(batch)
+
+    def flush(self) -> None:
+        """Send every partially filled shard batch to its worker."""
+        for shard, buffer in enumerate(self._buffers):
+            if buffer:
+                self._send(shard)
+
+    async def stop(self) -> None:
+        """Flush, let workers finish their queued ticks and shut them down."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        self.flush()
+        for inbox in self._inboxes:
+            inbox.put(None)
+        try:
+            await asyncio.gather(*self._done)
+        finally:
+            for shard, process in enumerate(self._processes):
+                if not self._done[shard].done():
+                    self._finish(shard)
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+                self._outboxes[shard].close()
+                self._inboxes[shard].close()
+            self._inboxes, self._outboxes, self._processes, self._done = [], [], [], []
+
+    async def stream_ticks(self, on_tick: Callable[[dict], Any] = None) -> AsyncGenerator[dict, None]:
+        """Asynchronously yields tick dicts from every shard as they arrive."""
+        while True:
+            tick_data = await self._queue.get()
+            if on_tick:
+                on_tick(tick_data)
+            yield tick_data
+
+    async def stream_tick_batches(self, max_batch: int = 512, max_wait_ms: float = 5.0) -> AsyncGenerator[List[dict], None]:
+        """Asynchronously yields lists of tick dicts (see MarketDataStreamer.stream_tick_batches)."""
+        while True:
+            yield await self._queue.get_batch(max_batch, max_wait_ms / 1000.0)
+
+    def queue_stats(self) -> dict:
+        """Merged queue counters plus ticks still buffered in the parent per shard."""
+        stats = self._queue.stats()
+        stats['buffered'] = [len(buffer) for buffer in self._buffers]
+        return stats
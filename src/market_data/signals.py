@@ -1,5 +1,16 @@
 # moved from project root
-from typing import Dict, Any
+import re
+from typing import Dict, Any, Optional, Sequence
+
+import numpy as np
+import pyarrow as pa
+
+# Flat (non-interval) tick keys, in extract_all_signals order
+TICK_SIGNAL_KEYS = (
+    'symbol', 'bid', 'ask', 'last', 'time', 'volume',
+    'hour_of_day', 'day_of_week', 'week_of_month',
+    'lse_last_open', 'lse_last_close',
+)
 
 def extract_all_signals(tick_data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -30,6 +41,113 @@ def extract_all_signals(tick_data: Dict[str, Any]) -> Dict[str, Any]:
                 signals[f'{interval}_{sig_name}'] = sig_val
     return signals
 
+_EMPTY: Dict[str, Any] = {}
+
+# Interval prefixes of multi-interval signal names: '5m', '15m', '1h', '1d', '1mo', ...
+_INTERVAL_PATTERN = re.compile(r'\d+[A-Za-z]+')
+
+
+def default_signal_type(name: str) -> pa.DataType:
+    """Arrow type of an output column, inferred from its name."""
+    if name == 'symbol':
+        return pa.string()
+    if name in ('time', 'datetime', 'lse_last_open', 'lse_last_close'):
+        return pa.timestamp('us')
+    if name in ('hour_of_day', 'day_of_week', 'week_of_month'):
+        return pa.int64()
+    return pa.float64()
+
+
+def _buffer(data_type: pa.DataType, n: int) -> np.ndarray:
+    """Preallocated NumPy buffer for n values of an Arrow column type."""
+    if pa.types.is_floating(data_type):
+        return np.zeros(n, dtype=np.float64)
+    if pa.types.is_integer(data_type):
+        return np.zeros(n, dtype=np.int64)
+    if pa.types.is_boolean(data_type):
+        return np.zeros(n, dtype=bool)
+    # Strings and timestamps stay Python objects so Arrow applies its own
+    # conversions (e.g. tz-aware datetimes to UTC)
+    return np.empty(n, dtype=object)
+
+
+class SignalExtractor:
+    """
+    Batch version of extract_all_signals compiled from an output schema.
+
+    Each schema field is resolved once to either a flat tick key or an
+    (interval, signal) pair (``'5m_true_range'`` -> ``('5m', 'true_range')``),
+    so extracting a batch fills one preallocated NumPy buffer (plus a null
+    mask) per output column and hands it to Arrow, with no per-row signal
+    dicts or f-string keys. Missing values become nulls. Fields that are
+    neither (e.g. ``'datetime'``) must be passed as ready-made columns to
+    ``extract``; callers that already hold columnar data can pass every field
+    that way and no ticks at all.
+    """
+
+    def __init__(self, schema: pa.Schema):
+        self.schema = schema
+        self._plan = []
+        for field in schema:
+            interval, _, signal = field.name.partition('_')
+            if field.name in TICK_SIGNAL_KEYS:
+                self._plan.append((field, field.name, None))
+            elif signal and _INTERVAL_PATTERN.fullmatch(interval):
+                self._plan.append((field, interval, signal))
+            else:
+                self._plan.append((field, None, None))
+
+    @classmethod
+    def from_fields(cls, fields: Sequence[str], types: Optional[Dict[str, pa.DataType]] = None) -> 'SignalExtractor':
+        """Schema from column names; types default to default_signal_type."""
+        types = types or {}
+        return cls(pa.schema([(name, types.get(name) or default_signal_type(name)) for name in fields]))
+
+    def extract(self, ticks: Sequence[Dict[str, Any]] = (), columns: Optional[Dict[str, Any]] = None) -> pa.Table:
+        """
+        Args:
+            ticks: Tick dicts (as produced by MarketDataStreamer)
+            columns: Ready-made columns (sequences or arrays) for fields not read
+                from ticks; without ticks, the batch length is taken from them
+
+        Returns:
+            Table with the extractor's schema
+
+        Raises:
+            KeyError: If a schema field can be neither read from ticks nor found in columns
+        """
+        columns = columns or {}
+        n = len(ticks) if ticks or not columns else len(next(iter(columns.values())))
+        arrays = []
+        interval_maps = None
+        by_interval: Dict[str, list] = {}
+        for field, key, signal in self._plan:
+            if field.name in columns:
+                arrays.append(pa.array(columns[field.name], type=field.type))
+                continue
+            if key is None or not ticks:
+                raise KeyError(f"No source for signal column {field.name}")
+            if signal is None:
+                sources, name = ticks, key
+            else:
+                if interval_maps is None:
+                    interval_maps = [m if isinstance(m := t.get('interval_signals'), dict) else _EMPTY for t in ticks]
+                sources = by_interval.get(key)
+                if sources is None:
+                    sources = by_interval[key] = [v if isinstance(v := m.get(key), dict) else _EMPTY for m in interval_maps]
+                name = signal
+            values = _buffer(field.type, n)
+            missing = np.zeros(n, dtype=bool)
+            for i, source in enumerate(sources):
+                value = source.get(name)
+                if value is None:
+                    missing[i] = True
+                else:
+                    values[i] = value
+            arrays.append(pa.array(values, type=field.type, mask=missing if missing.any() else None))
+        return pa.Table.from_arrays(arrays, schema=self.schema)
+
+
 # Optionally, you can add further signal processing utilities here, such as:
 # - Compute cross-interval features
 # - Add custom technical indicators using pandas_ta
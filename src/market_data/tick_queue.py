@@ -0,0 +1,192 @@
+"""
+TickQueue - bounded asyncio tick queue with overflow policies and batching.
+
+Overflow policies when the queue is full:
+    - 'block':       ``await put()`` waits for space (backpressure on async
+                     producers); ``put_nowait()`` rejects the new tick
+    - 'drop_oldest': the oldest queued tick is discarded
+    - 'conflate':    the queued tick for the same key (symbol) is replaced by
+                     the new one in place; if none is queued, the oldest is
+                     discarded
+
+``get_batch`` drains up to ``max_batch`` ticks in one await so consumers can
+process ticks in vector batches instead of paying per-item await overhead.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ('block', 'drop_oldest', 'conflate')
+
+
+class TickQueue:
+    def __init__(self, maxsize: int = 0, overflow: str = 'block',
+                 key: Callable[[Any], Hashable] = lambda item: item['symbol']):
+        """
+        Args:
+            maxsize: Maximum queued ticks, 0 for unbounded
+            overflow: One of OVERFLOW_POLICIES
+            key: Conflation key of a tick (default: its 'symbol')
+
+        Raises:
+            ValueError: If overflow is not a known policy
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.key = key
+        self._slots = deque()  # [key, item, enqueued_at]
+        self._pending: Dict[Hashable, list] = {}  # key -> its queued slot (conflate only)
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self.enqueued = 0
+        self.dequeued = 0
+        self.dropped = 0
+        self.conflated = 0
+        self.rejected = 0
+        self.max_depth = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    def qsize(self) -> int:
+        return len(self._slots)
+
+    def empty(self) -> bool:
+        return not self._slots
+
+    def full(self) -> bool:
+        return 0 < self.maxsize <= len(self._slots)
+
+    def _append(self, key, item) -> None:
+        slot = [key, item, time.monotonic()]
+        self._slots.append(slot)
+        if self.overflow == 'conflate':
+            self._pending[key] = slot
+        self.enqueued += 1
+        if len(self._slots) > self.max_depth:
+            self.max_depth = len(self._slots)
+        self._not_empty.set()
+        if self.full():
+            self._not_full.clear()
+
+    def _pop(self) -> Any:
+        slot = self._slots.popleft()
+        if self._pending.get(slot[0]) is slot:
+            del self._pending[slot[0]]
+        if not self._slots:
+            self._not_empty.clear()
+        self._not_full.set()
+        return slot
+
+    def put_nowait(self, item) -> bool:
+        """
+        Enqueue without waiting, applying the overflow policy if full.
+
+        Returns:
+            False if the tick was rejected ('block' policy on a full queue)
+        """
+        key = self.key(item) if self.overflow == 'conflate' else None
+        if self.full():
+            if self.overflow == 'block':
+                if not self.rejected:
+                    logger.warning(f"TickQueue full (maxsize={self.maxsize}): rejecting ticks under 'block'")
+                self.rejected += 1
+                return False
+            if self.overflow == 'conflate':
+                slot = self._pending.get(key)
+                if slot is not None:
+                    # Replace in place: the symbol keeps its queue position
+                    slot[1] = item
+                    self.conflated += 1
+                    return True
+            self._pop()
+            if not self.dropped:
+                logger.warning(f"TickQueue full (maxsize={self.maxsize}): dropping oldest ticks under '{self.overflow}'")
+            self.dropped += 1
+        self._append(key, item)
+        return True
+
+    async def put(self, item) -> None:
+        """Enqueue, waiting for space under the 'block' policy."""
+        if self.overflow == 'block':
+            while self.full():
+                await self._not_full.wait()
+        self.put_nowait(item)
+
+    def _record_lag(self, enqueued_at: float) -> None:
+        lag = time.monotonic() - enqueued_at
+        self.last_lag = lag
+        if lag > self.max_lag:
+            self.max_lag = lag
+
+    def get_nowait(self) -> Any:
+        """
+        Raises:
+            asyncio.QueueEmpty: If no tick is queued
+        """
+        if not self._slots:
+            raise asyncio.QueueEmpty
+        slot = self._pop()
+        self.dequeued += 1
+        self._record_lag(slot[2])
+        return slot[1]
+
+    async def get(self) -> Any:
+        while not self._slots:
+            await self._not_empty.wait()
+        return self.get_nowait()
+
+    def get_batch_nowait(self, max_batch: int) -> List[Any]:
+        """Up to max_batch queued ticks, oldest first (possibly empty)."""
+        n = min(max_batch, len(self._slots))
+        if not n:
+            return []
+        batch = [self._pop() for _ in range(n)]
+        self.dequeued += n
+        self._record_lag(batch[0][2])
+        return [slot[1] for slot in batch]
+
+    async def get_batch(self, max_batch: int, max_wait: Optional[float] = None) -> List[Any]:
+        """
+        Wait for at least one tick, then keep collecting until max_batch ticks
+        are queued or max_wait seconds have passed since the first arrived.
+        """
+        while not self._slots:
+            await self._not_empty.wait()
+        if max_wait and len(self._slots) < max_batch:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + max_wait
+            while len(self._slots) < max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                self._not_empty.clear()
+                try:
+                    await asyncio.wait_for(self._not_empty.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            self._not_empty.set()
+        return self.get_batch_nowait(max_batch)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue counters: depth, totals, drops and consumer lag (seconds)."""
+        return {
+            'depth': len(self._slots),
+            'max_depth': self.max_depth,
+            'maxsize': self.maxsize,
+            'overflow': self.overflow,
+            'enqueued': self.enqueued,
+            'dequeued': self.dequeued,
+            'dropped': self.dropped,
+            'conflated': self.conflated,
+            'rejected': self.rejected,
+            'last_lag': self.last_lag,
+            'max_lag': self.max_lag,
+        }
@@ -0,0 +1,219 @@
+"""
+Tick recording to Arrow IPC and deterministic replay.
+
+TickRecorder appends tick fields (as produced by MarketDataStreamer.tick_fields)
+to column buffers and writes them as Arrow record batches every ``flush_rows``
+ticks, rotating to a new file every ``rotate_rows`` ticks. Files use the Arrow
+IPC *stream* format (``.arrows``): there is no footer, so a file cut short by a
+crash is still readable up to its last complete batch.
+
+TickReplay reads recorded files back in order and feeds ticks to an
+``on_tick(tick)`` callback (e.g. MarketDataStreamer.on_tick) in real time,
+at N x speed, or as fast as possible.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Sequence, Union
+
+import pyarrow as pa
+
+from market_data.market_data import MarketDataStreamer
+
+TICK_SCHEMA = pa.schema([
+    ('symbol', pa.string()),
+    ('time', pa.timestamp('us')),
+    ('last', pa.float64()),
+    ('size', pa.float64()),
+    ('bid', pa.float64()),
+    ('ask', pa.float64()),
+])
+
+
+class TickRecorder:
+    def __init__(self, directory: Union[str, Path], prefix: str = 'ticks',
+                 flush_rows: int = 4096, rotate_rows: int = 1_000_000):
+        """
+        Args:
+            directory: Output directory (created if missing)
+            prefix: File name prefix; files are ``<prefix>_<YYYYmmddTHHMMSS>_<seq>.arrows``
+            flush_rows: Ticks buffered before a record batch is written
+            rotate_rows: Ticks per file before rotating to a new one
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.flush_rows = flush_rows
+        self.rotate_rows = rotate_rows
+        self.files: List[Path] = []
+        self.rows_written = 0
+        self._columns = {name: [] for name in TICK_SCHEMA.names}
+        self._writer: Optional[pa.ipc.RecordBatchStreamWriter] = None
+        self._sink = None
+        self._file_rows = 0
+
+    def on_tick(self, tick) -> None:
+        """IB tick callback."""
+        self.record(*MarketDataStreamer.tick_fields(tick))
+
+    def record(self, symbol: str, price, volume, tick_time, bid=None, ask=None) -> None:
+        """Buffer one tick; timezone-aware times are stored as naive UTC."""
+        if isinstance(tick_time, datetime) and tick_time.tzinfo is not None:
+            tick_time = tick_time.astimezone(timezone.utc).replace(tzinfo=None)
+        columns = self._columns
+        columns['symbol'].append(symbol)
+        columns['time'].append(tick_time)
+        columns['last'].append(price)
+        columns['size'].append(volume)
+        columns['bid'].append(bid)
+        columns['ask'].append(ask)
+        if len(columns['symbol']) >= self.flush_rows:
+            self.flush()
+
+    def _open(self) -> None:
+        stamp = datetime.now().strftime('%Y%m%dT%H%M%S')
+        path = self.directory / f"{self.prefix}_{stamp}_{len(self.files):04d}.arrows"
+        self._sink = pa.OSFile(str(path), 'wb')
+        self._writer = pa.ipc.new_stream(self._sink, TICK_SCHEMA)
+        self._file_rows = 0
+        self.files.append(path)
+
+    def _close_file(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._sink.close()
+            self._writer = self._sink = None
+
+    def flush(self) -> None:
+        """Write buffered ticks, rotating files at rotate_rows."""
+        n = len(self._columns['symbol'])
+        start = 0
+        while start < n:
+            if self._writer is None or self._file_rows >= self.rotate_rows:
+                self._close_file()
+                self._open()
+            stop = min(n, start + self.rotate_rows - self._file_rows)
+            batch = pa.record_batch(
+                [pa.array(self._columns[f.name][start:stop], type=f.type) for f in TICK_SCHEMA],
+                schema=TICK_SCHEMA,
+            )
+            self._writer.write_batch(batch)
+            self._file_rows += stop - start
+            self.rows_written += stop - start
+            start = stop
+        for values in self._columns.values():
+            values.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self._close_file()
+
+    def __enter__(self) -> 'TickRecorder':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class _Contract:
+    __slots__ = ('symbol',)
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+
+
+class ReplayTick:
+    """Minimal stand-in for an ib_insync Ticker, as read by MarketDataStreamer.tick_fields."""
+    __slots__ = ('contract', 'time', 'last', 'lastSize', 'bid', 'ask')
+
+    def __init__(self, contract, time, last, lastSize, bid, ask):
+        self.contract = contract
+        self.time = time
+        self.last = last
+        self.lastSize = lastSize
+        self.bid = bid
+        self.ask = ask
+
+
+def _read_batches(path: Path) -> Iterator[pa.RecordBatch]:
+    with pa.OSFile(str(path), 'rb') as source:
+        reader = pa.ipc.open_stream(source)
+        while True:
+            try:
+                yield reader.read_next_batch()
+            except StopIteration:
+                return
+            except (pa.ArrowInvalid, OSError):
+                # Truncated tail of a file whose writer did not close cleanly
+                return
+
+
+class TickReplay:
+    def __init__(self, source: Union[str, Path, Sequence[Union[str, Path]]], prefix: str = 'ticks'):
+        """
+        Args:
+            source: A recorder directory (files replayed in name order) or explicit file paths
+            prefix: File name prefix when source is a directory
+        """
+        if isinstance(source, (str, Path)) and Path(source).is_dir():
+            self.files = sorted(Path(source).glob(f"{prefix}_*.arrows"))
+        elif isinstance(source, (str, Path)):
+            self.files = [Path(source)]
+        else:
+            self.files = [Path(p) for p in source]
+
+    def iter_batches(self) -> Iterator[List[ReplayTick]]:
+        """Recorded ticks, one list per record batch."""
+        contracts = {}
+        for path in self.files:
+            for batch in _read_batches(path):
+                columns = [batch.column(name).to_pylist() for name in TICK_SCHEMA.names]
+                ticks = []
+                for symbol, t, last, size, bid, ask in zip(*columns):
+                    contract = contracts.get(symbol)
+                    if contract is None:
+                        contract = contracts[symbol] = _Contract(symbol)
+                    ticks.append(ReplayTick(contract, t, last, size, bid, ask))
+                yield ticks
+
+    def __iter__(self) -> Iterator[ReplayTick]:
+        for ticks in self.iter_batches():
+            yield from ticks
+
+    async def replay(self, on_tick: Callable[[ReplayTick], None], speed: Optional[float] = None) -> int:
+        """
+        Feed recorded ticks to on_tick.
+
+        Args:
+            on_tick: Tick callback, e.g. MarketDataStreamer.on_tick
+            speed: 1.0 for real time, N for N x speed, None or 0 for as fast as
+                possible (the loop is still yielded to once per record batch)
+
+        Returns:
+            Number of ticks replayed
+        """
+        loop = asyncio.get_running_loop()
+        count = 0
+        first_time = wall_start = None
+        for ticks in self.iter_batches():
+            for tick in ticks:
+                if speed:
+                    if first_time is None:
+                        first_time, wall_start = tick.time, loop.time()
+                    due = wall_start + (tick.time - first_time).total_seconds() / speed
+                    delay = due - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                on_tick(tick)
+                count += 1
+            await asyncio.sleep(0)
+        return count
+
+    def replay_sync(self, on_tick: Callable[[ReplayTick], None]) -> float:
+        """Feed every tick to on_tick as fast as possible; returns elapsed seconds."""
+        t0 = time.perf_counter()
+        for tick in self:
+            on_tick(tick)
+        return time.perf_counter() - t0
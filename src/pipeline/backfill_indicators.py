@@ -0,0 +1,326 @@
+"""
+Historical indicator backfill.
+
+Reads the daily price panel of a universe once (DailyPricesDAO.get_price_panel),
+rolls it up into every target duration, evaluates the configured indicators
+with IndicatorPlan - one vectorized update over the whole universe per bar -
+and writes one Parquet file per (duration, bar):
+
+    <out_dir>/duration=<1d|1w|...>/date=<bar start, YYYY-MM-DD>/part-0.parquet
+
+Each file holds ``instrument_id`` and one float64 column per indicator (null
+where the indicator is invalid) for the instruments with a bar on that date;
+``duration`` and ``date`` come from the hive-style directory names. Files are
+written under a temporary name and renamed, so a partition that exists is
+complete and a re-run only computes the missing ones.
+
+Bars of a duration are split into chunks that run in a process pool; each
+chunk replays the bars its indicators look back over before writing. A random
+sample of instruments per chunk is also fed through the list-based
+``Indicator.update`` classes and compared with the vectorized values.
+
+Usage:
+    python src/pipeline/backfill_indicators.py --start_date 2020-01-01 --end_date 2024-12-31 \\
+        --universe_id 1 --out_dir indicator_backfill --workers 8
+"""
+
+import argparse
+import asyncio
+import logging
+import math
+import os
+import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from dateutil.relativedelta import relativedelta
+
+from calendars.time_duration import DurationType, TimeDuration
+from config.environment import Environment, EnvironmentType, get_environment
+from db.pool_registry import enable_shared_pool, close_pool
+from market_data.price_cube import PriceCube
+from signals.indicator_config import IndicatorConfig
+from state.bar_rollup import BarRollup
+from state.instrument_interval import InstrumentInterval
+
+logger = logging.getLogger(__name__)
+
+PARTITION_FILE = 'part-0.parquet'
+DEFAULT_CHUNK_BARS = 256
+DEFAULT_SAMPLE_SIZE = 8
+
+
+def partition_path(out_dir: Union[str, Path], duration: str, day: date) -> Path:
+    return Path(out_dir) / f"duration={duration}" / f"date={day:%Y-%m-%d}" / PARTITION_FILE
+
+
+def warmup_start(duration: TimeDuration, start: date, bars: int) -> date:
+    """
+    First date to read so that ``bars`` complete bars of ``duration`` precede
+    the bar containing ``start`` (daily bars allow for weekends and holidays).
+    """
+    rollup = BarRollup(TimeDuration.create_daily(), (duration,))
+    bucket = rollup.bucket_bounds(duration, datetime.combine(start, time()))[0]
+    kind = duration.duration_type
+    if kind == DurationType.DAILY:
+        back = timedelta(days=math.ceil(bars * 7 / 5) + 10)
+    elif kind == DurationType.WEEKLY:
+        back = timedelta(weeks=bars)
+    elif kind == DurationType.MONTHLY:
+        back = relativedelta(months=bars)
+    elif kind == DurationType.QUARTERLY:
+        back = relativedelta(months=3 * bars)
+    elif kind == DurationType.YEARLY:
+        back = relativedelta(years=bars)
+    else:
+        raise ValueError(f"Unsupported duration type: {kind}")
+    return (bucket - back).date()
+
+
+def aggregate_cube(cube: PriceCube, duration: TimeDuration) -> Tuple[PriceCube, np.ndarray]:
+    """
+    Roll a daily cube up into ``duration`` bars, following BarRollup: open is
+    the first bar with a close, close the last, high / low the extremes and
+    volume the sum of those bars.
+
+    Returns:
+        (cube of bars keyed by bucket start, bucket ends as datetime64[D])
+    """
+    rollup = BarRollup(TimeDuration.create_daily(), (duration,))
+    bounds = [rollup.bucket_bounds(duration, datetime.combine(d, time())) for d in cube.dates.astype(object)]
+    starts = np.array([s.date() for s, _ in bounds], dtype='datetime64[D]')
+    ends = np.array([e.date() for _, e in bounds], dtype='datetime64[D]')
+    if duration.duration_type == DurationType.DAILY:
+        return cube, ends
+    k = {f: cube.fields.index(f) for f in ('open', 'high', 'low', 'close', 'volume')}
+    first_rows = np.flatnonzero(np.r_[True, starts[1:] != starts[:-1]]) if len(starts) else np.empty(0, dtype=np.int64)
+    stops = np.r_[first_rows[1:], len(starts)]
+    n = len(cube.instrument_ids)
+    columns = np.arange(n)
+    values = np.full((len(first_rows), n, len(cube.fields)), np.nan)
+    for g, (lo, hi) in enumerate(zip(first_rows, stops)):
+        block = np.asarray(cube.values[lo:hi])
+        has = ~np.isnan(block[:, :, k['close']])
+        present = has.any(axis=0)
+        first = has.argmax(axis=0)
+        last = hi - lo - 1 - has[::-1].argmax(axis=0)
+        bar = values[g]
+        bar[:, k['open']] = block[first, columns, k['open']]
+        bar[:, k['close']] = block[last, columns, k['close']]
+        bar[:, k['high']] = np.fmax.reduce(np.where(has, block[:, :, k['high']], np.nan), axis=0)
+        bar[:, k['low']] = np.fmin.reduce(np.where(has, block[:, :, k['low']], np.nan), axis=0)
+        bar[:, k['volume']] = np.where(has, np.nan_to_num(block[:, :, k['volume']]), 0.0).sum(axis=0)
+        bar[~present] = np.nan
+    return PriceCube(starts[first_rows], cube.instrument_ids, values, cube.fields), ends[first_rows]
+
+
+def _chunks(indices: Sequence[int], chunk_bars: int) -> List[Tuple[int, int]]:
+    """Contiguous [lo, hi) runs of ``indices`` of at most ``chunk_bars``."""
+    runs = []
+    for i in indices:
+        if runs and runs[-1][1] == i and runs[-1][1] - runs[-1][0] < chunk_bars:
+            runs[-1][1] = i + 1
+        else:
+            runs.append([i, i + 1])
+    return [tuple(run) for run in runs]
+
+
+def _write_partition(path: Path, instrument_ids: np.ndarray, names: Sequence[str],
+                     results: Dict[str, Tuple[np.ndarray, np.ndarray]], rows: np.ndarray) -> None:
+    columns = {'instrument_id': pa.array(instrument_ids[rows])}
+    for name in names:
+        values, valid = results[name]
+        columns[name] = pa.array(values[rows], mask=~valid[rows], type=pa.float64())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Dot-prefixed so dataset readers ignore a file left behind by a crash
+    tmp = path.parent / f".{path.name}.tmp"
+    pq.write_table(pa.table(columns), tmp)
+    os.replace(tmp, path)
+
+
+def _backfill_chunk(job) -> Dict[str, int]:
+    """
+    Process-pool entry point: evaluate bars ``run_lo..hi`` of one duration's
+    cube and write the partitions of bars ``emit_lo..hi`` that do not exist yet.
+    """
+    cube_dir, duration, run_lo, emit_lo, hi, out_dir, config, sample_size, seed = job
+    cube = PriceCube.load(cube_dir)
+    plan = config.build_plan()
+    state = plan.new_state()
+    ids = cube.instrument_ids
+    rng = np.random.default_rng([seed, emit_lo])
+    sample = rng.choice(len(ids), size=min(sample_size, len(ids)), replace=False) if sample_size else ()
+    # Cross-check: per sampled instrument, its interval history and list-based indicators
+    checks = {int(col): ([], config.create_indicator_instances()) for col in sample}
+    stats = {'written': 0, 'skipped': 0, 'checked': 0, 'mismatches': 0}
+    for row in range(run_lo, hi):
+        bar = np.asarray(cube.values[row])
+        columns = {f: bar[:, k] for k, f in enumerate(cube.fields)}
+        ok = ~np.isnan(columns['close'])
+        results = plan.update(state, columns, ok)
+        day = cube.dates[row].astype(object)
+        for col, (history, indicators) in checks.items():
+            start = datetime.combine(day, time())
+            history.append(InstrumentInterval(
+                instrument_id=int(ids[col]), start_date_time=start, end_date_time=start,
+                open=float(columns['open'][col]), high=float(columns['high'][col]),
+                low=float(columns['low'][col]), close=float(columns['close'][col]),
+                traded_volume=float(columns['volume'][col]), traded_dollar=float('nan'),
+                status='ok' if ok[col] else 'missing'))
+            if row < emit_lo:
+                continue
+            for name, indicator in indicators.items():
+                indicator.update(history)
+                values, valid = results[name]
+                expected = indicator.get_value()
+                stats['checked'] += 1
+                if (indicator.status == 'ok') != bool(valid[col]) or (
+                        expected is not None and not math.isclose(expected, values[col], rel_tol=1e-9, abs_tol=1e-12)):
+                    stats['mismatches'] += 1
+                    if stats['mismatches'] == 1:
+                        logger.warning("Backfill mismatch %s %s %s %s: vectorized %s, Indicator.update %s",
+                                       duration, day, ids[col], name, values[col], expected)
+        if row < emit_lo:
+            continue
+        path = partition_path(out_dir, duration, day)
+        if path.exists():
+            stats['skipped'] += 1
+            continue
+        _write_partition(path, ids, plan.outputs, results, np.flatnonzero(ok))
+        stats['written'] += 1
+    return stats
+
+
+async def backfill_cube(cube: PriceCube, start: date, end: date, out_dir: Union[str, Path],
+                        durations: Sequence[TimeDuration], indicator_config: IndicatorConfig,
+                        workers: Optional[int] = None, chunk_bars: int = DEFAULT_CHUNK_BARS,
+                        sample_size: int = DEFAULT_SAMPLE_SIZE, seed: int = 0,
+                        executor: Optional[Executor] = None) -> Dict[str, Dict[str, int]]:
+    """
+    Backfill indicators for the bars overlapping ``start..end`` from a daily
+    cube that already includes the warm-up history (see warmup_start). Bars
+    whose bucket has weekdays after ``end`` are incomplete and not written.
+
+    Args:
+        workers: Processes for a new ProcessPoolExecutor (default CPU count)
+        chunk_bars: Bars written per job
+        sample_size: Instruments per job cross-checked against Indicator.update (0 disables)
+        executor: Executor to use instead of a new ProcessPoolExecutor
+
+    Returns:
+        {duration: {'written', 'skipped', 'checked', 'mismatches'}}
+    """
+    warmup = max(indicator_config.build_plan().required_bars() - 1, 0)
+    first, last = np.datetime64(start, 'D'), np.datetime64(end, 'D')
+    stats: Dict[str, Dict[str, int]] = {}
+    jobs = []
+    with tempfile.TemporaryDirectory(prefix='backfill_cubes_') as tmp:
+        for duration in durations:
+            name = duration.get_duration_string()
+            if duration.is_intraday():
+                logger.warning("Skipping intraday duration %s: backfill reads daily bars", name)
+                continue
+            bars, ends = aggregate_cube(cube, duration)
+            cube_dir = bars.save(Path(tmp) / name)
+            # A bucket is complete once ``end`` reaches its last weekday
+            emit = np.flatnonzero((ends > first) & (np.busday_offset(ends - 1, 0, roll='backward') <= last))
+            todo = [int(i) for i in emit if not partition_path(out_dir, name, bars.dates[i].astype(object)).exists()]
+            stats[name] = {'written': 0, 'skipped': len(emit) - len(todo), 'checked': 0, 'mismatches': 0}
+            jobs.extend(
+                (str(cube_dir), name, max(lo - warmup, 0), lo, hi, str(out_dir), indicator_config, sample_size, seed)
+                for lo, hi in _chunks(todo, chunk_bars)
+            )
+        loop = asyncio.get_running_loop()
+        own_executor = executor is None
+        executor = executor or ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+        try:
+            results = await asyncio.gather(*(loop.run_in_executor(executor, _backfill_chunk, job) for job in jobs))
+        finally:
+            if own_executor:
+                executor.shutdown()
+    for job, result in zip(jobs, results):
+        for key, count in result.items():
+            stats[job[1]][key] += count
+    for name, counts in stats.items():
+        logger.info("Backfill %s: %s", name, counts)
+        if counts['mismatches']:
+            logger.error("Backfill %s: %d of %d cross-checked values differ from Indicator.update",
+                         name, counts['mismatches'], counts['checked'])
+    return stats
+
+
+async def backfill_indicators(env: Environment, start: date, end: date, out_dir: Union[str, Path],
+                              universe_id: Optional[int] = None, instrument_ids: Optional[Sequence[int]] = None,
+                              durations: Optional[Sequence[TimeDuration]] = None,
+                              indicator_config: Optional[IndicatorConfig] = None,
+                              **kwargs) -> Dict[str, Dict[str, int]]:
+    """
+    Read the price panel of ``instrument_ids`` (or every instrument ever in
+    ``universe_id``) with warm-up history and run backfill_cube.
+
+    Durations default to env.get_target_durations() and the indicators to
+    env.indicator_config; remaining keyword arguments go to backfill_cube.
+
+    Raises:
+        ValueError: If neither instrument_ids nor universe_id is given
+    """
+    from dao.universe_membership_dao import UniverseMembershipDAO
+    from market_data.eod.daily_prices_dao import DailyPricesDAO
+
+    durations = list(durations if durations is not None else env.get_target_durations())
+    config = indicator_config if indicator_config is not None else env.indicator_config
+    required = config.build_plan().required_bars()
+    read_start = min((warmup_start(d, start, required) for d in durations if not d.is_intraday()), default=start)
+    enable_shared_pool(env)
+    try:
+        if instrument_ids is None:
+            if universe_id is None:
+                raise ValueError("Backfill needs instrument_ids or universe_id")
+            memberships = await UniverseMembershipDAO(env).get_memberships_by_universe(universe_id)
+            instrument_ids = sorted({m['instrument_id'] for m in memberships})
+        panel = await DailyPricesDAO(env).get_price_panel(instrument_ids, read_start, end)
+    finally:
+        await close_pool(env)
+    cube = PriceCube.from_panel(panel, instrument_ids)
+    return await backfill_cube(cube, start, end, out_dir, durations, config, **kwargs)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Backfill indicators into a date/duration-partitioned Parquet dataset')
+    parser.add_argument('--start_date', type=str, required=True)
+    parser.add_argument('--end_date', type=str, required=True)
+    parser.add_argument('--out_dir', type=str, required=True)
+    parser.add_argument('--universe_id', type=int, default=None)
+    parser.add_argument('--instrument_ids', type=str, default=None, help='Comma-separated instrument ids')
+    parser.add_argument('--durations', type=str, default=None, help='Comma-separated durations (default: environment target durations)')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk_bars', type=int, default=DEFAULT_CHUNK_BARS)
+    parser.add_argument('--sample_size', type=int, default=DEFAULT_SAMPLE_SIZE)
+    parser.add_argument('--environment', type=str, default=None, help='Environment: prod, intg, or test (for table prefixing)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    env = Environment(EnvironmentType(args.environment.lower())) if args.environment else get_environment()
+    stats = await backfill_indicators(
+        env,
+        datetime.strptime(args.start_date, '%Y-%m-%d').date(),
+        datetime.strptime(args.end_date, '%Y-%m-%d').date(),
+        args.out_dir,
+        universe_id=args.universe_id,
+        instrument_ids=[int(i) for i in args.instrument_ids.split(',')] if args.instrument_ids else None,
+        durations=[TimeDuration(d) for d in args.durations.split(',')] if args.durations else None,
+        workers=args.workers,
+        chunk_bars=args.chunk_bars,
+        sample_size=args.sample_size,
+    )
+    for name, counts in stats.items():
+        print(f"{name}: {counts}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
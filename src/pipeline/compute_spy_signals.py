@@ -1,7 +1,7 @@
 # moved from project root
 from datetime import datetime, timedelta
 from spy_universe import SPYUniverse
-from market_data_simulator import simulate_market_data
+from market_data_simulator import simulate_market_paths
 from signals import extract_all_signals
 import csv
 
@@ -9,6 +9,7 @@ import csv
 START_DATE = datetime.utcnow() - timedelta(days=365*10)
 END_DATE = datetime.utcnow()
 INTERVAL_MINUTES = 5
+SEED = 42  # per-day paths are seeded with SEED + date ordinal
 
 # Load SPY universe membership
 universe = SPYUniverse('spy_membership.csv')
@@ -24,32 +25,48 @@ with open('spy_signals_5min_sample.csv', 'w', newline='') as f:
     writer.writeheader()
 
     dt = START_DATE
+    step = timedelta(minutes=INTERVAL_MINUTES)
     # For demo: only process the first 7 days of the last 10 years
-    for _ in range(7 * 24 * 12):  # 7 days, 12 intervals/hour, 24 hours/day
+    remaining = 7 * 24 * 12  # 7 days, 12 intervals/hour, 24 hours/day
+    while remaining > 0:
+        # Steps before the next midnight share one universe: simulate them in one call
+        next_day = datetime.combine(dt.date() + timedelta(days=1), datetime.min.time())
+        steps = min(remaining, -(-(next_day - dt) // step))
         symbols = universe.get_universe(dt.date())
-        for symbol in symbols:
-            # Simulate a 5-min bar for this symbol
-            ticks = simulate_market_data(symbol, dt, 1, interval_seconds=INTERVAL_MINUTES*60)
-            tick = ticks[0]
-            # Add fake time/calendar/interval signals for demo
-            tick['hour_of_day'] = tick['time'].hour
-            tick['day_of_week'] = tick['time'].weekday()
-            tick['week_of_month'] = 1 + (tick['time'].day - 1) // 7
-            tick['lse_last_open'] = dt.replace(hour=8, minute=0)
-            tick['lse_last_close'] = dt.replace(hour=16, minute=30)
-            tick['interval_signals'] = {
-                '5m': {
-                    'high': tick['last'] + 1,
-                    'low': tick['last'] - 1,
-                    'close': tick['last'],
-                    'vwap': tick['last'],
-                    'true_range': 2
+        paths = simulate_market_paths(symbols, dt, steps, interval_seconds=INTERVAL_MINUTES*60,
+                                      seed=SEED + dt.toordinal())
+        for k in range(steps):
+            step_dt = dt + k * step
+            for i, symbol in enumerate(symbols):
+                last = float(paths['close'][i, k])
+                tick = {
+                    'symbol': symbol,
+                    'bid': float(paths['bid'][i, k]),
+                    'ask': float(paths['ask'][i, k]),
+                    'last': last,
+                    'time': step_dt,
+                    'volume': int(paths['volume'][i, k]),
                 }
-            }
-            signals = extract_all_signals(tick)
-            signals['datetime'] = dt
-            signals['symbol'] = symbol
-            # Only keep columns in fieldnames
-            row = {k: signals.get(k, None) for k in fieldnames}
-            writer.writerow(row)
-        dt += timedelta(minutes=INTERVAL_MINUTES)
+                # Add fake time/calendar/interval signals for demo
+                tick['hour_of_day'] = tick['time'].hour
+                tick['day_of_week'] = tick['time'].weekday()
+                tick['week_of_month'] = 1 + (tick['time'].day - 1) // 7
+                tick['lse_last_open'] = step_dt.replace(hour=8, minute=0)
+                tick['lse_last_close'] = step_dt.replace(hour=16, minute=30)
+                tick['interval_signals'] = {
+                    '5m': {
+                        'high': last + 1,
+                        'low': last - 1,
+                        'close': last,
+                        'vwap': last,
+                        'true_range': 2
+                    }
+                }
+                signals = extract_all_signals(tick)
+                signals['datetime'] = step_dt
+                signals['symbol'] = symbol
+                # Only keep columns in fieldnames
+                row = {k: signals.get(k, None) for k in fieldnames}
+                writer.writerow(row)
+        dt += steps * step
+        remaining -= steps
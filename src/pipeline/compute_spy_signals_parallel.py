@@ -1,12 +1,12 @@
 # moved from project root
-import pandas as pd
 from datetime import datetime, timedelta
 from concurrent.futures import ProcessPoolExecutor, as_completed
 from spy_universe import SPYUniverse
-from market_data_simulator import simulate_market_data
-from signals import extract_all_signals
-import pyarrow.parquet as pq
+from market_data_simulator import simulate_market_paths
+from signals import SignalExtractor
+import numpy as np
 import pyarrow as pa
+import pyarrow.parquet as pq
 import os
 
 # Parameters
@@ -16,6 +16,7 @@ INTERVAL_MINUTES = 5
 PARQUET_DIR = 'spy_signals_parquet'
 BATCH_SIZE = 288  # One day (12 intervals/hour * 24 hours)
 MAX_WORKERS = 8
+SEED = 42  # each day is one path seeded with SEED + date ordinal, identical in every worker
 
 os.makedirs(PARQUET_DIR, exist_ok=True)
 
@@ -26,42 +27,71 @@ fieldnames = ['datetime', 'symbol', 'bid', 'ask', 'last', 'volume',
               'lse_last_open', 'lse_last_close',
               '5m_high', '5m_low', '5m_close', '5m_vwap', '5m_true_range']
 
+# Compiled once; every column of a batch is passed in ready-made from the simulated paths
+EXTRACTOR = SignalExtractor.from_fields(fieldnames, types={'volume': pa.int64()})
+
 def process_batch(batch_start_dt):
-    batch = []
+    parts = []
+    step = timedelta(minutes=INTERVAL_MINUTES)
+    batch_end = min(batch_start_dt + BATCH_SIZE * step, END_DATE)
     dt = batch_start_dt
-    for _ in range(BATCH_SIZE):
-        if dt >= END_DATE:
-            break
+    while dt < batch_end:
+        # Steps before the next midnight share one universe: simulate them in one call
+        midnight = datetime.combine(dt.date(), datetime.min.time())
+        next_day = midnight + timedelta(days=1)
+        steps = -(-(min(next_day, batch_end) - dt) // step)
         symbols = universe.get_universe(dt.date())
-        for symbol in symbols:
-            # Replace with real data loader if available
-            ticks = simulate_market_data(symbol, dt, 1, interval_seconds=INTERVAL_MINUTES*60)
-            tick = ticks[0]
-            tick['hour_of_day'] = tick['time'].hour
-            tick['day_of_week'] = tick['time'].weekday()
-            tick['week_of_month'] = 1 + (tick['time'].day - 1) // 7
-            tick['lse_last_open'] = dt.replace(hour=8, minute=0)
-            tick['lse_last_close'] = dt.replace(hour=16, minute=30)
-            tick['interval_signals'] = {
-                '5m': {
-                    'high': tick['last'] + 1,
-                    'low': tick['last'] - 1,
-                    'close': tick['last'],
-                    'vwap': tick['last'],
-                    'true_range': 2
-                }
-            }
-            signals = extract_all_signals(tick)
-            signals['datetime'] = dt
-            signals['symbol'] = symbol
-            row = {k: signals.get(k, None) for k in fieldnames}
-            batch.append(row)
-        dt += timedelta(minutes=INTERVAL_MINUTES)
-    # Write batch to Parquet
-    if batch:
-        table = pa.Table.from_pandas(pd.DataFrame(batch))
+        # Each day is one path from its first step on the batch grid: a batch starting
+        # mid-day still simulates from that step and keeps only its own steps, so a day split
+        # across two batches continues the path instead of replaying it
+        day_start = midnight + (dt - midnight) % step
+        offset = (dt - day_start) // step
+        # Replace with real data loader if available
+        paths = simulate_market_paths(symbols, day_start, offset + steps, interval_seconds=INTERVAL_MINUTES*60,
+                                      seed=SEED + dt.toordinal())
+        if len(symbols):
+            parts.append(step_columns(offset, steps, symbols, paths))
+        dt += steps * step
+    # Write batch to Parquet, column by column
+    if parts:
+        columns = {name: np.concatenate([part[name] for part in parts]) for name in fieldnames}
+        table = EXTRACTOR.extract(columns=columns)
         pq.write_table(table, f"{PARQUET_DIR}/signals_{batch_start_dt.strftime('%Y%m%d_%H%M')}.parquet")
-    return len(batch)
+        return table.num_rows
+    return 0
+
+def step_columns(offset, steps, symbols, paths):
+    """Signal columns for steps x symbols rows (step-major) from path steps offset.. of the (N, T) arrays."""
+    n = len(symbols)
+    rows = slice(offset, offset + steps)
+    # Per-step values, repeated for each symbol of the step
+    times = paths['time'][rows].astype('datetime64[us]')
+    days = times.astype('datetime64[D]')
+    midnight = days.astype('datetime64[us]')
+    minute_of_day = (times - days).astype('timedelta64[m]').astype(np.int64)
+    day_of_month = (days - days.astype('datetime64[M]')).astype(np.int64) + 1
+    per_step = {
+        'datetime': times,
+        'hour_of_day': minute_of_day // 60,
+        'day_of_week': (days.astype(np.int64) + 3) % 7,  # 1970-01-01 was a Thursday
+        'week_of_month': 1 + (day_of_month - 1) // 7,
+        'lse_last_open': midnight + np.timedelta64(8 * 60, 'm'),
+        'lse_last_close': midnight + np.timedelta64(16 * 60 + 30, 'm'),
+    }
+    columns = {name: np.repeat(values, n) for name, values in per_step.items()}
+    columns['symbol'] = np.tile(np.asarray(symbols, dtype=object), steps)
+    # (N, T) paths -> step-major rows
+    last = paths['close'][:, rows].T.ravel()
+    columns['bid'] = paths['bid'][:, rows].T.ravel()
+    columns['ask'] = paths['ask'][:, rows].T.ravel()
+    columns['last'] = last
+    columns['volume'] = paths['volume'][:, rows].T.ravel().astype(np.int64)
+    columns['5m_high'] = last + 1
+    columns['5m_low'] = last - 1
+    columns['5m_close'] = last
+    columns['5m_vwap'] = last
+    columns['5m_true_range'] = np.full(len(last), 2.0)
+    return columns
 
 def main():
     dt = START_DATE
@@ -0,0 +1,289 @@
+"""
+In-memory point-in-time symbol -> instrument_id resolver.
+
+Loads every instrument_xrefs interval once and keeps a sorted interval index per
+(vendor_id, symbol), plus a vendor-agnostic index per symbol. Lookups follow the
+same rule as the original per-row SQL query: among the intervals with
+``start_at <= at_date`` and ``end_at`` NULL or ``>= at_date``, the one with the
+latest ``start_at`` wins; without ``at_date`` the latest interval wins.
+
+The index is refreshed incrementally (new ids and rows with a newer
+``updated_at``) when it is older than ``performance.cache_ttl_seconds`` or when a
+lookup misses.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import date, datetime, time as dtime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config.environment import Environment
+from db.pool_registry import acquire
+
+logger = logging.getLogger(__name__)
+
+_END_OF_TIME = np.datetime64("9999-12-31T23:59:59", "us")
+
+
+def _to_datetime(value: Any) -> Optional[datetime]:
+    """Normalize a date/datetime to a naive datetime (UTC for aware values)."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, dtime.min)
+    raise TypeError(f"Unsupported at_date type: {type(value)}")
+
+
+async def fetch_instrument_id(conn, xref_table: str, symbol, vendor_id=None, at_date=None) -> int:
+    """
+    Single-row instrument_id lookup straight from the xref table.
+
+    Used where no resolver is available; prefer ``InstrumentResolver`` for
+    anything that resolves more than a handful of symbols.
+    """
+    q = f"SELECT instrument_id FROM {xref_table} WHERE symbol = $1"
+    params = [symbol]
+    if vendor_id is not None:
+        params.append(vendor_id)
+        q += f" AND vendor_id = ${len(params)}"
+    if at_date is not None:
+        params.append(at_date)
+        q += f" AND (start_at <= ${len(params)} AND (end_at IS NULL OR end_at >= ${len(params)}))"
+    q += " ORDER BY start_at DESC LIMIT 1"
+    row = await conn.fetchrow(q, *params)
+    if not row:
+        raise ValueError(f"No instrument_id found for symbol={symbol}, vendor_id={vendor_id}, at_date={at_date}")
+    return row['instrument_id']
+
+
+class _IntervalIndex:
+    """Intervals for one key, sorted by start."""
+    __slots__ = ("starts", "ends", "instrument_ids")
+
+    def __init__(self, intervals: List[Tuple[datetime, Optional[datetime], int]]):
+        intervals = sorted(intervals, key=lambda iv: iv[0])
+        self.starts = np.array([iv[0] for iv in intervals], dtype="datetime64[us]")
+        self.ends = np.array(
+            [iv[1] if iv[1] is not None else _END_OF_TIME for iv in intervals], dtype="datetime64[us]"
+        )
+        self.instrument_ids = np.array([iv[2] for iv in intervals], dtype=np.int64)
+
+    def lookup(self, at: Optional[np.datetime64]) -> Optional[int]:
+        if len(self.starts) == 0:
+            return None
+        if at is None:
+            return int(self.instrument_ids[-1])
+        i = int(np.searchsorted(self.starts, at, side="right")) - 1
+        # Walk back past intervals that ended before ``at`` (overlapping xrefs)
+        while i >= 0:
+            if self.ends[i] >= at:
+                return int(self.instrument_ids[i])
+            i -= 1
+        return None
+
+    def lookup_many(self, ats: np.ndarray) -> List[Optional[int]]:
+        idx = np.searchsorted(self.starts, ats, side="right") - 1
+        valid = idx >= 0
+        safe = np.where(valid, idx, 0)
+        covered = valid & (self.ends[safe] >= ats)
+        out: List[Optional[int]] = [None] * len(ats)
+        ids = self.instrument_ids[safe]
+        for j in np.flatnonzero(covered):
+            out[j] = int(ids[j])
+        for j in np.flatnonzero(valid & ~covered):
+            out[j] = self.lookup(ats[j])
+        return out
+
+
+class InstrumentResolver:
+    """
+    Point-in-time symbol -> instrument_id resolver backed by an in-memory xref index.
+    """
+
+    def __init__(self, env: Environment, ttl_seconds: Optional[float] = None):
+        self.env = env
+        self.table_name = env.get_table_name('instrument_xrefs')
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(
+            env.get('performance', 'cache_ttl_seconds', '3600')
+        )
+        # xref id -> (vendor_id, symbol, start_at, end_at, instrument_id)
+        self._xrefs: Dict[int, Tuple[int, str, datetime, Optional[datetime], int]] = {}
+        self._keys: Dict[Tuple[Optional[int], str], set] = {}
+        self._index: Dict[Tuple[Optional[int], str], _IntervalIndex] = {}
+        self._dirty: set = set()
+        self._max_id = 0
+        self._max_updated_at: Optional[datetime] = None
+        self._loaded_at: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def _apply_rows(self, rows) -> None:
+        for row in rows:
+            xref_id = row['id']
+            old = self._xrefs.get(xref_id)
+            if old is not None:
+                for key in ((old[0], old[1]), (None, old[1])):
+                    self._keys.get(key, set()).discard(xref_id)
+                    self._dirty.add(key)
+            start_at = _to_datetime(row['start_at'])
+            end_at = _to_datetime(row['end_at'])
+            self._xrefs[xref_id] = (row['vendor_id'], row['symbol'], start_at, end_at, row['instrument_id'])
+            for key in ((row['vendor_id'], row['symbol']), (None, row['symbol'])):
+                self._keys.setdefault(key, set()).add(xref_id)
+                self._dirty.add(key)
+            self._max_id = max(self._max_id, xref_id)
+            updated_at = _to_datetime(row.get('updated_at'))
+            if updated_at is not None and (self._max_updated_at is None or updated_at > self._max_updated_at):
+                self._max_updated_at = updated_at
+
+    def _get_index(self, key: Tuple[Optional[int], str]) -> Optional[_IntervalIndex]:
+        if key in self._dirty:
+            ids = self._keys.get(key)
+            if ids:
+                self._index[key] = _IntervalIndex([
+                    (self._xrefs[i][2], self._xrefs[i][3], self._xrefs[i][4]) for i in ids
+                ])
+            else:
+                self._index.pop(key, None)
+            self._dirty.discard(key)
+        return self._index.get(key)
+
+    async def load(self) -> None:
+        """Load (or reload) the full xref table into memory."""
+        async with acquire(self.env) as conn:
+            rows = await conn.fetch(
+                f"SELECT id, instrument_id, vendor_id, symbol, start_at, end_at, updated_at FROM {self.table_name}"
+            )
+        self._xrefs.clear()
+        self._keys.clear()
+        self._index.clear()
+        self._dirty.clear()
+        self._max_id = 0
+        self._max_updated_at = None
+        self._apply_rows(rows)
+        self._loaded_at = time.monotonic()
+        logger.info(f"InstrumentResolver loaded {len(self._xrefs)} xrefs from {self.table_name}")
+
+    async def refresh(self) -> int:
+        """
+        Pull xrefs added or updated since the last load/refresh.
+
+        Returns:
+            Number of xref rows applied
+        """
+        if not self.is_loaded:
+            await self.load()
+            return len(self._xrefs)
+        async with acquire(self.env) as conn:
+            if self._max_updated_at is not None:
+                rows = await conn.fetch(
+                    f"SELECT id, instrument_id, vendor_id, symbol, start_at, end_at, updated_at FROM {self.table_name} "
+                    f"WHERE id > $1 OR updated_at > $2",
+                    self._max_id, self._max_updated_at,
+                )
+            else:
+                rows = await conn.fetch(
+                    f"SELECT id, instrument_id, vendor_id, symbol, start_at, end_at, updated_at FROM {self.table_name} "
+                    f"WHERE id > $1",
+                    self._max_id,
+                )
+        self._apply_rows(rows)
+        self._loaded_at = time.monotonic()
+        return len(rows)
+
+    async def ensure_loaded(self) -> None:
+        """Load the index on first use and refresh it once it is older than the TTL."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self.is_loaded:
+                await self.load()
+            elif time.monotonic() - self._loaded_at > self.ttl_seconds:
+                await self.refresh()
+
+    def resolve(self, symbol: str, vendor_id: Optional[int] = None, at_date=None) -> int:
+        """
+        Resolve ``symbol`` to an instrument_id from the in-memory index.
+
+        Raises:
+            ValueError: If no xref interval matches
+        """
+        index = self._get_index((vendor_id, symbol))
+        instrument_id = None
+        if index is not None:
+            at = _to_datetime(at_date)
+            instrument_id = index.lookup(np.datetime64(at, "us") if at is not None else None)
+        if instrument_id is None:
+            raise ValueError(f"No instrument_id found for symbol={symbol}, vendor_id={vendor_id}, at_date={at_date}")
+        return instrument_id
+
+    def resolve_many(self, symbols: Sequence[str], dates, vendor_id: Optional[int] = None) -> List[Optional[int]]:
+        """
+        Resolve many (symbol, date) pairs at once.
+
+        Args:
+            symbols: Symbols to resolve
+            dates: One date per symbol, or a single date applied to all
+            vendor_id: Optional vendor filter
+
+        Returns:
+            instrument_ids aligned with ``symbols``; None where unresolved
+        """
+        if dates is None or isinstance(dates, (date, datetime)):
+            dates = [dates] * len(symbols)
+        if len(dates) != len(symbols):
+            raise ValueError("symbols and dates must have the same length")
+        out: List[Optional[int]] = [None] * len(symbols)
+        groups: Dict[str, List[int]] = {}
+        for i, symbol in enumerate(symbols):
+            groups.setdefault(symbol, []).append(i)
+        for symbol, positions in groups.items():
+            index = self._get_index((vendor_id, symbol))
+            if index is None:
+                continue
+            latest = [p for p in positions if dates[p] is None]
+            for p in latest:
+                out[p] = index.lookup(None)
+            dated = [p for p in positions if dates[p] is not None]
+            if not dated:
+                continue
+            ats = np.array([_to_datetime(dates[p]) for p in dated], dtype="datetime64[us]")
+            for p, instrument_id in zip(dated, index.lookup_many(ats)):
+                out[p] = instrument_id
+        return out
+
+    async def lookup(self, symbol: str, vendor_id: Optional[int] = None, at_date=None) -> int:
+        """
+        Async resolve: loads/refreshes the index as needed and retries once after
+        an incremental refresh when the symbol is not found.
+        """
+        await self.ensure_loaded()
+        try:
+            return self.resolve(symbol, vendor_id, at_date)
+        except ValueError:
+            await self.refresh()
+            return self.resolve(symbol, vendor_id, at_date)
+
+
+_resolvers: Dict[Tuple[str, str], InstrumentResolver] = {}
+
+
+def get_instrument_resolver(env: Environment) -> InstrumentResolver:
+    """Get the process-wide resolver for ``env``."""
+    key = (env.get_database_url(), env.get_table_name('instrument_xrefs'))
+    resolver = _resolvers.get(key)
+    if resolver is None:
+        resolver = _resolvers[key] = InstrumentResolver(env)
+    return resolver
@@ -25,92 +25,84 @@ class SecMaster:
         if self._events is None:
             self._events = await self.dao.get_spy_membership_events()
 
-    async def get_spy_membership(self) -> List[str]:
-        """Returns SPY membership as of self.as_of_date (set at init), using universe_membership table."""
+    def _members_as_of(self, as_of: date) -> set:
+        """instrument_ids whose membership interval covers as_of (start inclusive, end exclusive)."""
+        return {
+            row['instrument_id'] for row in self._events
+            if row['start_date'] <= as_of and (row['end_date'] is None or row['end_date'] > as_of)
+        }
+
+    async def get_spy_membership(self) -> List[int]:
+        """Returns SPY membership (instrument_ids) as of self.as_of_date (set at init), using universe_membership table."""
         if self.as_of_date is None:
             raise ValueError("as_of_date must be set at initialization for snapshot mode.")
         await self.load_all_membership_events()
         if self.as_of_date in self._membership_cache:
             return sorted(self._membership_cache[self.as_of_date])
-        membership = set()
-        for row in self._events:
-            # Add symbol if start_date <= as_of_date and (end_date is null or end_date > as_of_date)
-            if row['start_date'] <= self.as_of_date and (row['end_date'] is None or row['end_date'] > self.as_of_date):
-                membership.add(row['symbol'])
+        membership = self._members_as_of(self.as_of_date)
         self._membership_cache[self.as_of_date] = set(membership)
         return sorted(membership)
 
-    async def advance(self, to_date: date) -> List[str]:
+    async def advance(self, to_date: date) -> List[int]:
         """
-        Advance the membership from self.as_of_date to to_date, updating caches for last_close_price, market_cap, and ADV (30d) for all tickers.
-        Returns the new membership as a sorted list.
+        Advance the membership from self.as_of_date to to_date, updating caches for last_close_price, market_cap, and ADV (30d) for all members.
+        Returns the new membership as a sorted list of instrument_ids.
         """
         if self.as_of_date is None:
             raise ValueError("as_of_date must be set at initialization for advance().")
         await self.load_all_membership_events()
         self.as_of_date = to_date
-        # Recompute membership as of to_date using new logic
-        membership = set()
-        for row in self._events:
-            if row['start_date'] <= to_date and (row['end_date'] is None or row['end_date'] > to_date):
-                membership.add(row['symbol'])
-        # Update caches for tickers in new membership
-        tickers = list(membership)
-        self._last_close_price_cache = await self.dao.batch_last_close_prices(to_date, tickers)
-        self._market_cap_cache = await self.dao.batch_market_caps(to_date, tickers)
-        adv_cache = {}
-        for ticker in tickers:
-            adv = await self.dao.get_average_dollar_volume(ticker, to_date, 30)
-            adv_cache[(ticker, 30)] = adv
-        self._adv_cache = adv_cache
+        membership = self._members_as_of(to_date)
+        # Update caches for the new membership, keyed by instrument_id
+        stats = await self.dao.batch_as_of_stats(to_date, list(membership), 30)
+        self._last_close_price_cache = {i: s['close'] for i, s in stats.items()}
+        self._market_cap_cache = {i: s['market_cap'] for i, s in stats.items()}
+        self._adv_cache = {(i, 30): s['adv'] for i, s in stats.items()}
         return sorted(membership)
 
     async def get_spy_membership_over_dates(self, dates: List[date]) -> dict:
-        """Efficiently get membership for a list of dates (must be sorted), using universe_membership logic. Returns {date: set(tickers)}."""
+        """Efficiently get membership for a list of dates (must be sorted), using universe_membership logic. Returns {date: set(instrument_ids)}."""
         await self.load_all_membership_events()
         results = {}
         for d in sorted(dates):
-            membership = set()
-            for row in self._events:
-                if row['start_date'] <= d and (row['end_date'] is None or row['end_date'] > d):
-                    membership.add(row['symbol'])
+            membership = self._members_as_of(d)
             results[d] = set(membership)
             self._membership_cache[d] = set(membership)
         return results
 
-    async def get_last_close_price(self, ticker: str) -> float:
+    async def get_last_close_price(self, instrument_id: int) -> float:
         """
-        Return the last close price for ticker as of self.as_of_date, using cache if available.
+        Return the last close price for instrument_id as of self.as_of_date, using cache if available.
         """
-        if ticker in self._last_close_price_cache:
-            return self._last_close_price_cache[ticker]
+        if instrument_id in self._last_close_price_cache:
+            return self._last_close_price_cache[instrument_id]
         if self.as_of_date is None:
             raise ValueError("as_of_date must be set at initialization.")
-        price = await self.dao.get_last_close_price(ticker, self.as_of_date)
-        self._last_close_price_cache[ticker] = price
+        price = await self.dao.get_last_close_price(instrument_id, self.as_of_date)
+        self._last_close_price_cache[instrument_id] = price
         return price
 
-    async def get_average_dollar_volume(self, ticker: str, window: int = 30) -> float:
+    async def get_average_dollar_volume(self, instrument_id: int, window: int = 30) -> float:
         """
         Return the average daily dollar volume (close * volume) over the past `window` days as of self.as_of_date, using cache if available.
         """
-        key = (ticker, window)
+        key = (instrument_id, window)
         if key in self._adv_cache:
             return self._adv_cache[key]
         if self.as_of_date is None:
             raise ValueError("as_of_date must be set at initialization.")
-        avg_dv = await self.dao.get_average_dollar_volume(ticker, self.as_of_date, window)
+        avg_dv = await self.dao.get_average_dollar_volume(instrument_id, self.as_of_date, window)
         self._adv_cache[key] = avg_dv
         return avg_dv
 
-    async def get_market_cap(self, ticker: str) -> float:
+    async def get_market_cap(self, instrument_id: int) -> float:
         """
-        Return the latest market cap for ticker as of self.as_of_date, using cache if available.
+        Return the latest market cap for instrument_id as of self.as_of_date, using cache if available.
         """
-        if ticker in self._market_cap_cache:
-            return self._market_cap_cache[ticker]
+        if instrument_id in self._market_cap_cache:
+            return self._market_cap_cache[instrument_id]
         if self.as_of_date is None:
             raise ValueError("as_of_date must be set at initialization.")
-        mc = await self.dao.get_market_cap(ticker, self.as_of_date)
-        self._market_cap_cache[ticker] = mc
+        mc = await self.dao.get_market_cap(instrument_id, self.as_of_date)
+        self._market_cap_cache[instrument_id] = mc
         return mc
@@ -0,0 +1,227 @@
+"""
+Bounded interval history.
+
+IntervalRing keeps the last ``capacity`` UniverseIntervals of one duration as
+per-field NumPy arrays of shape (capacity, instruments) instead of lists of
+InstrumentInterval objects, so memory is fixed by capacity and universe size
+rather than run length. Rows are written twice into a buffer of 2 * capacity
+rows (a mirrored ring), so any window of the latest rows is a contiguous,
+zero-copy, read-only view, oldest row first.
+
+HistoryStore holds one ring per duration, sized from
+``trading.indicator_lookback_days`` and the history the configured indicators
+require (IndicatorPlan.required_bars).
+"""
+
+import math
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from calendars.time_duration import DurationType, TimeDuration
+from signals.indicator_config import IndicatorConfig
+from signals.indicator_engine import HistoryArrays
+from state.universe_interval import UniverseInterval
+
+RING_FIELDS = ('open', 'high', 'low', 'close', 'volume', 'dollar')
+
+# Regular-session minutes used to convert lookback days into intraday bars
+DEFAULT_SESSION_MINUTES = 390
+
+_PERIOD_DAYS = {
+    DurationType.DAILY: 1,
+    DurationType.WEEKLY: 5,
+    DurationType.MONTHLY: 21,
+    DurationType.QUARTERLY: 63,
+    DurationType.YEARLY: 252,
+}
+
+
+def bars_for_days(duration: TimeDuration, days: int, session_minutes: int = DEFAULT_SESSION_MINUTES) -> int:
+    """Bars of ``duration`` covering ``days`` trading days (rounded up)."""
+    minutes = duration.get_duration_minutes()
+    if minutes is not None:
+        return days * math.ceil(session_minutes / minutes)
+    return math.ceil(days / _PERIOD_DAYS[duration.duration_type])
+
+
+class IntervalRing:
+    def __init__(self, capacity: int, instrument_capacity: int = 64):
+        """
+        Args:
+            capacity: Intervals kept (older ones are overwritten)
+            instrument_capacity: Initial instrument columns; grows by doubling
+        """
+        if capacity < 1:
+            raise ValueError("IntervalRing capacity must be at least 1")
+        self.capacity = capacity
+        self.instrument_ids: List[int] = []
+        self._column: Dict[int, int] = {}
+        self._width = max(1, instrument_capacity)
+        self._data = {f: np.full((2 * capacity, self._width), np.nan) for f in RING_FIELDS}
+        self._ok = np.zeros((2 * capacity, self._width), dtype=bool)
+        self._start = np.full(2 * capacity, np.datetime64('NaT'), dtype='datetime64[us]')
+        self._end = np.full(2 * capacity, np.datetime64('NaT'), dtype='datetime64[us]')
+        self._next = 0    # slot the next interval is written to
+        self.count = 0    # intervals held, at most capacity
+        self.appended = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _columns_for(self, instrument_ids: Iterable[int]) -> np.ndarray:
+        new = [iid for iid in instrument_ids if iid not in self._column]
+        for iid in new:
+            self._column[iid] = len(self.instrument_ids)
+            self.instrument_ids.append(iid)
+        if len(self.instrument_ids) > self._width:
+            width = self._width
+            while width < len(self.instrument_ids):
+                width *= 2
+            for f in RING_FIELDS:
+                grown = np.full((2 * self.capacity, width), np.nan)
+                grown[:, :self._width] = self._data[f]
+                self._data[f] = grown
+            grown_ok = np.zeros((2 * self.capacity, width), dtype=bool)
+            grown_ok[:, :self._width] = self._ok
+            self._ok = grown_ok
+            self._width = width
+
+    def append(self, interval: UniverseInterval) -> None:
+        """Write the newest interval; instruments absent from it are NaN / not ok."""
+        items = interval.instrument_intervals
+        self._columns_for(items)
+        n = len(items)
+        cols = np.fromiter((self._column[iid] for iid in items), dtype=np.int64, count=n)
+        values = {
+            'open': np.fromiter((i.open for i in items.values()), dtype=np.float64, count=n),
+            'high': np.fromiter((i.high for i in items.values()), dtype=np.float64, count=n),
+            'low': np.fromiter((i.low for i in items.values()), dtype=np.float64, count=n),
+            'close': np.fromiter((i.close for i in items.values()), dtype=np.float64, count=n),
+            'volume': np.fromiter((i.traded_volume for i in items.values()), dtype=np.float64, count=n),
+            'dollar': np.fromiter((i.traded_dollar for i in items.values()), dtype=np.float64, count=n),
+        }
+        ok = np.fromiter((i.status == 'ok' for i in items.values()), dtype=bool, count=n)
+        self.append_columns(interval.start_date_time, interval.end_date_time, cols, values, ok)
+
+    def append_columns(self, start: datetime, end: datetime, columns: np.ndarray,
+                       values: Dict[str, np.ndarray], ok: np.ndarray) -> None:
+        """Write the newest interval from arrays aligned with ring ``columns`` (see column_of)."""
+        slot = self._next
+        for row in (slot, slot + self.capacity):
+            for f in RING_FIELDS:
+                line = self._data[f][row]
+                line[:] = np.nan
+                if f in values:
+                    line[columns] = values[f]
+            self._ok[row] = False
+            self._ok[row, columns] = ok
+            self._start[row] = start
+            self._end[row] = end
+        self._next = (slot + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.appended += 1
+
+    def clear(self) -> None:
+        """Drop all intervals and instrument columns, keeping the allocated buffers."""
+        self.instrument_ids.clear()
+        self._column.clear()
+        for data in self._data.values():
+            data.fill(np.nan)
+        self._ok.fill(False)
+        self._start.fill(np.datetime64('NaT'))
+        self._end.fill(np.datetime64('NaT'))
+        self._next = 0
+        self.count = 0
+        self.appended = 0
+
+    def column_of(self, instrument_ids: Sequence[int]) -> np.ndarray:
+        """Ring column of each id, adding columns for new ids."""
+        self._columns_for(instrument_ids)
+        return np.fromiter((self._column[iid] for iid in instrument_ids), dtype=np.int64, count=len(instrument_ids))
+
+    def _rows(self, length: Optional[int]) -> slice:
+        length = self.count if length is None else min(length, self.count)
+        stop = self._next + self.capacity
+        return slice(stop - length, stop)
+
+    @staticmethod
+    def _read_only(array: np.ndarray) -> np.ndarray:
+        view = array.view()
+        view.flags.writeable = False
+        return view
+
+    def window(self, field: str, length: Optional[int] = None) -> np.ndarray:
+        """Read-only (length, instruments) view of the latest intervals, oldest first."""
+        data = self._ok if field == 'ok' else self._data[field]
+        return self._read_only(data[self._rows(length), :len(self.instrument_ids)])
+
+    def times(self, length: Optional[int] = None) -> np.ndarray:
+        """Read-only start times of the latest intervals, oldest first."""
+        return self._read_only(self._start[self._rows(length)])
+
+    def history_arrays(self, lookback: int) -> HistoryArrays:
+        """
+        Indicator engine input (see indicator_engine.compute_indicators): views
+        transposed to (instruments, lookback), padded with invalid bars while
+        fewer than ``lookback`` intervals are held.
+        """
+        n = len(self.instrument_ids)
+        arrays = [self.window(f, lookback).T for f in ('high', 'low', 'close')]
+        ok = self.window('ok', lookback).T
+        held = ok.shape[1]
+        if held < lookback:
+            pad = lookback - held
+            arrays = [np.concatenate([np.full((n, pad), np.nan), a], axis=1) for a in arrays]
+            ok = np.concatenate([np.zeros((n, pad), dtype=bool), ok], axis=1)
+        return HistoryArrays(np.asarray(self.instrument_ids, dtype=np.int64), *arrays, ok)
+
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in self._data.values()) + self._ok.nbytes + self._start.nbytes + self._end.nbytes
+
+
+class HistoryStore:
+    """One IntervalRing per duration string."""
+
+    def __init__(self, capacities: Dict[str, int]):
+        self.capacities = dict(capacities)
+        self.rings: Dict[str, IntervalRing] = {}
+
+    @classmethod
+    def from_environment(cls, env, durations: Optional[Sequence[TimeDuration]] = None,
+                         indicator_config: Optional[IndicatorConfig] = None) -> 'HistoryStore':
+        """
+        Size each duration's ring to the larger of ``trading.indicator_lookback_days``
+        (converted to bars, ``trading.session_minutes`` per day) and the bars the
+        configured indicators require.
+        """
+        durations = durations if durations is not None else env.get_target_durations()
+        config = indicator_config if indicator_config is not None else env.indicator_config
+        required = config.build_plan().required_bars() if len(config) or config.nodes else 0
+        days = int(env.get('trading', 'indicator_lookback_days', 0))
+        session_minutes = int(env.get('trading', 'session_minutes', DEFAULT_SESSION_MINUTES))
+        capacities = {
+            d.get_duration_string(): max(1, required, bars_for_days(d, days, session_minutes))
+            for d in durations
+        }
+        return cls(capacities)
+
+    def ring(self, duration: str) -> IntervalRing:
+        """
+        Raises:
+            KeyError: If the store was not sized for this duration
+        """
+        ring = self.rings.get(duration)
+        if ring is None:
+            ring = self.rings[duration] = IntervalRing(self.capacities[duration])
+        return ring
+
+    def append(self, duration: str, interval: UniverseInterval) -> None:
+        self.ring(duration).append(interval)
+
+    def window(self, duration: str, field: str, length: Optional[int] = None) -> np.ndarray:
+        return self.ring(duration).window(field, length)
+
+    def nbytes(self) -> int:
+        return sum(ring.nbytes() for ring in self.rings.values())
@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 from calendars.time_duration import TimeDuration
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict
 from state.universe_interval import UniverseInterval
 from state.instrument_interval import InstrumentInterval
 from state.indicator_interval import IndicatorInterval
@@ -12,6 +12,9 @@ class UniverseState:
     instrument_intervals: Dict[int, InstrumentInterval] = field(default_factory=dict)
     indicator_intervals: Dict[int, IndicatorInterval] = field(default_factory=dict)  # Map instrument_id to computed indicators
     instrument_history: Dict[int, List[InstrumentInterval]] = field(default_factory=dict)  # Historical intervals per instrument for indicator computation
+    # Optional signals.history_store.IntervalRing: new intervals are also written to it, and
+    # intervals / instrument_history are bounded to its capacity (trimmed at twice that).
+    history: Optional[Any] = None
 
     def __post_init__(self):
         # If instrument_intervals not provided, populate from last interval
@@ -22,13 +25,21 @@ class UniverseState:
         """Add a new UniverseInterval and update instrument history."""
         self.intervals.append(interval)
         self._update_instrument_history(interval)
+        if self.history is not None:
+            self.history.append(interval)
+            if len(self.intervals) > 2 * self.history.capacity:
+                del self.intervals[:-self.history.capacity]
     
     def _update_instrument_history(self, interval: UniverseInterval):
         """Update instrument history with intervals from the new UniverseInterval."""
+        limit = self.history.capacity if self.history is not None else None
         for instrument_id, instrument_interval in interval.instrument_intervals.items():
             if instrument_id not in self.instrument_history:
                 self.instrument_history[instrument_id] = []
-            self.instrument_history[instrument_id].append(instrument_interval)
+            history = self.instrument_history[instrument_id]
+            history.append(instrument_interval)
+            if limit is not None and len(history) > 2 * limit:
+                del history[:-limit]
     
     def reset(self):
         """Clear all intervals and history."""
@@ -36,6 +47,8 @@ class UniverseState:
         self.instrument_intervals.clear()
         self.indicator_intervals.clear()
         self.instrument_history.clear()
+        if self.history is not None:
+            self.history.clear()
 
 
 
@@ -1,15 +1,21 @@
 from dataclasses import dataclass, field
 from typing import Dict, List, Type, Optional
 from signals.indicator import Indicator, PL, OneOneHigh, OneOneLow, OneOneDot, EBot, ETop
+from signals.streaming_indicator import StreamingIndicator, STREAMING_INDICATORS
+from signals.indicator_graph import IndicatorNode, IndicatorPlan, BUILTIN_INDICATOR_NODES
 
 
 @dataclass
 class IndicatorConfig:
     """
     Configuration for which indicators to compute in UniverseStateBuilder.
-    Maps indicator names to their corresponding classes.
+    Maps indicator names to their corresponding classes. Derived indicators
+    declared as IndicatorNode (inputs by name: raw fields, built-in or other
+    derived indicators) live in ``nodes`` and are evaluated with the built-ins
+    through build_plan().
     """
     indicators: Dict[str, Type[Indicator]] = field(default_factory=dict)
+    nodes: Dict[str, IndicatorNode] = field(default_factory=dict)
     
     def __post_init__(self):
         # If no indicators specified, use empty dict
@@ -25,6 +31,29 @@ class IndicatorConfig:
         if name in self.indicators:
             del self.indicators[name]
     
+    def add_node(self, node: IndicatorNode):
+        """Add a derived indicator computed from the named inputs."""
+        self.nodes[node.name] = node
+
+    def build_plan(self) -> IndicatorPlan:
+        """
+        Topologically ordered evaluation plan for all configured indicators and
+        nodes; shared intermediate series are computed once per interval.
+
+        Raises:
+            KeyError: If an indicator class has no graph definition or an input is unknown
+            ValueError: If node dependencies contain a cycle
+        """
+        nodes = dict(self.nodes)
+        outputs = []
+        for name, indicator_class in self.indicators.items():
+            node_name = BUILTIN_INDICATOR_NODES[indicator_class]
+            if name != node_name:
+                nodes[name] = IndicatorNode(name, (node_name,), lambda value: value)
+            outputs.append(name)
+        outputs.extend(name for name in self.nodes if name not in outputs)
+        return IndicatorPlan.build(nodes, outputs)
+
     def has_indicator(self, name: str) -> bool:
         """Check if configuration includes a specific indicator."""
         return name in self.indicators
@@ -37,6 +66,15 @@ class IndicatorConfig:
         """Create instances of all configured indicators."""
         return {name: indicator_class() for name, indicator_class in self.indicators.items()}
     
+    def create_streaming_instances(self) -> Dict[str, StreamingIndicator]:
+        """
+        Create O(1)-update streaming instances (fed one interval at a time) of all configured indicators.
+
+        Raises:
+            KeyError: If a configured indicator has no streaming counterpart
+        """
+        return {name: STREAMING_INDICATORS[indicator_class]() for name, indicator_class in self.indicators.items()}
+
     @classmethod
     def default_config(cls) -> 'IndicatorConfig':
         """Create a default configuration with commonly used indicators."""
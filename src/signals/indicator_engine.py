@@ -0,0 +1,137 @@
+"""
+Cross-sectional indicator engine.
+
+Computes the indicators of signals.indicator (PL, OneOneHigh, OneOneLow,
+OneOneDot, EBot, ETop) for a whole universe at once from (instrument x
+lookback) OHLC arrays, instead of updating one Indicator object per
+instrument from a list of InstrumentInterval. Rows are right-aligned: column
+-1 is the latest interval. An interval counts as valid when its ``ok`` flag is
+set (status == 'ok'); slots before an instrument's first interval are simply
+not ok. Results match the per-object classes: where an indicator would be
+'invalid' its value is NaN and its ``valid`` flag False.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from state.indicator_interval import IndicatorInterval
+from state.instrument_interval import InstrumentInterval
+
+# Intervals each indicator reads, counted back from the latest
+INDICATOR_LOOKBACK = {
+    'PL': 3,
+    'OneOneHigh': 1,
+    'OneOneLow': 1,
+    'OneOneDot': 1,
+    'EBot': 4,  # the oldest of the three averaged intervals needs a valid prior
+    'ETop': 4,
+}
+
+
+class HistoryArrays(NamedTuple):
+    instrument_ids: np.ndarray  # (N,)
+    high: np.ndarray            # (N, L)
+    low: np.ndarray             # (N, L)
+    close: np.ndarray           # (N, L)
+    ok: np.ndarray              # (N, L) bool
+
+
+def history_arrays(instrument_history: Mapping[int, Sequence[InstrumentInterval]], lookback: int,
+                   instrument_ids: Optional[Sequence[int]] = None) -> HistoryArrays:
+    """
+    Right-aligned arrays of the last ``lookback`` intervals per instrument,
+    e.g. from UniverseState.instrument_history.
+    """
+    ids = list(instrument_history) if instrument_ids is None else list(instrument_ids)
+    n = len(ids)
+    high = np.full((n, lookback), np.nan)
+    low = np.full((n, lookback), np.nan)
+    close = np.full((n, lookback), np.nan)
+    ok = np.zeros((n, lookback), dtype=bool)
+    for row, iid in enumerate(ids):
+        window = instrument_history.get(iid) or ()
+        window = window[-lookback:] if lookback else ()
+        offset = lookback - len(window)
+        for col, interval in enumerate(window, offset):
+            if interval.status == 'ok':
+                ok[row, col] = True
+            high[row, col] = np.nan if interval.high is None else interval.high
+            low[row, col] = np.nan if interval.low is None else interval.low
+            close[row, col] = np.nan if interval.close is None else interval.close
+    return HistoryArrays(np.asarray(ids, dtype=np.int64), high, low, close, ok)
+
+
+def _tail_ok(ok: np.ndarray, k: int) -> np.ndarray:
+    if ok.shape[1] < k:
+        return np.zeros(ok.shape[0], dtype=bool)
+    return ok[:, -k:].all(axis=1)
+
+
+def compute_indicators(high: np.ndarray, low: np.ndarray, close: np.ndarray, ok: np.ndarray,
+                       names: Optional[Sequence[str]] = None) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Compute indicators for every instrument.
+
+    Args:
+        high, low, close: (N, L) float arrays, latest interval in the last column
+        ok: (N, L) bool, True where the interval has status 'ok'
+        names: Indicators to compute (default: all of INDICATOR_LOOKBACK)
+
+    Returns:
+        {name: (values, valid)}, (N,) float64 values (NaN where invalid) and (N,) bool
+
+    Raises:
+        KeyError: On an unknown indicator name
+    """
+    names = list(INDICATOR_LOOKBACK) if names is None else list(names)
+    for name in names:
+        if name not in INDICATOR_LOOKBACK:
+            raise KeyError(f"Unknown indicator: {name}")
+    n, lookback = ok.shape
+    depth = min(lookback, 3)
+    # Typical price (OneOneDot) of the last up-to-three intervals, shared by every indicator
+    dot = (high[:, lookback - depth:] + low[:, lookback - depth:] + close[:, lookback - depth:]) / 3.0
+    tail_high, tail_low = high[:, lookback - depth:], low[:, lookback - depth:]
+    results = {}
+    for name in names:
+        need = INDICATOR_LOOKBACK[name]
+        valid = _tail_ok(ok, need)
+        if not valid.any():
+            results[name] = (np.full(n, np.nan), valid)
+            continue
+        if name == 'OneOneDot':
+            values = dot[:, -1]
+        elif name == 'OneOneHigh':
+            values = 2 * dot[:, -1] - tail_low[:, -1]
+        elif name == 'OneOneLow':
+            values = 2 * dot[:, -1] - tail_high[:, -1]
+        elif name == 'PL':
+            values = dot.sum(axis=1) / 3.0
+        elif name == 'EBot':
+            values = (2 * dot - tail_high).sum(axis=1) / 3.0
+        else:  # ETop
+            values = (2 * dot - tail_low).sum(axis=1) / 3.0
+        results[name] = (np.where(valid, values, np.nan), valid)
+    return results
+
+
+def to_indicator_intervals(instrument_ids: Sequence[int], results: Mapping[str, Tuple[np.ndarray, np.ndarray]],
+                           start_date_time: datetime, end_date_time: datetime,
+                           update_at: Optional[datetime] = None) -> Dict[int, IndicatorInterval]:
+    """IndicatorInterval per instrument (as UniverseState.indicator_intervals) from compute_indicators output."""
+    update_at = update_at or datetime.now()
+    columns: List[Tuple[str, list, list]] = [
+        (name, values.tolist(), valid.tolist()) for name, (values, valid) in results.items()
+    ]
+    intervals = {}
+    for row, iid in enumerate(np.asarray(instrument_ids).tolist()):
+        interval = IndicatorInterval(instrument_id=iid, start_date_time=start_date_time, end_date_time=end_date_time)
+        for name, values, valid in columns:
+            if valid[row]:
+                interval.add_indicator(name, values[row], 'ok', update_at)
+            else:
+                interval.add_indicator(name, None, 'invalid', update_at)
+        intervals[iid] = interval
+    return intervals
@@ -0,0 +1,196 @@
+"""
+Indicator dependency graph.
+
+An IndicatorNode declares its inputs by name - raw bar fields (RAW_FIELDS) or
+other nodes - and a function of their values. IndicatorPlan orders the nodes
+topologically and, on every interval, evaluates each node exactly once, keeping
+only as much history of each series as its consumers need. A shared
+intermediate such as the typical price is therefore computed once per bar and
+reused by every indicator (and every later bar) that reads it.
+
+Series are NumPy arrays over instruments, so one plan update advances a whole
+universe (a single instrument is just N = 1).
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Type
+
+import numpy as np
+
+from signals.indicator import Indicator, PL, OneOneHigh, OneOneLow, OneOneDot, EBot, ETop
+
+RAW_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+@dataclass(frozen=True)
+class IndicatorNode:
+    """
+    name:   Series name
+    inputs: Names of raw fields or other nodes
+    func:   Called with one argument per input. With window == 1 each is the
+            input's current (N,) values; otherwise its last ``window`` values
+            as a (window, N) array, oldest first.
+    window: Bars of each input passed to func
+    valid_lookback: Latest bars over which every input must be valid (default: window)
+    """
+    name: str
+    inputs: Tuple[str, ...]
+    func: Callable[..., np.ndarray]
+    window: int = 1
+    valid_lookback: Optional[int] = None
+
+    @property
+    def lookback(self) -> int:
+        return max(self.window, self.valid_lookback or 0)
+
+
+def _typical(high, low, close):
+    return (high + low + close) / 3.0
+
+
+def _mean3(history):
+    return history.sum(axis=0) / 3.0
+
+
+# Graph definitions of the built-in indicators; 'dot' is the shared typical price
+BUILTIN_NODES: Dict[str, IndicatorNode] = {node.name: node for node in (
+    IndicatorNode('dot', ('high', 'low', 'close'), _typical),
+    IndicatorNode('OneOneDot', ('dot',), lambda dot: dot),
+    IndicatorNode('OneOneHigh', ('dot', 'low'), lambda dot, low: 2 * dot - low),
+    IndicatorNode('OneOneLow', ('dot', 'high'), lambda dot, high: 2 * dot - high),
+    IndicatorNode('PL', ('dot',), _mean3, window=3),
+    # EBot / ETop also require the bar before the three averaged ones to be valid
+    IndicatorNode('EBot', ('OneOneLow',), _mean3, window=3, valid_lookback=4),
+    IndicatorNode('ETop', ('OneOneHigh',), _mean3, window=3, valid_lookback=4),
+)}
+
+# List-based indicator class -> name of its node in BUILTIN_NODES
+BUILTIN_INDICATOR_NODES: Dict[Type[Indicator], str] = {
+    PL: 'PL', OneOneHigh: 'OneOneHigh', OneOneLow: 'OneOneLow',
+    OneOneDot: 'OneOneDot', EBot: 'EBot', ETop: 'ETop',
+}
+
+
+class PlanState:
+    """Per-universe series history for an IndicatorPlan (see IndicatorPlan.new_state)."""
+
+    def __init__(self, depths: Mapping[str, int]):
+        self.depths = dict(depths)
+        self.values: Dict[str, List[np.ndarray]] = {name: [] for name in depths}
+        self.valid: Dict[str, List[np.ndarray]] = {name: [] for name in depths}
+        self.bars = 0
+
+    def push(self, name: str, values: np.ndarray, valid: np.ndarray) -> None:
+        history, flags = self.values[name], self.valid[name]
+        history.append(values)
+        flags.append(valid)
+        if len(history) > self.depths[name]:
+            del history[0]
+            del flags[0]
+
+
+class IndicatorPlan:
+    def __init__(self, nodes: Sequence[IndicatorNode], outputs: Sequence[str]):
+        """
+        Args:
+            nodes: Nodes in evaluation (topological) order
+            outputs: Node names returned by update
+        """
+        self.nodes = list(nodes)
+        self.outputs = list(outputs)
+        # History each series must keep: the longest lookback of any consumer
+        self.depths = {field: 1 for field in RAW_FIELDS}
+        for node in self.nodes:
+            self.depths.setdefault(node.name, 1)
+        for node in self.nodes:
+            for name in node.inputs:
+                self.depths[name] = max(self.depths[name], node.lookback)
+        self.evaluations: Dict[str, int] = {node.name: 0 for node in self.nodes}
+
+    @classmethod
+    def build(cls, nodes: Mapping[str, IndicatorNode], outputs: Iterable[str],
+              library: Mapping[str, IndicatorNode] = BUILTIN_NODES) -> 'IndicatorPlan':
+        """
+        Resolve outputs and their transitive inputs (from ``nodes``, then
+        ``library``) and order them so every node follows its inputs.
+
+        Raises:
+            KeyError: If an input is neither a raw field nor a known node
+            ValueError: If the dependencies contain a cycle
+        """
+        outputs = list(outputs)
+        order: List[IndicatorNode] = []
+        state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+        def visit(name: str, path: Tuple[str, ...]) -> None:
+            if name in RAW_FIELDS or state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Indicator dependency cycle: {' -> '.join(path + (name,))}")
+            node = nodes.get(name) or library.get(name)
+            if node is None:
+                raise KeyError(f"Unknown indicator input: {name}")
+            state[name] = 1
+            for dep in node.inputs:
+                visit(dep, path + (name,))
+            state[name] = 2
+            order.append(node)
+
+        for name in outputs:
+            visit(name, ())
+        return cls(order, outputs)
+
+    def required_bars(self) -> int:
+        """Raw bars of history the outputs depend on (lookbacks compound through the graph)."""
+        need = {field: 1 for field in RAW_FIELDS}
+        for node in self.nodes:
+            need[node.name] = max((need[dep] for dep in node.inputs), default=1) + node.lookback - 1
+        return max((need[name] for name in self.outputs), default=0)
+
+    def new_state(self) -> PlanState:
+        return PlanState(self.depths)
+
+    def update(self, state: PlanState, columns: Mapping[str, np.ndarray],
+               ok: np.ndarray) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Advance every series by one bar.
+
+        Args:
+            state: From new_state(); holds the series history
+            columns: Raw field arrays (N,) for this bar (only fields the plan reads are required)
+            ok: (N,) bool, True where the bar's status is 'ok'
+
+        Returns:
+            {output name: (values, valid)} with NaN values where invalid
+        """
+        ok = np.asarray(ok, dtype=bool)
+        for field in RAW_FIELDS:
+            if field in columns:
+                state.push(field, np.asarray(columns[field], dtype=np.float64), ok)
+        state.bars += 1
+        for node in self.nodes:
+            lookback = node.lookback
+            if state.bars < lookback:
+                valid = np.zeros(ok.shape, dtype=bool)
+            else:
+                valid = ok
+                for dep in node.inputs:
+                    for flags in state.valid[dep][-lookback:]:
+                        valid = valid & flags
+            if node.window == 1:
+                args = [state.values[dep][-1] for dep in node.inputs]
+            elif state.bars >= node.window:
+                args = [np.stack(state.values[dep][-node.window:]) for dep in node.inputs]
+            else:
+                args = None
+            if args is None or not valid.any():
+                values = np.full(ok.shape, np.nan)
+            else:
+                with np.errstate(invalid='ignore'):
+                    values = np.asarray(node.func(*args), dtype=np.float64)
+                self.evaluations[node.name] += 1
+            state.push(node.name, values, valid)
+        return {
+            name: (np.where(state.valid[name][-1], state.values[name][-1], np.nan), state.valid[name][-1])
+            for name in self.outputs
+        }
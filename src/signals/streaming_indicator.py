@@ -0,0 +1,138 @@
+"""
+Streaming versions of the signals.indicator classes.
+
+Each indicator keeps a fixed-size ring buffer of the per-interval term it
+averages plus the intervals' validity, so ``update(new_interval)`` is O(1)
+and memory per instrument does not grow with history. Values and statuses
+match the list-based classes fed the full history after each update.
+"""
+
+from datetime import datetime
+from typing import Dict, Optional, Type
+
+from signals.indicator import Indicator, PL, OneOneHigh, OneOneLow, OneOneDot, EBot, ETop
+from state.instrument_interval import InstrumentInterval
+
+
+class StreamingIndicator:
+    """
+    Base class. Subclasses set LOOKBACK (latest intervals that must all be
+    'ok'), TERMS (latest per-interval terms averaged into the value) and
+    implement _term.
+    """
+    __slots__ = ('status', 'update_at', 'value', '_terms', '_ok', '_pos', '_count', '_bad')
+    LOOKBACK = 1
+    TERMS = 1
+
+    def __init__(self):
+        self.status: Optional[str] = None
+        self.update_at: Optional[datetime] = None
+        self.value: Optional[float] = None
+        self._terms = [0.0] * self.LOOKBACK
+        self._ok = [False] * self.LOOKBACK
+        self._pos = 0    # slot the next interval is written to
+        self._count = 0  # intervals seen, capped at LOOKBACK
+        self._bad = 0    # non-'ok' intervals currently in the ring
+
+    @staticmethod
+    def _term(interval: InstrumentInterval) -> float:
+        raise NotImplementedError
+
+    def update(self, interval: InstrumentInterval) -> None:
+        """Add the newest interval of this instrument."""
+        self.update_at = datetime.now()
+        size = self.LOOKBACK
+        pos = self._pos
+        if self._count == size:
+            if not self._ok[pos]:
+                self._bad -= 1
+        else:
+            self._count += 1
+        ok = interval.status == 'ok'
+        self._ok[pos] = ok
+        if ok:
+            self._terms[pos] = self._term(interval)
+        else:
+            self._bad += 1
+        self._pos = (pos + 1) % size
+        if self._count < size or self._bad:
+            self.status = 'invalid'
+            self.value = None
+            return
+        terms = self._terms
+        if self.TERMS == 1:
+            self.value = terms[pos]
+        else:
+            # Oldest first, as sum() over the latest intervals in the list-based classes
+            total = 0
+            for k in range(self.TERMS, 0, -1):
+                total += terms[(pos + 1 - k) % size]
+            self.value = total / self.TERMS
+        self.status = 'ok'
+
+    def reset(self) -> None:
+        StreamingIndicator.__init__(self)
+
+    def get_value(self) -> Optional[float]:
+        return self.value
+
+
+def _dot(i: InstrumentInterval) -> float:
+    return (i.high + i.low + i.close) / 3.0
+
+
+class StreamingPL(StreamingIndicator):
+    """Average OneOneDot of the last three intervals (see PL)."""
+    __slots__ = ()
+    LOOKBACK = 3
+    TERMS = 3
+    _term = staticmethod(_dot)
+
+
+class StreamingOneOneDot(StreamingIndicator):
+    """(high + low + close) / 3 of the latest interval (see OneOneDot)."""
+    __slots__ = ()
+    _term = staticmethod(_dot)
+
+
+class StreamingOneOneHigh(StreamingIndicator):
+    """2 * OneOneDot - low of the latest interval (see OneOneHigh)."""
+    __slots__ = ()
+
+    @staticmethod
+    def _term(i: InstrumentInterval) -> float:
+        return 2 * ((i.high + i.low + i.close) / 3.0) - i.low
+
+
+class StreamingOneOneLow(StreamingIndicator):
+    """2 * OneOneDot - high of the latest interval (see OneOneLow)."""
+    __slots__ = ()
+
+    @staticmethod
+    def _term(i: InstrumentInterval) -> float:
+        return 2 * ((i.high + i.low + i.close) / 3.0) - i.high
+
+
+class StreamingEBot(StreamingOneOneLow):
+    """Average OneOneLow of the last three intervals; the one before them must be valid too (see EBot)."""
+    __slots__ = ()
+    LOOKBACK = 4
+    TERMS = 3
+
+
+class StreamingETop(StreamingOneOneHigh):
+    """Average OneOneHigh of the last three intervals; the one before them must be valid too (see ETop)."""
+    __slots__ = ()
+    LOOKBACK = 4
+    TERMS = 3
+
+
+# List-based indicator class -> streaming counterpart
+STREAMING_INDICATORS: Dict[Type[Indicator], Type[StreamingIndicator]] = {
+    PL: StreamingPL,
+    OneOneHigh: StreamingOneOneHigh,
+    OneOneLow: StreamingOneOneLow,
+    OneOneDot: StreamingOneOneDot,
+    EBot: StreamingEBot,
+    ETop: StreamingETop,
+}
@@ -0,0 +1,205 @@
+"""
+BarRollup - incremental multi-duration OHLCV aggregation.
+
+UniverseStateBuilder used to query market data once per target duration for
+every base interval. BarRollup instead consumes each base-duration bar once
+and folds it into a running bucket per target duration (columnar over
+instruments), so each base bar costs O(durations) array updates and no extra
+data reads. A bucket is emitted as a UniverseInterval as soon as the base bar
+reaches its end, when a later bar falls into a new bucket, or when the day /
+run is closed explicitly.
+
+Bucket boundaries:
+    - intraday durations are anchored on the first base bar of each day
+      (the session open), e.g. 60m buckets 09:30-10:30, 10:30-11:30, ...
+    - 1d, 1w (Monday), 1m, 1q and 1y buckets follow calendar boundaries.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from dateutil.relativedelta import relativedelta
+
+from calendars.time_duration import DurationType, TimeDuration
+from state.instrument_interval import InstrumentInterval
+from state.universe_interval import UniverseInterval
+
+
+class _Bucket:
+    """Running OHLCV/traded-dollar aggregate for one bucket, columnar over instruments."""
+
+    def __init__(self, start: datetime, end: datetime):
+        self.start = start
+        self.end = end
+        self.ids: List[int] = []
+        self._pos: Dict[int, int] = {}
+        self._ids_key: Optional[Tuple[int, ...]] = None
+        self._idx: Optional[np.ndarray] = None
+        self.open = np.empty(0)
+        self.high = np.empty(0)
+        self.low = np.empty(0)
+        self.close = np.empty(0)
+        self.volume = np.empty(0)
+        self.dollar = np.empty(0)
+        self.has = np.empty(0, dtype=bool)
+
+    def _positions(self, instrument_ids: Sequence[int]) -> np.ndarray:
+        key = tuple(instrument_ids)
+        if key == self._ids_key:
+            return self._idx
+        new = [iid for iid in dict.fromkeys(key) if iid not in self._pos]
+        if new:
+            for iid in new:
+                self._pos[iid] = len(self.ids)
+                self.ids.append(iid)
+            grow = len(new)
+            self.open = np.concatenate([self.open, np.full(grow, np.nan)])
+            self.high = np.concatenate([self.high, np.full(grow, -np.inf)])
+            self.low = np.concatenate([self.low, np.full(grow, np.inf)])
+            self.close = np.concatenate([self.close, np.full(grow, np.nan)])
+            self.volume = np.concatenate([self.volume, np.zeros(grow)])
+            self.dollar = np.concatenate([self.dollar, np.zeros(grow)])
+            self.has = np.concatenate([self.has, np.zeros(grow, dtype=bool)])
+        self._ids_key = key
+        self._idx = np.fromiter((self._pos[iid] for iid in key), dtype=np.int64, count=len(key))
+        return self._idx
+
+    def add(self, instrument_ids: Sequence[int], columns: Dict[str, np.ndarray]) -> None:
+        idx = self._positions(instrument_ids)
+        close = np.asarray(columns['close'], dtype=np.float64)
+        present = ~np.isnan(close)
+        if not present.all():
+            idx, close = idx[present], close[present]
+            columns = {f: np.asarray(columns[f], dtype=np.float64)[present] for f in ('open', 'high', 'low', 'volume')}
+        volume = np.nan_to_num(np.asarray(columns['volume'], dtype=np.float64))
+        first = ~self.has[idx]
+        self.open[idx[first]] = np.asarray(columns['open'], dtype=np.float64)[first]
+        self.high[idx] = np.fmax(self.high[idx], columns['high'])
+        self.low[idx] = np.fmin(self.low[idx], columns['low'])
+        self.close[idx] = close
+        self.volume[idx] += volume
+        self.dollar[idx] += close * volume
+        self.has[idx] = True
+
+    def to_interval(self) -> UniverseInterval:
+        instrument_intervals = {}
+        for i in np.flatnonzero(self.has):
+            iid = self.ids[i]
+            instrument_intervals[iid] = InstrumentInterval(
+                instrument_id=iid,
+                start_date_time=self.start,
+                end_date_time=self.end,
+                open=float(self.open[i]),
+                high=float(self.high[i]),
+                low=float(self.low[i]),
+                close=float(self.close[i]),
+                traded_volume=float(self.volume[i]),
+                traded_dollar=float(self.dollar[i]),
+                status='ok'
+            )
+        return UniverseInterval(start_date_time=self.start, end_date_time=self.end, instrument_intervals=instrument_intervals)
+
+
+class BarRollup:
+    """
+    Roll base-duration bars up into every target duration.
+
+    Usage:
+        rollup = BarRollup(env.get_base_duration(), env.get_target_durations())
+        completed = rollup.update(start_time, instrument_ids, columns)  # per base bar
+        completed = rollup.close_day()   # at end of day
+        completed = rollup.flush()       # at end of run
+    Each call returns {duration_string: UniverseInterval} for completed buckets.
+    """
+
+    def __init__(self, base_duration: TimeDuration, target_durations: Sequence[TimeDuration]):
+        """
+        Raises:
+            ValueError: If a target duration is shorter than, or not a multiple of, the base duration
+        """
+        self.base_duration = base_duration
+        self.durations: List[TimeDuration] = list(dict.fromkeys(target_durations))
+        base_minutes = base_duration.get_duration_minutes()
+        for duration in self.durations:
+            minutes = duration.get_duration_minutes()
+            if minutes is None:
+                continue
+            if base_minutes is None or minutes % base_minutes:
+                raise ValueError(f"{duration} cannot be built from base duration {base_duration}")
+        self._buckets: Dict[str, _Bucket] = {}
+        self._day = None
+        self._anchor: Optional[datetime] = None
+
+    def bucket_bounds(self, duration: TimeDuration, t: datetime) -> Tuple[datetime, datetime]:
+        """[start, end) of the bucket of ``duration`` containing bar start ``t``."""
+        minutes = duration.get_duration_minutes()
+        if minutes is not None:
+            anchor = self._anchor if self._anchor is not None and self._anchor.date() == t.date() else t
+            step = timedelta(minutes=minutes)
+            start = anchor + ((t - anchor) // step) * step
+            return start, start + step
+        day = datetime(t.year, t.month, t.day)
+        kind = duration.duration_type
+        if kind == DurationType.DAILY:
+            return day, day + timedelta(days=1)
+        if kind == DurationType.WEEKLY:
+            start = day - timedelta(days=day.weekday())
+            return start, start + timedelta(weeks=1)
+        if kind == DurationType.MONTHLY:
+            start = day.replace(day=1)
+            return start, start + relativedelta(months=1)
+        if kind == DurationType.QUARTERLY:
+            start = day.replace(month=3 * ((day.month - 1) // 3) + 1, day=1)
+            return start, start + relativedelta(months=3)
+        if kind == DurationType.YEARLY:
+            start = day.replace(month=1, day=1)
+            return start, start + relativedelta(years=1)
+        raise ValueError(f"Unsupported duration type: {kind}")
+
+    def update(self, start_time: datetime, instrument_ids: Sequence[int],
+               columns: Dict[str, np.ndarray]) -> Dict[str, UniverseInterval]:
+        """
+        Fold one base bar into every duration.
+
+        Args:
+            start_time: Start of the base bar
+            instrument_ids: Instruments the column arrays are aligned with
+            columns: 'open', 'high', 'low', 'close', 'volume' arrays; NaN close = no bar
+
+        Returns:
+            Completed buckets keyed by duration string
+        """
+        if self._day != start_time.date():
+            self._day = start_time.date()
+            self._anchor = start_time
+        bar_end = self.base_duration.get_end_time(start_time)
+        completed = {}
+        for duration in self.durations:
+            key = duration.get_duration_string()
+            bucket = self._buckets.get(key)
+            if bucket is not None and not bucket.start <= start_time < bucket.end:
+                completed[key] = self._buckets.pop(key).to_interval()
+                bucket = None
+            if bucket is None:
+                bucket = self._buckets[key] = _Bucket(*self.bucket_bounds(duration, start_time))
+            bucket.add(instrument_ids, columns)
+            if bar_end >= bucket.end:
+                completed[key] = self._buckets.pop(key).to_interval()
+        return completed
+
+    def close_day(self) -> Dict[str, UniverseInterval]:
+        """Emit intraday and daily buckets; no more bars arrive for the current day."""
+        return self._emit(lambda d: d.is_intraday() or d.duration_type == DurationType.DAILY)
+
+    def flush(self) -> Dict[str, UniverseInterval]:
+        """Emit every open bucket, e.g. at the end of a run."""
+        return self._emit(lambda d: True)
+
+    def _emit(self, predicate) -> Dict[str, UniverseInterval]:
+        completed = {}
+        for duration in self.durations:
+            key = duration.get_duration_string()
+            if key in self._buckets and predicate(duration):
+                completed[key] = self._buckets.pop(key).to_interval()
+        return completed
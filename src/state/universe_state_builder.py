@@ -19,6 +19,8 @@ from calendars.time_duration import TimeDuration
 from state.instrument_interval import InstrumentInterval
 from state.universe_interval import UniverseInterval
 from app.runner import RunnerCallback
+from market_data.market_data_manager import MarketDataManager, ohlc_columns_from_batch
+from state.bar_rollup import BarRollup
 
 class UniverseStateBuilder(RunnerCallback):
     def handleStartOfDay(self, runner, current_time):
@@ -27,7 +29,16 @@ class UniverseStateBuilder(RunnerCallback):
 
     def handleEndOfDay(self, runner, current_time):
         self.logger.info(f"UniverseStateBuilder.handleEndOfDay called at {current_time}")
-        pass
+        if self.rollup is not None:
+            self._add_completed(runner, self.rollup.close_day(), current_time)
+
+    def handleEnd(self, runner, current_time):
+        if self.rollup is not None:
+            self._add_completed(runner, self.rollup.flush(), current_time)
+
+    def _add_completed(self, runner, intervals: dict, current_time):
+        if intervals:
+            runner.universe_state_manager.addIntervals(intervals, current_time)
 
     def handleInterval(self, runner, current_time):
         """
@@ -76,6 +87,7 @@ class UniverseStateBuilder(RunnerCallback):
         """
         self.env = env or get_environment()
         self.logger = logging.getLogger(__name__)
+        self.rollup: Optional[BarRollup] = None
 
 
     async def build_universe_state(self, as_of_date):
@@ -143,37 +155,21 @@ class UniverseStateBuilder(RunnerCallback):
 
     def build_multi_duration_intervals(self, start_time: 'datetime', runner: 'Runner') -> dict:
         """
-        Build intervals for all target durations for the current universe at start_time.
-        Returns a dict mapping duration string to UniverseInterval.
+        Read the base-duration bar starting at start_time once and roll it up into
+        every target duration (see BarRollup).
+        Returns a dict mapping duration string to UniverseInterval for the buckets
+        completed by this bar; longer buckets are emitted when they close.
         """
-        intervals = {}
-        self.logger.info(f"Building intervals for {len(self.env.get_target_durations())} durations at {start_time}")
-        for duration in self.env.get_target_durations():
-            end_time = duration.get_end_time(start_time)
-            instrument_intervals = {}
-            instrument_ids = runner.universe_manager.instrument_ids
-            ohlc_batch = runner.market_data_manager.get_ohlc_batch(instrument_ids, start_time, end_time)
-            self.logger.info(f"Built ohlc_batch for {ohlc_batch} instruments at {start_time}, instrument_ids: {instrument_ids}")
-            for inst_id in instrument_ids:
-                ohlc = ohlc_batch.get(inst_id)
-                if ohlc:
-                    instrument_intervals[inst_id] = InstrumentInterval(
-                        instrument_id=inst_id,
-                        start_date_time=start_time,
-                        end_date_time=end_time,
-                        open=ohlc.get('open', 0.0),
-                        high=ohlc.get('high', 0.0),
-                        low=ohlc.get('low', 0.0),
-                        close=ohlc.get('close', 0.0),
-                        traded_volume=ohlc.get('volume', 0.0),
-                        traded_dollar=ohlc.get('close', 0.0) * ohlc.get('volume', 0.0),
-                        status='ok'
-                    )
-            self.logger.info('Built interval for %s at %s, instrument_ids: %s', duration.get_duration_string(), start_time, instrument_ids)
-            intervals[duration.get_duration_string()] = UniverseInterval(
-                start_date_time=start_time,
-                end_date_time=end_time,
-                instrument_intervals=instrument_intervals
-            )
+        if self.rollup is None:
+            self.rollup = BarRollup(self.env.get_base_duration(), self.env.get_target_durations())
+        base_duration = self.rollup.base_duration
+        end_time = base_duration.get_end_time(start_time)
+        instrument_ids = list(runner.universe_manager.instrument_ids)
+        mdm = runner.market_data_manager
+        if isinstance(mdm, MarketDataManager):
+            columns = mdm.get_ohlc_columns(instrument_ids, start_time, end_time)
+        else:
+            columns = ohlc_columns_from_batch(mdm.get_ohlc_batch(instrument_ids, start_time, end_time), instrument_ids)
+        intervals = self.rollup.update(start_time, instrument_ids, columns)
+        self.logger.info('Built intervals %s at %s, instrument_ids: %s', list(intervals), start_time, instrument_ids)
         return intervals
-
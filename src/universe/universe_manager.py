@@ -1,8 +1,8 @@
-import asyncpg
 from calendars.time_duration import TimeDuration
 from typing import Optional, Dict, Any, List
 from datetime import date
 from config.environment import get_environment, Environment
+from db.pool_registry import acquire
 from .universe_db import UniverseDB
 from dataclasses import dataclass
 from typing import Dict, Any
@@ -36,13 +36,9 @@ class UniverseManager:
         if not membership_changes:
             return
         self.logger.info(f"Applying {len(membership_changes)} membership changes")
-        pool = await asyncpg.create_pool(self.env.get_database_url())
-        try:
-            async with pool.acquire() as conn:
-                for change in membership_changes:
-                    await self._apply_single_membership_change(conn, change)
-        finally:
-            await pool.close()
+        async with acquire(self.env) as conn:
+            for change in membership_changes:
+                await self._apply_single_membership_change(conn, change)
 
     async def _apply_single_membership_change(self, conn, change: UniverseMembershipChange) -> None:
         table_name = self.env.get_table_name('universe_membership_changes')
@@ -0,0 +1,118 @@
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+
+from app.runner import Runner, RunnerCallback, run_dependency_graph
+from config.environment import Environment, EnvironmentType
+
+
+DELAY = 0.05
+
+
+def make_runner(callbacks=()):
+    class TestRunner(Runner):
+        def _init_callbacks(self):
+            return list(callbacks)
+    return TestRunner("2025-07-01", "2025-07-01", Environment(EnvironmentType.TEST), 1)
+
+
+class SlowManager:
+    def __init__(self, name, log):
+        self.name, self.log = name, log
+    async def update_for_sod(self, runner, current_time):
+        self.log.append(('start', self.name))
+        await asyncio.sleep(DELAY)
+        self.log.append(('end', self.name))
+    update_for_eod = update_for_sod
+
+
+@pytest.mark.asyncio
+async def test_sod_loads_run_concurrently_and_respect_dependencies():
+    log = []
+    runner = make_runner()
+    for attr in ('universe_manager', 'security_master', 'market_data_manager', 'universe_state_manager'):
+        setattr(runner, attr, SlowManager(attr, log))
+    t0 = time.perf_counter()
+    await runner.update_for_sod(datetime(2025, 7, 1, 9, 30))
+    elapsed = time.perf_counter() - t0
+    # Three independent loads overlap, the state manager follows them
+    assert elapsed < 3 * DELAY
+    assert [e for e in log[:3]] == [('start', 'universe_manager'), ('start', 'security_master'), ('start', 'market_data_manager')]
+    assert log[-2:] == [('start', 'universe_state_manager'), ('end', 'universe_state_manager')]
+
+    log.clear()
+    await runner.update_for_eod(datetime(2025, 7, 1, 16, 0))
+    assert log[:2] == [('start', 'universe_state_manager'), ('end', 'universe_state_manager')]
+
+
+class AsyncCallback(RunnerCallback):
+    def __init__(self, name, log, depends_on=()):
+        self.name, self.log, self.depends_on = name, log, depends_on
+    async def handleInterval(self, runner, current_time):
+        self.log.append(('start', self.name))
+        await asyncio.sleep(DELAY)
+        self.log.append(('end', self.name))
+
+
+class SyncCallback(RunnerCallback):
+    def __init__(self, log):
+        self.log = log
+    def handleInterval(self, runner, current_time):
+        self.log.append(('sync', type(self).__name__))
+
+
+@pytest.mark.asyncio
+async def test_dispatch_runs_independent_callbacks_together():
+    log = []
+    runner = make_runner([
+        AsyncCallback('signals', log, depends_on=('bars',)),
+        AsyncCallback('bars', log),
+        AsyncCallback('news', log),
+        SyncCallback(log),
+    ])
+    t0 = time.perf_counter()
+    await runner.dispatch('handleInterval', datetime(2025, 7, 1, 9, 30))
+    elapsed = time.perf_counter() - t0
+    assert elapsed < 3 * DELAY
+    assert log.index(('end', 'bars')) < log.index(('start', 'signals'))
+    assert ('sync', 'SyncCallback') in log
+    assert log.index(('start', 'news')) < log.index(('end', 'bars'))
+
+
+@pytest.mark.asyncio
+async def test_run_dependency_graph_rejects_cycles():
+    with pytest.raises(ValueError):
+        await run_dependency_graph({'a': lambda: None, 'b': lambda: None}, {'a': ('b',), 'b': ('a',)})
+
+
+class CountingCallback(RunnerCallback):
+    def __init__(self, value, log):
+        self.value, self.log = value, log
+    def handleInterval(self, runner, current_time):
+        self.log.append(self.value)
+
+
+class AfterCounting(RunnerCallback):
+    depends_on = ('CountingCallback',)
+    def __init__(self, log):
+        self.log = log
+    async def handleInterval(self, runner, current_time):
+        self.log.append('after')
+
+
+@pytest.mark.asyncio
+async def test_dispatch_runs_every_instance_of_a_class():
+    log = []
+    runner = make_runner([AfterCounting(log), CountingCallback(1, log), CountingCallback(2, log)])
+    await runner.dispatch('handleInterval', datetime(2025, 7, 1, 9, 30))
+    assert sorted(log[:2]) == [1, 2]
+    assert log[2] == 'after'
+
+
+@pytest.mark.asyncio
+async def test_dispatch_rejects_duplicate_declared_names():
+    runner = make_runner([AsyncCallback('bars', []), AsyncCallback('bars', [])])
+    with pytest.raises(ValueError, match='bars'):
+        await runner.dispatch('handleInterval', datetime(2025, 7, 1, 9, 30))
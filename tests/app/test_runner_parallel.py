@@ -0,0 +1,126 @@
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from app.runner import Runner, RunnerCallback
+from config.environment import Environment, EnvironmentType
+from state.universe_state_manager import UniverseStateManager
+
+
+class DailyDuration:
+    def is_daily_or_longer(self): return True
+    def get_duration_minutes(self): return None
+    duration_type = type('dt', (), {'name': 'DAILY'})
+
+
+class RollingCountCallback(RunnerCallback):
+    """Saves how many of the last 3 sessions it has seen, so output depends on warm-up."""
+    def __init__(self):
+        self.window = deque(maxlen=3)
+    def handleInterval(self, runner, current_time):
+        self.window.append(current_time.date())
+        df = pd.DataFrame([{'date': current_time.date().isoformat(), 'seen': len(self.window)}])
+        runner.universe_state_manager.save_universe_state(df, current_time.strftime('%Y%m%d_%H%M%S'))
+
+
+class OfflineRunner(Runner):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.duration = DailyDuration()
+    def _init_callbacks(self):
+        return [RollingCountCallback()]
+    async def update_for_sod(self, current_time):
+        pass
+    async def update_for_eod(self, current_time):
+        pass
+
+
+def states(manager):
+    return [
+        tuple(manager.load_universe_state(ts).iloc[0])
+        for ts in sorted(manager.list_available_states())
+    ]
+
+
+def test_plan_chunks_bounds_warmup_by_run_start():
+    runner = OfflineRunner("2025-07-01", "2025-07-10", Environment(EnvironmentType.TEST), 1)
+    # Sessions: 07-01, 02, 03, 07, 08, 09, 10 (07-04 holiday, weekend)
+    plan = runner.plan_chunks(3, 2)
+    assert plan == [
+        (date(2025, 7, 1), date(2025, 7, 1), date(2025, 7, 3)),
+        (date(2025, 7, 2), date(2025, 7, 7), date(2025, 7, 8)),
+        (date(2025, 7, 7), date(2025, 7, 9), date(2025, 7, 10)),
+    ]
+
+
+def test_run_parallel_matches_sequential(tmp_path):
+    env = Environment(EnvironmentType.TEST)
+    sequential = OfflineRunner("2025-07-01", "2025-07-10", env, 1)
+    sequential.universe_state_manager = UniverseStateManager(env, base_path=str(tmp_path / "seq"))
+    asyncio.run(sequential.run())
+
+    parallel = OfflineRunner("2025-07-01", "2025-07-10", env, 1)
+    parallel.universe_state_manager = UniverseStateManager(env, base_path=str(tmp_path / "par"))
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        merged = asyncio.run(parallel.run_parallel(workers=3, warmup_days=2, executor=executor))
+
+    assert merged == sorted(merged) and len(merged) == 7
+    assert states(parallel.universe_state_manager) == states(sequential.universe_state_manager)
+    assert not (tmp_path / "par" / "chunks").exists()
+
+
+class FixedUniverse:
+    instrument_ids = [1, 2]
+
+
+class DailyBars:
+    """Deterministic daily bars that differ per date and instrument."""
+    def get_ohlc_batch(self, instrument_ids, start, end):
+        base = start.toordinal() % 97
+        return {
+            iid: {'open': base + iid, 'high': base + iid + 2, 'low': base + iid - 1, 'close': base + iid + 1, 'volume': 100 * iid}
+            for iid in instrument_ids
+        }
+
+
+class RollupRunner(Runner):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.universe_manager = FixedUniverse()
+        self.market_data_manager = DailyBars()
+    def _init_callbacks(self):
+        from state.universe_state_builder import UniverseStateBuilder
+        return [UniverseStateBuilder(self.env)]
+    async def update_for_sod(self, current_time):
+        pass
+    async def update_for_eod(self, current_time):
+        pass
+
+
+def all_states(manager):
+    return {ts: manager.load_universe_state(ts).to_dict('records') for ts in manager.list_available_states()}
+
+
+def test_run_parallel_multi_duration_matches_sequential(tmp_path):
+    env = Environment(EnvironmentType.TEST)
+    if not env.config.has_section('universe'):
+        env.config.add_section('universe')
+    env.config.set('universe', 'base_duration', '1d')
+    env.config.set('universe', 'target_durations', '1d,1w,1m')
+
+    sequential = RollupRunner("2025-07-01", "2025-07-31", env, 1)
+    sequential.universe_state_manager = UniverseStateManager(env, base_path=str(tmp_path / "seq"))
+    asyncio.run(sequential.run())
+
+    parallel = RollupRunner("2025-07-01", "2025-07-31", env, 1)
+    parallel.universe_state_manager = UniverseStateManager(env, base_path=str(tmp_path / "par"))
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        asyncio.run(parallel.run_parallel(workers=3, warmup_days=25, executor=executor))
+
+    expected = all_states(sequential.universe_state_manager)
+    assert any(row['duration'] == '1m' for rows in expected.values() for row in rows)
+    assert all_states(parallel.universe_state_manager) == expected
@@ -1,6 +1,6 @@
 import pytest
 import pandas as pd
-from datetime import date
+from datetime import date, datetime
 from app.runner import Runner
 from config.environment import get_environment
 from universe.universe_manager import UniverseManager
@@ -217,6 +217,8 @@ def test_runner_event_iterator(monkeypatch):
         def get_duration_minutes(self): return None
         duration_type = type('dt', (), {'name': 'DAILY'})
     runner.duration = DummyDuration()
+    # Legacy calendar-day schedule
+    runner.exchange_calendar = None
     events = list(runner.iter_events())
     # For 3 days, expect 3 interval events and 3 EOD events
     interval_events = [e for e in events if e[1] == 'interval']
@@ -230,3 +232,28 @@ def test_runner_event_iterator(monkeypatch):
     expected_dates = pd.date_range(start_date, end_date)
     assert [e[0].date() for e in interval_events] == list(expected_dates.date), "Interval event dates mismatch"
     assert [e[0].date() for e in eod_events] == list(expected_dates.date), "EOD event dates mismatch"
+
+
+def test_runner_event_iterator_uses_exchange_sessions(monkeypatch):
+    """
+    With an exchange calendar, events only cover sessions: no weekend/holiday
+    days, intervals between open and close, and EOD at the (early) close.
+    """
+    env = Environment(EnvironmentType.TEST)
+    monkeypatch.setattr(env, 'get', lambda section, key, default=None: [] if (section, key) == ('runner', 'callbacks') else env.__class__.get(env, section, key, default))
+    # 2025-07-03 closes early, 2025-07-04 is a holiday, 07-05/06 are a weekend
+    runner = Runner("2025-07-03", "2025-07-07", env, UNIVERSE_ID)
+    assert runner.exchange_calendar is not None
+    events = list(runner.iter_events())
+    assert events[0] == (datetime(2025, 7, 3), 'start')
+    assert events[-1] == (datetime(2025, 7, 7, 23, 59, 59), 'end')
+    sods = [t for t, typ in events if typ == 'sod']
+    eods = [t for t, typ in events if typ == 'eod']
+    assert sods == [datetime(2025, 7, 3, 9, 30), datetime(2025, 7, 7, 9, 30)]
+    assert eods == [datetime(2025, 7, 3, 13, 0), datetime(2025, 7, 7, 16, 0)]
+    intervals = [t for t, typ in events if typ == 'interval']
+    minutes = runner.duration.get_duration_minutes()
+    per_day = {d: sum(1 for t in intervals if t.date() == d) for d in (date(2025, 7, 3), date(2025, 7, 7))}
+    assert per_day[date(2025, 7, 3)] == -(-210 // minutes)
+    assert per_day[date(2025, 7, 7)] == -(-390 // minutes)
+    assert all(sod <= t < eod for t in intervals for sod, eod in zip(sods, eods) if t.date() == sod.date())
@@ -76,3 +76,13 @@ def test_exchange_calendar_error_handling(monkeypatch):
             _ExchangeCalendar("NYSE")
     finally:
         monkeypatch.setattr(builtins, "__import__", real_import)
+
+def test_exchange_calendar_sessions():
+    cal = ExchangeCalendar("NYSE")
+    sessions = cal.sessions(datetime.date(2025, 7, 3), datetime.date(2025, 7, 7))
+    # Holiday and weekend are skipped; early close and normal close in local time
+    assert sessions == [
+        (datetime.date(2025, 7, 3), datetime.datetime(2025, 7, 3, 9, 30), datetime.datetime(2025, 7, 3, 13, 0)),
+        (datetime.date(2025, 7, 7), datetime.datetime(2025, 7, 7, 9, 30), datetime.datetime(2025, 7, 7, 16, 0)),
+    ]
+    assert cal.sessions(datetime.date(2025, 7, 5), datetime.date(2025, 7, 6)) == []
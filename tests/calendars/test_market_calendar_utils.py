@@ -2,7 +2,7 @@
 import unittest
 import pandas as pd
 from unittest.mock import MagicMock
-from calendars.market_calendar_utils import get_market_calendar, get_last_open_close, get_next_open_close
+from calendars.market_calendar_utils import get_market_calendar, get_last_open_close, get_next_open_close, SessionScheduleCache
 
 def make_mock_calendar():
     # Create a mock calendar with a known schedule including weekends and holidays
@@ -109,5 +109,29 @@ class TestMarketCalendarUtils(unittest.TestCase):
         self.assertEqual(next_open, pd.Timestamp('2025-12-29 08:00'))
         self.assertEqual(next_close, pd.Timestamp('2025-12-29 16:30'))
 
+    def test_session_cache_matches_schedule_slicing(self):
+        cache = SessionScheduleCache(self.cal)
+        for dt in pd.date_range('2025-07-17', '2025-12-31', freq='7h'):
+            self.assertEqual(cache.last_open_close(dt), get_last_open_close(self.cal, dt))
+            self.assertEqual(cache.next_open_close(dt), get_next_open_close(self.cal, dt))
+        self.assertEqual(cache.next_open_close(pd.Timestamp('2026-01-05')), (None, None))
+
+    def test_session_cache_refreshes_past_horizon(self):
+        lse = get_market_calendar('LSE')
+        calls = []
+        cal = MagicMock()
+        cal.schedule = lambda start_date, end_date: calls.append(start_date) or lse.schedule(start_date, end_date)
+        cache = SessionScheduleCache(cal, horizon_days=30)
+        last_open, last_close = cache.last_open_close(pd.Timestamp('2025-07-19 12:00'))  # Saturday
+        # Real LSE sessions are in UTC (BST in July)
+        self.assertEqual(last_open, pd.Timestamp('2025-07-18 07:00', tz='UTC'))
+        self.assertEqual(last_close, pd.Timestamp('2025-07-18 15:30', tz='UTC'))
+        self.assertEqual(cache.next_open_close(pd.Timestamp('2025-07-20'))[0], pd.Timestamp('2025-07-21 07:00', tz='UTC'))
+        self.assertEqual(len(calls), 1)
+        # Christmas 2025 is beyond the 30-day horizon, so the sessions are refetched once
+        self.assertEqual(cache.last_open_close(pd.Timestamp('2025-12-26 10:00'))[1], pd.Timestamp('2025-12-24 12:30', tz='UTC'))
+        self.assertEqual(cache.next_open_close(pd.Timestamp('2025-12-26 10:00'))[0], pd.Timestamp('2025-12-29 08:00', tz='UTC'))
+        self.assertEqual(len(calls), 2)
+
 if __name__ == '__main__':
     unittest.main()
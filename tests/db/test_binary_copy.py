@@ -0,0 +1,87 @@
+import struct
+import pytest
+from datetime import date
+from unittest.mock import AsyncMock
+
+import numpy as np
+
+from config.environment import Environment, EnvironmentType
+from db.binary_copy import decode_binary_copy, PGCOPY_SIGNATURE
+from market_data.eod.daily_prices_dao import DailyPricesDAO, to_dense_matrix
+
+
+def encode(rows):
+    """Encode (date, instrument_id, close) rows as a PostgreSQL binary COPY payload."""
+    out = bytearray(PGCOPY_SIGNATURE + struct.pack('>ii', 0, 0))
+    for d, iid, close in rows:
+        out += struct.pack('>h', 3)
+        out += struct.pack('>ii', 4, (d - date(2000, 1, 1)).days)
+        out += struct.pack('>ii', 4, iid)
+        out += struct.pack('>id', 8, close)
+    out += struct.pack('>h', -1)
+    return bytes(out)
+
+
+FIELDS = [('date', 'date'), ('instrument_id', 'int4'), ('close', 'float8')]
+ROWS = [(date(2024, 1, 2), 7, 10.5), (date(2024, 1, 3), 7, float('nan')), (date(2024, 1, 2), 9, 20.0)]
+
+
+def test_decode_binary_copy():
+    cols = decode_binary_copy(encode(ROWS), FIELDS)
+    assert cols['date'].dtype == np.dtype('datetime64[D]')
+    assert list(cols['date'].astype(object)) == [date(2024, 1, 2), date(2024, 1, 3), date(2024, 1, 2)]
+    assert cols['instrument_id'].tolist() == [7, 7, 9]
+    assert cols['close'][0] == 10.5 and np.isnan(cols['close'][1])
+    empty = decode_binary_copy(encode([]), FIELDS)
+    assert len(empty['close']) == 0
+
+
+def test_decode_binary_copy_rejects_nulls():
+    payload = bytearray(PGCOPY_SIGNATURE + struct.pack('>ii', 0, 0))
+    payload += struct.pack('>h', 3) + struct.pack('>ii', 4, 0) + struct.pack('>ii', 4, 1) + struct.pack('>i', -1)
+    payload += struct.pack('>h', -1)
+    with pytest.raises(ValueError):
+        decode_binary_copy(bytes(payload), FIELDS)
+
+
+def test_to_dense_matrix():
+    cols = decode_binary_copy(encode(ROWS), FIELDS)
+    dates, ids, matrix = to_dense_matrix(cols, [9, 7, 8], 'close')
+    assert list(dates.astype(object)) == [date(2024, 1, 2), date(2024, 1, 3)]
+    assert ids.tolist() == [9, 7, 8]
+    assert matrix[0, 0] == 20.0 and matrix[0, 1] == 10.5
+    assert np.isnan(matrix[1, 0]) and np.isnan(matrix[1, 1]) and np.isnan(matrix[:, 2]).all()
+
+
+class CopyConn:
+    def __init__(self, payload):
+        self.payload = payload
+        self.calls = []
+    async def copy_from_query(self, query, *args, output, format):
+        self.calls.append((query, args, format))
+        output.write(self.payload)
+    async def __aenter__(self): return self
+    async def __aexit__(self, exc_type, exc, tb): pass
+
+
+class DummyPool:
+    def __init__(self, conn): self._conn = conn
+    def acquire(self): return self._conn
+    async def close(self): pass
+
+
+@pytest.mark.asyncio
+async def test_get_price_panel_and_matrix(monkeypatch):
+    conn = CopyConn(encode(ROWS))
+    monkeypatch.setattr('asyncpg.create_pool', AsyncMock(return_value=DummyPool(conn)))
+    dao = DailyPricesDAO(Environment(EnvironmentType.TEST))
+    panel = await dao.get_price_panel([7, 9], date(2024, 1, 1), date(2024, 1, 31), columns=('close',))
+    query, args, fmt = conn.calls[0]
+    assert fmt == 'binary'
+    assert "COALESCE(close::float8, 'NaN'::float8)" in query
+    assert args == ([7, 9], date(2024, 1, 1), date(2024, 1, 31))
+    assert panel['instrument_id'].tolist() == [7, 7, 9]
+    table = await dao.get_price_panel([7, 9], date(2024, 1, 1), date(2024, 1, 31), columns=('close',), as_arrow=True)
+    assert table.column_names == ['date', 'instrument_id', 'close']
+    dates, ids, matrix = await dao.get_price_matrix([7, 9], date(2024, 1, 1), date(2024, 1, 31))
+    assert matrix.shape == (2, 2)
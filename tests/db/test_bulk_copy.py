@@ -0,0 +1,110 @@
+import pytest
+from datetime import date
+from unittest.mock import AsyncMock
+
+import pandas as pd
+
+from config.environment import Environment, EnvironmentType
+from db.bulk_copy import to_records, copy_upsert
+from market_data.eod.daily_prices_tiingo_dao import DailyPricesTiingoDAO
+
+
+class DummyTransaction:
+    async def __aenter__(self): return self
+    async def __aexit__(self, exc_type, exc, tb): pass
+
+
+class DummyConn:
+    def __init__(self, unresolved=None, insert_result='INSERT 0 2'):
+        self.unresolved = unresolved or []
+        self.insert_result = insert_result
+        self.executed = []
+        self.copied = []
+    def transaction(self): return DummyTransaction()
+    async def execute(self, sql, *args):
+        self.executed.append((sql, args))
+        if sql.strip().startswith('INSERT'):
+            return self.insert_result
+        return 'OK'
+    async def copy_records_to_table(self, table_name, records, columns):
+        self.copied.append((table_name, records, columns))
+    async def fetch(self, sql, *args):
+        return [{'symbol': s} for s in self.unresolved]
+    async def __aenter__(self): return self
+    async def __aexit__(self, exc_type, exc, tb): pass
+
+
+class DummyPool:
+    def __init__(self, conn): self._conn = conn
+    def acquire(self): return self._conn
+    async def close(self): pass
+
+
+def test_to_records_from_dicts_and_dataframe():
+    rows = [{'date': date(2024, 1, 2), 'symbol': 'AAPL', 'close': 1.5}]
+    assert to_records(rows, ('date', 'symbol', 'instrument_id', 'close')) == [
+        (date(2024, 1, 2), 'AAPL', None, 1.5)
+    ]
+    df = pd.DataFrame({'symbol': ['AAPL', 'MSFT'], 'close': [1.5, float('nan')], 'volume': [10, 20]})
+    records = to_records(df, ('symbol', 'close', 'volume', 'instrument_id'))
+    assert records == [('AAPL', 1.5, 10, None), ('MSFT', None, 20, None)]
+    assert type(records[0][2]) is int
+
+
+@pytest.mark.asyncio
+async def test_copy_upsert_stages_resolves_and_merges():
+    conn = DummyConn()
+    records = [(date(2024, 1, 2), 'AAPL', None, 1.0), (date(2024, 1, 3), 'AAPL', None, 2.0)]
+    n = await copy_upsert(conn, 'test_daily_prices', ('date', 'symbol', 'instrument_id', 'close'), records,
+                          conflict_columns=('date', 'instrument_id'), xref_table='test_instrument_xrefs', vendor_id=3)
+    assert n == 2
+    assert conn.copied == [(
+        'test_daily_prices_staging',
+        [(*r, i) for i, r in enumerate(records)],
+        ['date', 'symbol', 'instrument_id', 'close', 'staging_seq'],
+    )]
+    sqls = [sql for sql, _ in conn.executed]
+    assert 'CREATE TEMP TABLE test_daily_prices_staging' in sqls[0]
+    assert 'test_instrument_xrefs' in sqls[1] and conn.executed[1][1] == (3,)
+    assert 'ON CONFLICT (date, instrument_id) DO UPDATE SET symbol = EXCLUDED.symbol, close = EXCLUDED.close' in sqls[2]
+
+
+@pytest.mark.asyncio
+async def test_copy_upsert_last_duplicate_key_wins():
+    conn = DummyConn(insert_result='INSERT 0 1')
+    records = [(date(2024, 1, 2), 1, 1.0), (date(2024, 1, 2), 1, 2.0), (date(2024, 1, 2), 1, 3.0)]
+    await copy_upsert(conn, 't', ('date', 'instrument_id', 'close'), records, conflict_columns=('date', 'instrument_id'))
+    _, staged, columns = conn.copied[0]
+    seq = columns.index('staging_seq')
+    insert_sql = conn.executed[-1][0]
+    assert 'ORDER BY date, instrument_id, staging_seq DESC' in insert_sql
+    # DISTINCT ON keeps the first row per key under that ordering
+    winner = sorted(staged, key=lambda r: (r[0], r[1], -r[seq]))[0]
+    assert winner[2] == 3.0
+
+
+@pytest.mark.asyncio
+async def test_copy_upsert_raises_for_unresolved_symbols():
+    conn = DummyConn(unresolved=['ZZZZ'])
+    with pytest.raises(ValueError, match='ZZZZ'):
+        await copy_upsert(conn, 't', ('date', 'symbol', 'instrument_id'), [(date(2024, 1, 2), 'ZZZZ', None)],
+                          conflict_columns=('date', 'instrument_id'), xref_table='x')
+    assert not any(sql.strip().startswith('INSERT') for sql, _ in conn.executed)
+
+
+@pytest.mark.asyncio
+async def test_tiingo_upsert_prices_uses_single_copy(monkeypatch):
+    env = Environment(EnvironmentType.TEST)
+    conn = DummyConn()
+    monkeypatch.setattr('asyncpg.create_pool', AsyncMock(return_value=DummyPool(conn)))
+    dao = DailyPricesTiingoDAO(env)
+    rows = [
+        {'date': date(2024, 1, 2), 'symbol': 'AAPL', 'close': 1.0, 'adjClose': 0.9},
+        {'date': date(2024, 1, 3), 'symbol': 'AAPL', 'close': 2.0, 'adjClose': 1.9},
+    ]
+    assert await dao.upsert_prices(rows) == 2
+    assert len(conn.copied) == 1
+    table_name, records, columns = conn.copied[0]
+    assert 'adjclose' in columns
+    assert records[0][columns.index('adjclose')] == 0.9
+    assert await dao.upsert_prices([]) == 0
@@ -0,0 +1,117 @@
+import pytest
+from datetime import date
+from unittest.mock import AsyncMock
+
+from config.environment import Environment, EnvironmentType
+from db import pool_registry
+from dao.universe_dao import UniverseDAO
+
+
+class DummyConn:
+    def __init__(self, fetchrow_result=None):
+        self._fetchrow_result = fetchrow_result
+    async def fetchrow(self, *args, **kwargs):
+        return self._fetchrow_result
+    async def __aenter__(self): return self
+    async def __aexit__(self, exc_type, exc, tb): pass
+
+
+class DummyPool:
+    def __init__(self, conn):
+        self._conn = conn
+        self.closed = False
+    def acquire(self): return self._conn
+    async def close(self): self.closed = True
+
+
+@pytest.fixture(autouse=True)
+async def clear_registry():
+    yield
+    await pool_registry.close_all_pools()
+
+
+@pytest.mark.asyncio
+async def test_acquire_without_shared_pool_creates_and_closes(monkeypatch):
+    env = Environment(EnvironmentType.TEST)
+    pool = DummyPool(DummyConn())
+    create_pool = AsyncMock(return_value=pool)
+    monkeypatch.setattr('asyncpg.create_pool', create_pool)
+    async with pool_registry.acquire(env) as conn:
+        assert conn is pool._conn
+    assert pool.closed
+    create_pool.assert_awaited_once_with(env.get_database_url())
+
+
+@pytest.mark.asyncio
+async def test_shared_pool_is_created_once_and_sized_from_config(monkeypatch):
+    env = Environment(EnvironmentType.TEST)
+    pool = DummyPool(DummyConn(fetchrow_result={'id': 1, 'name': 'TEST'}))
+    create_pool = AsyncMock(return_value=pool)
+    monkeypatch.setattr('asyncpg.create_pool', create_pool)
+    pool_registry.enable_shared_pool(env)
+    dao = UniverseDAO(env)
+    for _ in range(3):
+        assert await dao.get_universe_by_name('TEST') == {'id': 1, 'name': 'TEST'}
+    config = env.get_database_config()
+    create_pool.assert_awaited_once_with(
+        env.get_database_url(),
+        min_size=config['min_size'],
+        max_size=config['max_size'],
+        command_timeout=config['command_timeout'],
+    )
+    assert not pool.closed
+    await pool_registry.close_pool(env)
+    assert pool.closed
+    assert not pool_registry.is_shared_pool_enabled(env)
+
+
+@pytest.mark.asyncio
+async def test_get_pool_requires_enable():
+    env = Environment(EnvironmentType.TEST)
+    with pytest.raises(RuntimeError):
+        await pool_registry.get_pool(env)
+
+
+class DummyCursor:
+    def __init__(self, rows):
+        self._rows = list(rows)
+    async def fetch(self, n):
+        chunk, self._rows = self._rows[:n], self._rows[n:]
+        return chunk
+
+
+class DummyTransaction:
+    async def __aenter__(self): return self
+    async def __aexit__(self, exc_type, exc, tb): pass
+
+
+class CursorConn(DummyConn):
+    def __init__(self, rows):
+        super().__init__()
+        self.rows = rows
+        self.cursor_calls = []
+    def transaction(self): return DummyTransaction()
+    async def cursor(self, query, *args):
+        self.cursor_calls.append((query, args))
+        return DummyCursor(self.rows)
+
+
+@pytest.mark.asyncio
+async def test_iter_chunks_streams_fixed_size_chunks(monkeypatch):
+    env = Environment(EnvironmentType.TEST)
+    conn = CursorConn([{'n': i} for i in range(5)])
+    monkeypatch.setattr('asyncpg.create_pool', AsyncMock(return_value=DummyPool(conn)))
+    chunks = [chunk async for chunk in pool_registry.iter_chunks(env, "SELECT 1", chunk_size=2)]
+    assert [len(c) for c in chunks] == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_iter_table_chunks_pushes_filters_into_sql(monkeypatch):
+    env = Environment(EnvironmentType.TEST)
+    conn = CursorConn([{'date': date(2024, 1, 2)}])
+    monkeypatch.setattr('asyncpg.create_pool', AsyncMock(return_value=DummyPool(conn)))
+    chunks = [c async for c in pool_registry.iter_table_chunks(env, 't', symbol='AAPL', instrument_id=7, start_date=date(2024, 1, 1))]
+    assert chunks == [[{'date': date(2024, 1, 2)}]]
+    query, args = conn.cursor_calls[0]
+    assert query == "SELECT * FROM t WHERE instrument_id = $1 AND date >= $2 ORDER BY instrument_id, date"
+    assert args == (7, date(2024, 1, 1))
@@ -0,0 +1,50 @@
+import pytest
+from datetime import date
+from unittest.mock import AsyncMock
+
+from config.environment import Environment, EnvironmentType
+from market_data.eod.daily_prices_tiingo_dao import DailyPricesTiingoDAO
+
+
+class DummyTransaction:
+    async def __aenter__(self): return self
+    async def __aexit__(self, exc_type, exc, tb): pass
+
+
+class DummyCursor:
+    def __init__(self, rows):
+        self._rows = list(rows)
+    async def fetch(self, n):
+        chunk, self._rows = self._rows[:n], self._rows[n:]
+        return chunk
+
+
+class CursorConn:
+    def __init__(self, rows):
+        self.rows = rows
+        self.cursor_calls = []
+    def transaction(self): return DummyTransaction()
+    async def cursor(self, query, *args):
+        self.cursor_calls.append((query, args))
+        return DummyCursor(self.rows)
+    async def __aenter__(self): return self
+    async def __aexit__(self, exc_type, exc, tb): pass
+
+
+class DummyPool:
+    def __init__(self, conn): self._conn = conn
+    def acquire(self): return self._conn
+    async def close(self): pass
+
+
+@pytest.mark.asyncio
+async def test_iter_prices_pushes_date_range_into_sql(monkeypatch):
+    env = Environment(EnvironmentType.TEST)
+    conn = CursorConn([{'date': date(2024, 1, 2)}])
+    monkeypatch.setattr('asyncpg.create_pool', AsyncMock(return_value=DummyPool(conn)))
+    dao = DailyPricesTiingoDAO(env)
+    chunks = [c async for c in dao.iter_prices(symbol='AAPL', start_date=date(2024, 1, 1), end_date=date(2024, 1, 31), columns=('date',))]
+    assert chunks == [[{'date': date(2024, 1, 2)}]]
+    query, args = conn.cursor_calls[0]
+    assert query == f"SELECT date FROM {dao.table_name} WHERE symbol = $1 AND date >= $2 AND date <= $3 ORDER BY instrument_id, date"
+    assert args == ('AAPL', date(2024, 1, 1), date(2024, 1, 31))
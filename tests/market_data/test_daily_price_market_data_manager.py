@@ -47,3 +47,52 @@ async def test_update_for_sod_and_get_ohlc(monkeypatch):
     # EOD clears intervals
     await manager.update_for_eod(None, datetime(2024, 1, 2, 16, 0))
     assert manager._intervals == {}
+
+
+@pytest.mark.asyncio
+async def test_prefetch_swaps_in_next_session(monkeypatch):
+    manager = DailyPriceMarketDataManager(prefetch_depth=2)
+    dao = DummyDAO({})
+    monkeypatch.setattr(manager, 'dao', dao)
+    monkeypatch.setattr(manager, '_get_all_symbols', lambda: ['AAPL'])
+    monkeypatch.setattr(manager, '_symbol_to_id', lambda s: 1)
+
+    class DummyRunner:
+        end_date = datetime(2025, 7, 7)
+
+    # 2025-07-03: next sessions are 07-07 (after holiday + weekend), 07-08 is past end_date
+    await manager.update_for_sod(DummyRunner(), datetime(2025, 7, 3, 9, 30))
+    assert list(manager._prefetch) == [date(2025, 7, 7)]
+    await manager._prefetch[date(2025, 7, 7)]
+    assert [d for _, d in dao._calls] == [date(2025, 7, 3), date(2025, 7, 7)]
+    await manager.update_for_eod(None, datetime(2025, 7, 3, 16, 0))
+    # SOD swaps the prefetched buffer without another query
+    await manager.update_for_sod(DummyRunner(), datetime(2025, 7, 7, 9, 30))
+    assert [d for _, d in dao._calls] == [date(2025, 7, 3), date(2025, 7, 7)]
+    assert manager.get_ohlc(1, datetime(2025, 7, 7, 9, 30), datetime(2025, 7, 7, 16, 0))['close'] == 11.0
+    assert manager._prefetch == {}
+
+
+@pytest.mark.asyncio
+async def test_intervals_follow_runner_calendar_early_close(monkeypatch):
+    from calendars.exchange_calendar import ExchangeCalendar
+    manager = DailyPriceMarketDataManager(prefetch_depth=1)
+    dao = DummyDAO({})
+    monkeypatch.setattr(manager, 'dao', dao)
+    monkeypatch.setattr(manager, '_get_all_symbols', lambda: ['AAPL'])
+    monkeypatch.setattr(manager, '_symbol_to_id', lambda s: 1)
+
+    class DummyRunner:
+        end_date = datetime(2024, 7, 5)
+        exchange_calendar = ExchangeCalendar('NYSE')
+
+    await manager.update_for_sod(DummyRunner(), datetime(2024, 7, 2, 9, 30))
+    assert manager._intervals[1].end_date_time == datetime(2024, 7, 2, 16, 0)
+    # 2024-07-03 closes at 13:00; its bounds are prefetched with its prices
+    await manager.update_for_eod(None, datetime(2024, 7, 2, 16, 0))
+    await manager.update_for_sod(DummyRunner(), datetime(2024, 7, 3, 9, 30))
+    assert [d for _, d in dao._calls] == [date(2024, 7, 2), date(2024, 7, 3)]
+    interval = manager._intervals[1]
+    assert (interval.start_date_time, interval.end_date_time) == (datetime(2024, 7, 3, 9, 30), datetime(2024, 7, 3, 13, 0))
+    assert manager.get_ohlc(1, datetime(2024, 7, 3, 9, 30), datetime(2024, 7, 3, 13, 0))['close'] == 11.0
+    manager.cancel_prefetch()
@@ -1,7 +1,8 @@
 # moved from project root
 import unittest
 from datetime import datetime
-from src.market_data.market_data_simulator import simulate_market_data
+import numpy as np
+from src.market_data.market_data_simulator import simulate_market_data, simulate_market_paths, _symbol_rng
 from src.market_data.signals import extract_all_signals
 
 class TestMarketDataSimulatorWithSignals(unittest.TestCase):
@@ -35,5 +36,44 @@ class TestMarketDataSimulatorWithSignals(unittest.TestCase):
             self.assertIn('5m_true_range', signals)
             self.assertIsInstance(signals['5m_true_range'], (int, float))
 
+class TestSimulateMarketPaths(unittest.TestCase):
+    start = datetime(2025, 7, 18, 9, 30)
+
+    def test_random_walk_matches_sequential_floor(self):
+        paths = simulate_market_paths(['AAPL'], self.start, 500, model='random_walk', seed=3, start_price=5.0)
+        steps = _symbol_rng(3, 'AAPL').uniform(-1.0, 1.0, 500)
+        price, expected = 5.0, []
+        for step in steps:
+            price = max(1.0, price + step)
+            expected.append(price)
+        np.testing.assert_allclose(paths['close'][0], expected)
+        self.assertEqual(paths['open'][0, 0], 5.0)
+        np.testing.assert_array_equal(paths['open'][0, 1:], paths['close'][0, :-1])
+
+    def test_reproducible_and_independent_of_symbol_set(self):
+        a = simulate_market_paths(['AAPL', 'MSFT', 'TSLA'], self.start, 100, model='gbm', seed=11)
+        b = simulate_market_paths(['TSLA', 'AAPL'], self.start, 100, model='gbm', seed=11)
+        np.testing.assert_array_equal(a['close'][0], b['close'][1])
+        np.testing.assert_array_equal(a['volume'][2], b['volume'][0])
+        c = simulate_market_paths(['AAPL'], self.start, 100, model='gbm', seed=12)
+        self.assertFalse(np.array_equal(a['close'][0], c['close'][0]))
+
+    def test_ohlc_consistency_and_frame(self):
+        for model in ('random_walk', 'gbm'):
+            p = simulate_market_paths(['A', 'B'], self.start, 50, interval_seconds=300, model=model, seed=1)
+            self.assertEqual(p['close'].shape, (2, 50))
+            self.assertTrue((p['high'] >= np.maximum(p['open'], p['close'])).all())
+            self.assertTrue((p['low'] <= np.minimum(p['open'], p['close'])).all())
+            self.assertTrue((p['low'] > 0).all() and (p['volume'] >= 1).all())
+        frame = simulate_market_paths(['A', 'B'], self.start, 3, interval_seconds=300, seed=1, as_frame=True)
+        self.assertEqual(len(frame), 6)
+        self.assertEqual(list(frame['symbol']), ['A', 'A', 'A', 'B', 'B', 'B'])
+        self.assertEqual(frame['time'].iloc[1], np.datetime64('2025-07-18T09:35:00'))
+
+    def test_unknown_model(self):
+        with self.assertRaises(ValueError):
+            simulate_market_paths(['A'], self.start, 1, model='heston')
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -96,5 +96,50 @@ class TestMarketDataStreamer(unittest.TestCase):
             self.assertIn('high', data['interval_signals'][interval])
             self.assertIn('vwap', data['interval_signals'][interval])
 
+    def test_rolling_stats_match_full_recompute(self):
+        import random
+        rng = random.Random(7)
+        base_time = datetime(2025, 7, 18, 8, 0)
+        history = []
+        t = base_time
+        for _ in range(400):
+            t += timedelta(seconds=rng.randint(1, 120))
+            price, volume = round(rng.uniform(90, 110), 2), rng.randint(1, 500)
+            history.append((t, price, volume))
+            self.streamer.on_tick(DummyTick('AAPL', price, volume, t))
+            data = self.streamer._queue.get_nowait()
+            for interval, delta in self.streamer._window_deltas.items():
+                window = [h for h in history if h[0] >= t - delta]
+                signals = data['interval_signals'][interval]
+                self.assertEqual(signals['high'], max(p for _, p, _ in window))
+                self.assertEqual(signals['low'], min(p for _, p, _ in window))
+                expected_vwap = sum(p * v for _, p, v in window) / sum(v for _, _, v in window)
+                self.assertAlmostEqual(signals['vwap'], expected_vwap, places=6)
+
+    def test_queue_is_unbounded_by_default(self):
+        base_time = datetime(2025, 7, 18, 10, 0)
+        for i in range(50):
+            self.streamer.on_tick(DummyTick('AAPL', 100 + i, 10, base_time + timedelta(seconds=i)))
+        stats = self.streamer.queue_stats()
+        self.assertEqual(stats['maxsize'], 0)
+        self.assertEqual((stats['depth'], stats['dropped']), (50, 0))
+
+    def test_stream_tick_batches_with_bounded_queue(self):
+        import asyncio
+        streamer = MarketDataStreamer(self.ib, ['AAPL', 'MSFT'], queue_maxsize=3, overflow='conflate')
+        streamer.lse_cal = self.streamer.lse_cal
+        base_time = datetime(2025, 7, 18, 10, 0)
+        for i, symbol in enumerate(['AAPL', 'MSFT', 'AAPL', 'AAPL', 'MSFT']):
+            streamer.on_tick(DummyTick(symbol, 100 + i, 10, base_time + timedelta(seconds=i)))
+
+        async def first_batch():
+            return await streamer.stream_tick_batches(max_batch=10, max_wait_ms=1).__anext__()
+        batch = asyncio.run(first_batch())
+        self.assertEqual([(t['symbol'], t['last']) for t in batch], [('AAPL', 100), ('MSFT', 104), ('AAPL', 103)])
+        stats = streamer.queue_stats()
+        self.assertEqual(stats['conflated'], 2)
+        self.assertEqual(stats['depth'], 0)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+from datetime import date, datetime
+from types import SimpleNamespace
+
+from config.environment import Environment, EnvironmentType
+from market_data.daily_price_market_data_manager import DailyPriceMarketDataManager
+from market_data.price_cube import PriceCube, CUBE_FIELDS
+from state.universe_state_builder import UniverseStateBuilder
+
+
+def make_panel():
+    rows = [
+        (date(2024, 1, 2), 7, 10.0),
+        (date(2024, 1, 2), 9, 20.0),
+        (date(2024, 1, 3), 7, 11.0),
+        (date(2024, 1, 3), 99, 1.0),  # not requested
+    ]
+    panel = {
+        'date': np.array([r[0] for r in rows], dtype='datetime64[D]'),
+        'instrument_id': np.array([r[1] for r in rows]),
+    }
+    for f in CUBE_FIELDS:
+        panel[f] = np.array([r[2] * (1000 if f == 'volume' else 1) for r in rows])
+    return panel
+
+
+def test_from_panel_and_slice(tmp_path):
+    cube = PriceCube.from_panel(make_panel(), [9, 7])
+    assert cube.values.shape == (2, 2, len(CUBE_FIELDS))
+    cols = cube.slice(date(2024, 1, 2), [7, 9, 8])
+    assert cols['close'][:2].tolist() == [10.0, 20.0] and np.isnan(cols['close'][2])
+    cols = cube.slice(date(2024, 1, 3), [9, 7])
+    assert np.isnan(cols['close'][0]) and cols['close'][1] == 11.0
+    assert np.isnan(cube.slice(date(2024, 1, 4), [7])['close']).all()
+
+    cube.save(tmp_path / 'cube')
+    loaded = PriceCube.load(tmp_path / 'cube')
+    assert isinstance(loaded.values, np.memmap)
+    assert loaded.fields == CUBE_FIELDS
+    assert loaded.slice(date(2024, 1, 2), [9])['volume'].tolist() == [20000.0]
+    assert PriceCube.load(tmp_path / 'missing') is None
+
+
+class PanelDAO:
+    table_name = 'test_daily_prices'
+    def __init__(self):
+        self.calls = 0
+    async def get_price_panel(self, instrument_ids, start_date, end_date, columns=None):
+        self.calls += 1
+        return make_panel()
+
+
+@pytest.mark.asyncio
+async def test_manager_serves_batches_from_cached_cube(tmp_path):
+    manager = DailyPriceMarketDataManager()
+    manager.dao = PanelDAO()
+    await manager.load_cube([7, 9], date(2024, 1, 2), date(2024, 1, 3), cache_dir=str(tmp_path))
+    # A second manager over the same range reuses the cache file
+    other = DailyPriceMarketDataManager()
+    other.dao = manager.dao
+    await other.load_cube([7, 9], date(2024, 1, 2), date(2024, 1, 3), cache_dir=str(tmp_path))
+    assert manager.dao.calls == 1
+
+    start, end = datetime(2024, 1, 3, 9, 30), datetime(2024, 1, 3, 16, 0)
+    batch = other.get_ohlc_batch([7, 9], start, end)
+    assert batch[7]['close'] == 11.0 and batch[7]['traded_dollar'] == 11.0 * 11000.0
+    assert batch[9] is None
+    cols = other.get_ohlc_columns([7, 9], start, end)
+    assert cols['close'][0] == 11.0 and np.isnan(cols['close'][1])
+
+    env = Environment(EnvironmentType.TEST)
+    env.config.set('universe', 'base_duration', '1d')
+    env.config.set('universe', 'target_durations', '1d')
+    runner = SimpleNamespace(universe_manager=SimpleNamespace(instrument_ids=[7, 9]), market_data_manager=other)
+    intervals = UniverseStateBuilder(env).build_multi_duration_intervals(start, runner)
+    assert list(intervals) == ['1d']
+    assert list(intervals['1d'].instrument_intervals) == [7]
+    assert intervals['1d'].instrument_intervals[7].traded_dollar == 11.0 * 11000.0
+
+
+@pytest.mark.asyncio
+async def test_manager_does_not_serve_daily_bars_for_intraday_intervals(tmp_path):
+    manager = DailyPriceMarketDataManager()
+    manager.dao = PanelDAO()
+    await manager.load_cube([7, 9], date(2024, 1, 2), date(2024, 1, 3), cache_dir=str(tmp_path))
+    start = datetime(2024, 1, 3, 9, 30)
+    # Test config: 30m base bars rolled up into 30m and 60m
+    runner = SimpleNamespace(universe_manager=SimpleNamespace(instrument_ids=[7, 9]), market_data_manager=manager)
+    builder = UniverseStateBuilder(Environment(EnvironmentType.TEST))
+    assert builder.env.get_base_duration().get_duration_string() == '30m'
+    assert np.isnan(manager.get_ohlc_columns([7], start, datetime(2024, 1, 3, 10, 0))['close']).all()
+    assert manager.get_ohlc_batch([7], start, datetime(2024, 1, 3, 10, 0)) == {7: None}
+    volume = 0.0
+    for bar_start in (start, datetime(2024, 1, 3, 10, 0)):
+        for interval in builder.build_multi_duration_intervals(bar_start, runner).values():
+            volume += sum(ii.traded_volume or 0.0 for ii in interval.instrument_intervals.values())
+    assert volume == 0.0
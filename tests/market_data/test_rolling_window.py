@@ -0,0 +1,42 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from market_data.rolling_window import BarWindow, RollingWindow, choose_resolution
+
+
+def test_choose_resolution():
+    assert choose_resolution(timedelta(days=32), 2048) == timedelta(minutes=30)
+    assert choose_resolution(timedelta(days=367), 2048) == timedelta(days=1)
+    assert choose_resolution(timedelta(hours=1), 2048) == timedelta(minutes=1)
+
+
+def test_bar_window_matches_exact_window_at_bar_edges():
+    rng = random.Random(3)
+    resolution = timedelta(hours=1)
+    window = timedelta(days=2)
+    bars, exact = BarWindow(resolution), RollingWindow()
+    t = datetime(2025, 1, 6)
+    max_len = 0
+    for _ in range(5000):
+        t += timedelta(seconds=rng.randint(1, 240))
+        price, volume = round(rng.uniform(50, 150), 2), rng.randint(1, 100)
+        bars.evict_before(t - window)
+        bars.append(t, price, volume)
+        # Exact window over whole bars: anything from the bar containing the cutoff on
+        bar_cutoff = t - window
+        bar_cutoff = bar_cutoff.replace(minute=0, second=0, microsecond=0)
+        exact.evict_before(bar_cutoff)
+        exact.append(t, price, volume)
+        max_len = max(max_len, len(bars))
+        assert bars.high == exact.high and bars.low == exact.low and bars.close == price
+        assert bars.vwap == pytest.approx(exact.vwap)
+    # Memory bounded by window / resolution, independent of tick count
+    assert max_len <= window / resolution + 1
+    assert len(exact) > 10 * max_len
+
+
+def test_bar_window_rejects_uneven_resolution():
+    with pytest.raises(ValueError):
+        BarWindow(timedelta(minutes=7))
@@ -0,0 +1,64 @@
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from market_data import MarketDataStreamer, ShardedMarketDataStreamer
+from market_data.sharded_streamer import shard_for
+
+
+def make_ticks(symbols, n):
+    base = datetime(2025, 7, 18, 9, 0)
+    return [
+        (symbols[i % len(symbols)], 100 + (i * 7) % 13, 10 + i % 5, base + timedelta(seconds=30 * i), None, None)
+        for i in range(n)
+    ]
+
+
+def test_shard_for_is_stable_and_in_range():
+    assert shard_for('AAPL', 4) == shard_for('AAPL', 4)
+    assert {shard_for(f"S{i}", 3) for i in range(50)} == {0, 1, 2}
+
+
+def test_sharded_stream_matches_single_process():
+    symbols = ['AAPL', 'MSFT', 'TSLA', 'IBM', 'GE']
+    ticks = make_ticks(symbols, 200)
+    single = MarketDataStreamer(MagicMock(), symbols)
+    expected = [single.process_tick(*fields) for fields in ticks]
+
+    async def run():
+        sharded = ShardedMarketDataStreamer(symbols, workers=2, batch_size=16)
+        await sharded.start()
+        try:
+            for fields in ticks:
+                sharded.submit(*fields)
+        finally:
+            await sharded.stop()
+        return [sharded._queue.get_nowait() for _ in range(sharded._queue.qsize())], sharded.queue_stats()
+
+    merged, stats = asyncio.run(run())
+    assert stats['enqueued'] == len(ticks) and stats['dropped'] == 0
+    for symbol in symbols:
+        got = [t for t in merged if t['symbol'] == symbol]
+        want = [t for t in expected if t['symbol'] == symbol]
+        assert got == want
+
+
+def test_merged_queue_drops_nothing_by_default():
+    symbols = ['AAPL', 'MSFT', 'TSLA']
+    ticks = make_ticks(symbols, 20000)
+
+    async def run():
+        sharded = ShardedMarketDataStreamer(symbols, workers=2, batch_size=1024)
+        await sharded.start()
+        try:
+            for fields in ticks:
+                sharded.submit(*fields)
+        finally:
+            await sharded.stop()
+        return sharded.queue_stats()
+
+    # Nothing consumes while the workers fill the merged queue
+    stats = asyncio.run(run())
+    assert stats['maxsize'] == 0
+    assert stats['depth'] == stats['enqueued'] == len(ticks)
+    assert stats['dropped'] == 0
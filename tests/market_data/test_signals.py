@@ -1,5 +1,7 @@
 import unittest
-from src.market_data.signals import extract_all_signals
+from src.market_data.signals import extract_all_signals, SignalExtractor
+import numpy as np
+import pyarrow as pa
 from datetime import datetime
 
 class TestExtractAllSignals(unittest.TestCase):
@@ -137,5 +139,52 @@ class TestExtractAllSignals(unittest.TestCase):
         except Exception as e:
             self.fail(f"extract_all_signals raised {e} on string interval_signals")
 
+class TestSignalExtractor(unittest.TestCase):
+    def setUp(self):
+        TestExtractAllSignals.setUp(self)  # self.tick_data
+        self.ticks = [self.tick_data]
+        second = dict(self.tick_data, symbol='MSFT', last=99.0, volume=None)
+        second['interval_signals'] = {'5m': {'high': 100.0}}
+        self.ticks.append(second)
+        self.ticks.append({'symbol': 'TSLA', 'interval_signals': 'notadict'})
+
+    def test_matches_extract_all_signals(self):
+        fields = ['datetime', 'symbol', 'last', 'volume', 'hour_of_day', 'lse_last_open',
+                  '5m_high', '5m_true_range', '1d_close', '1w_high']
+        extractor = SignalExtractor.from_fields(fields, types={'volume': pa.int64()})
+        datetimes = [datetime(2025, 7, 18, 10, 15)] * 3
+        table = extractor.extract(self.ticks, {'datetime': datetimes})
+        self.assertEqual(table.schema, extractor.schema)
+        self.assertEqual(table.schema.field('hour_of_day').type, pa.int64())
+        self.assertEqual(table.schema.field('lse_last_open').type, pa.timestamp('us'))
+        rows = table.to_pylist()
+        for tick, row, dt in zip(self.ticks, rows, datetimes):
+            expected = extract_all_signals(tick)
+            expected['datetime'] = dt
+            self.assertEqual(row, {k: expected.get(k) for k in fields})
+
+    def test_missing_source_column(self):
+        extractor = SignalExtractor.from_fields(['datetime', 'symbol'])
+        with self.assertRaises(KeyError):
+            extractor.extract(self.ticks)
+
+    def test_unprefixed_underscore_field_is_not_an_interval_signal(self):
+        extractor = SignalExtractor.from_fields(['symbol', 'true_range'])
+        with self.assertRaises(KeyError):
+            extractor.extract(self.ticks)
+
+    def test_columns_only(self):
+        extractor = SignalExtractor.from_fields(['symbol', 'volume', '5m_close'], types={'volume': pa.int64()})
+        table = extractor.extract(columns={
+            'symbol': np.array(['AAPL', 'MSFT'], dtype=object),
+            'volume': np.array([10, 20], dtype=np.int64),
+            '5m_close': np.array([1.5, 2.5]),
+        })
+        self.assertEqual(table.schema, extractor.schema)
+        self.assertEqual(table.to_pylist(), [
+            {'symbol': 'AAPL', 'volume': 10, '5m_close': 1.5},
+            {'symbol': 'MSFT', 'volume': 20, '5m_close': 2.5},
+        ])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from market_data.tick_queue import TickQueue
+
+
+def tick(symbol, last):
+    return {'symbol': symbol, 'last': last}
+
+
+def drain(queue):
+    return [queue.get_nowait()['last'] for _ in range(queue.qsize())]
+
+
+def test_drop_oldest(caplog):
+    q = TickQueue(maxsize=3, overflow='drop_oldest')
+    with caplog.at_level('WARNING', logger='market_data.tick_queue'):
+        for i in range(5):
+            assert q.put_nowait(tick('A', i))
+    assert drain(q) == [2, 3, 4]
+    stats = q.stats()
+    assert stats['dropped'] == 2 and stats['max_depth'] == 3 and stats['depth'] == 0
+    # The first drop is logged once
+    assert len([r for r in caplog.records if 'dropping' in r.getMessage()]) == 1
+
+
+def test_conflate_keeps_latest_per_symbol():
+    q = TickQueue(maxsize=2, overflow='conflate')
+    q.put_nowait(tick('A', 1))
+    q.put_nowait(tick('B', 1))
+    q.put_nowait(tick('A', 2))   # replaces A in place
+    q.put_nowait(tick('C', 1))   # no C queued: drops oldest (A)
+    q.put_nowait(tick('C', 2))
+    assert [(t['symbol'], t['last']) for t in (q.get_nowait(), q.get_nowait())] == [('B', 1), ('C', 2)]
+    assert q.stats()['conflated'] == 2 and q.stats()['dropped'] == 1
+
+
+def test_block_rejects_nowait_and_waits_on_put():
+    async def run():
+        q = TickQueue(maxsize=1, overflow='block')
+        assert q.put_nowait(tick('A', 1))
+        assert not q.put_nowait(tick('A', 2))
+        producer = asyncio.create_task(q.put(tick('A', 3)))
+        await asyncio.sleep(0)
+        assert not producer.done()
+        assert (await q.get())['last'] == 1
+        await producer
+        assert (await q.get())['last'] == 3
+        assert q.stats()['rejected'] == 1
+    asyncio.run(run())
+
+
+def test_get_batch_fills_or_times_out():
+    async def run():
+        q = TickQueue()
+        for i in range(5):
+            q.put_nowait(tick('A', i))
+        assert [t['last'] for t in await q.get_batch(3, max_wait=1.0)] == [0, 1, 2]
+        # Two queued, waits up to max_wait for a third that never comes
+        assert [t['last'] for t in await q.get_batch(3, max_wait=0.01)] == [3, 4]
+
+        async def late():
+            await asyncio.sleep(0.01)
+            q.put_nowait(tick('A', 5))
+            q.put_nowait(tick('A', 6))
+        asyncio.create_task(late())
+        assert [t['last'] for t in await q.get_batch(2, max_wait=1.0)] == [5, 6]
+        assert q.stats()['dequeued'] == 7
+    asyncio.run(run())
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        TickQueue(overflow='spill')
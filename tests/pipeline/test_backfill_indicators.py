@@ -0,0 +1,115 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import numpy as np
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from calendars.time_duration import TimeDuration
+from market_data.price_cube import PriceCube
+from pipeline.backfill_indicators import (
+    aggregate_cube, backfill_cube, partition_path, warmup_start, _backfill_chunk,
+)
+from signals.indicator_config import IndicatorConfig
+from signals.indicator_engine import compute_indicators
+from signals.indicator_graph import IndicatorNode
+
+
+def _typical_price(dot):
+    return dot
+
+
+def make_cube(ids=(1, 2, 3), start='2024-01-01', end='2024-03-29', gaps=((2, 10), (3, 40))):
+    dates = np.arange(np.datetime64(start), np.datetime64(end) + 1)
+    dates = dates[np.is_busday(dates)]
+    rng = np.random.default_rng(7)
+    close = 100 + rng.standard_normal((len(dates), len(ids))).cumsum(axis=0)
+    values = np.stack([close - 0.5, close + 1.0, close - 1.0, close, np.full(close.shape, 1000.0)], axis=-1)
+    for iid, row in gaps:
+        values[row, list(ids).index(iid)] = np.nan
+    panel = {'date': np.repeat(dates, len(ids)), 'instrument_id': np.tile(np.asarray(ids), len(dates))}
+    for k, field in enumerate(('open', 'high', 'low', 'close', 'volume')):
+        panel[field] = values[:, :, k].ravel()
+    return PriceCube.from_panel(panel, ids)
+
+
+def run(cube, out_dir, durations=('1d', '1w'), end=date(2024, 3, 29), **kwargs):
+    with ThreadPoolExecutor(2) as executor:
+        return asyncio.run(backfill_cube(
+            cube, date(2024, 2, 1), end, out_dir, [TimeDuration(d) for d in durations],
+            IndicatorConfig.default_config(), chunk_bars=7, executor=executor, **kwargs))
+
+
+def test_warmup_start_covers_required_bars_before_the_start_bucket():
+    assert warmup_start(TimeDuration('1w'), date(2024, 2, 1), 4) == date(2024, 1, 1)
+    assert warmup_start(TimeDuration('1m'), date(2024, 2, 14), 4) == date(2023, 10, 1)
+    daily = warmup_start(TimeDuration('1d'), date(2024, 2, 1), 4)
+    assert np.busday_count(daily, date(2024, 2, 1)) >= 4
+
+
+def test_aggregate_cube_rolls_daily_bars_into_weeks():
+    cube = make_cube()
+    weeks, ends = aggregate_cube(cube, TimeDuration('1w'))
+    assert weeks.dates[0] == np.datetime64('2024-01-01') and ends[0] == np.datetime64('2024-01-08')
+    days = np.asarray(cube.values[:5])
+    week = weeks.values[0]
+    assert np.allclose(week[:, 0], days[0, :, 0])
+    assert np.allclose(week[:, 3], days[-1, :, 3])
+    assert np.allclose(week[:, 1], days[:, :, 1].max(axis=0))
+    assert np.allclose(week[:, 2], days[:, :, 2].min(axis=0))
+    assert np.allclose(week[:, 4], 5000.0)
+
+
+def test_backfill_writes_partitions_matching_the_engine(tmp_path):
+    cube = make_cube()
+    stats = run(cube, tmp_path, sample_size=3)
+    assert stats['1d']['written'] == 42 and stats['1w']['written'] == 9
+    assert stats['1d']['checked'] > 0 and stats['1d']['mismatches'] == 0
+    assert stats['1w']['mismatches'] == 0
+
+    row = cube.date_index(date(2024, 2, 15))
+    window = np.asarray(cube.values[row - 3:row + 1]).transpose(1, 0, 2)
+    expected = compute_indicators(window[:, :, 1], window[:, :, 2], window[:, :, 3], ~np.isnan(window[:, :, 3]))
+    table = pq.read_table(partition_path(tmp_path, '1d', date(2024, 2, 15)))
+    assert table.column('instrument_id').to_pylist() == [1, 2, 3]
+    for name, (values, valid) in expected.items():
+        assert np.allclose(table.column(name).to_numpy(zero_copy_only=False), values, equal_nan=True)
+
+    # Instrument 3 misses 2024-02-27, so its 4-bar indicators are null for three sessions after it
+    dataset = ds.dataset(tmp_path, partitioning='hive')
+    gap = dataset.to_table(filter=(ds.field('duration') == '1d') & (ds.field('instrument_id') == 3)).to_pandas()
+    gap = gap.sort_values('date')
+    assert str(gap['date'].iloc[0]).startswith('2024-02-01') and len(gap) == 41
+    assert gap['EBot'].isna().sum() == 3 and gap['OneOneDot'].notna().all()
+
+
+def test_backfill_resumes_missing_partitions_only(tmp_path):
+    cube = make_cube()
+    run(cube, tmp_path, sample_size=0)
+    missing = partition_path(tmp_path, '1d', date(2024, 3, 5))
+    content = pq.read_table(missing)
+    missing.unlink()
+    stats = run(cube, tmp_path, sample_size=0)
+    assert stats['1d'] == {'written': 1, 'skipped': 41, 'checked': 0, 'mismatches': 0}
+    assert stats['1w']['written'] == 0 and stats['1w']['skipped'] == 9
+    # Rebuilt from warm-up bars before the chunk, identical to the first run
+    assert pq.read_table(missing).equals(content)
+
+
+def test_incomplete_bucket_is_not_written(tmp_path):
+    stats = run(make_cube(), tmp_path, durations=('1w', '1m'), end=date(2024, 3, 27), sample_size=0)
+    weeks = sorted(p.parent.name for p in (tmp_path / 'duration=1w').glob('*/part-0.parquet'))
+    assert weeks[-1] == 'date=2024-03-18' and stats['1w']['written'] == 8
+    assert sorted(p.parent.name for p in (tmp_path / 'duration=1m').glob('*/part-0.parquet')) == ['date=2024-02-01']
+
+
+def test_cross_check_reports_values_that_differ_from_indicator_update(tmp_path):
+    cube_dir = make_cube().save(tmp_path / 'cube')
+    config = IndicatorConfig.default_config()
+    job = (str(cube_dir), '1d', 0, 10, 20, str(tmp_path / 'out'), config, 3, 0)
+    assert _backfill_chunk(job)['mismatches'] == 0
+    # A node that shadows PL with a different formula disagrees with PL.update
+    config.add_node(IndicatorNode('PL', ('dot',), _typical_price))
+    stats = _backfill_chunk((str(cube_dir), '1d', 0, 10, 20, str(tmp_path / 'other'), config, 3, 0))
+    assert stats['written'] == 10 and stats['checked'] == 10 * 3 * 6 and stats['mismatches'] > 0
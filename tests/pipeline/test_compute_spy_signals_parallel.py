@@ -0,0 +1,59 @@
+import importlib.util
+import sys
+import types
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import pytest
+
+from market_data import market_data_simulator, signals
+
+PIPELINE = Path(__file__).resolve().parents[2] / 'src' / 'pipeline' / 'compute_spy_signals_parallel.py'
+
+
+class FixedUniverse:
+    def __init__(self, path):
+        self.path = path
+
+    def get_universe(self, as_of):
+        return ['AAPL', 'MSFT']
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    # The script imports its modules by their old project-root names
+    monkeypatch.setitem(sys.modules, 'spy_universe', types.SimpleNamespace(SPYUniverse=FixedUniverse))
+    monkeypatch.setitem(sys.modules, 'market_data_simulator', market_data_simulator)
+    monkeypatch.setitem(sys.modules, 'signals', signals)
+    monkeypatch.chdir(tmp_path)
+    spec = importlib.util.spec_from_file_location('compute_spy_signals_parallel', PIPELINE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.END_DATE = datetime(2030, 1, 1)
+    return module
+
+
+def run_batch(pipeline, start, size):
+    pipeline.BATCH_SIZE = size
+    pipeline.process_batch(start)
+    table = pq.read_table(f"{pipeline.PARQUET_DIR}/signals_{start.strftime('%Y%m%d_%H%M')}.parquet")
+    return table.filter(pc.equal(table['symbol'], 'AAPL'))
+
+
+def test_day_split_across_batches_continues_one_path(pipeline):
+    # Not aligned to midnight, like START_DATE = utcnow() - ...
+    start = datetime(2024, 3, 5, 0, 2, 17)
+    half = 144
+    first = run_batch(pipeline, start, half)
+    second = run_batch(pipeline, start + half * timedelta(minutes=pipeline.INTERVAL_MINUTES), half)
+    whole = run_batch(pipeline, start, 2 * half)
+    first_close = first['last'].to_numpy()
+    second_close = second['last'].to_numpy()
+    assert not np.array_equal(first_close, second_close[:len(first_close)])
+    # Batches split inside 2024-03-05 write the same rows as one batch covering the day
+    assert first.num_rows + second.num_rows == whole.num_rows
+    np.testing.assert_array_equal(np.concatenate([first_close, second_close]), whole['last'].to_numpy())
+    assert whole['datetime'].to_pylist()[half] == second['datetime'].to_pylist()[0]
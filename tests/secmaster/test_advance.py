@@ -12,8 +12,8 @@ class DummyConn:
         if 'close' in query or 'market_cap' in query:
             # Return dummy close and market_cap for all current members
             return [
-                {'symbol': 'TICK1', 'close': 100.0, 'market_cap': 1000000},
-                {'symbol': 'TICK2', 'close': 200.0, 'market_cap': 2000000},
+                {'instrument_id': 1, 'close': 100.0, 'market_cap': 1000000, 'adv': 1234.56},
+                {'instrument_id': 2, 'close': 200.0, 'market_cap': 2000000, 'adv': 1234.56},
             ]
         return self._rows
     async def __aenter__(self):
@@ -34,11 +34,11 @@ class DummyPool:
 
 @pytest.mark.asyncio
 async def test_advance_membership(monkeypatch):
-    # Membership intervals: (symbol, start_date, end_date)
+    # Membership intervals: (instrument_id, start_date, end_date)
     events = [
-        {'symbol': 'TICK1', 'start_date': date(2020,1,1), 'end_date': date(2020,6,1)},
-        {'symbol': 'TICK1', 'start_date': date(2021,1,1), 'end_date': None},
-        {'symbol': 'TICK2', 'start_date': date(2020,3,1), 'end_date': None},
+        {'instrument_id': 1, 'start_date': date(2020,1,1), 'end_date': date(2020,6,1)},
+        {'instrument_id': 1, 'start_date': date(2021,1,1), 'end_date': None},
+        {'instrument_id': 2, 'start_date': date(2020,3,1), 'end_date': None},
     ]
     async def dummy_create_pool(db_url):
         return DummyPool(events)
@@ -49,19 +49,19 @@ async def test_advance_membership(monkeypatch):
     mock_env.get_database_url.return_value = 'postgresql://test/test'
     secm = SecMaster(mock_env, as_of_date=date(2020,1,1))
     members = await secm.get_spy_membership()
-    assert set(members) == {'TICK1'}
+    assert set(members) == {1}
 
-    # Advance to 2020-03-01 (TICK2 added)
+    # Advance to 2020-03-01 (instrument 2 added)
     try:
         members = await secm.advance(date(2020,3,1))
     except KeyError as e:
         print(f"[DEBUG] KeyError: {e}")
         import traceback; traceback.print_exc()
         raise
-    assert set(members) == {'TICK1', 'TICK2'}
-    # Advance to 2020-06-01 (TICK1 removed)
+    assert set(members) == {1, 2}
+    # Advance to 2020-06-01 (instrument 1 removed)
     members = await secm.advance(date(2020,6,1))
-    assert set(members) == {'TICK2'}
-    # Advance to 2021-01-01 (TICK1 re-added)
+    assert set(members) == {2}
+    # Advance to 2021-01-01 (instrument 1 re-added)
     members = await secm.advance(date(2021,1,1))
-    assert set(members) == {'TICK1', 'TICK2'}
+    assert set(members) == {1, 2}
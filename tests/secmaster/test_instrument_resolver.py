@@ -0,0 +1,93 @@
+import pytest
+from datetime import date, datetime
+
+from config.environment import Environment, EnvironmentType
+from secmaster.instrument_resolver import InstrumentResolver
+
+
+def xref(id, instrument_id, vendor_id, symbol, start_at, end_at=None, updated_at=None):
+    return {
+        'id': id, 'instrument_id': instrument_id, 'vendor_id': vendor_id, 'symbol': symbol,
+        'start_at': start_at, 'end_at': end_at, 'updated_at': updated_at or datetime(2024, 1, 1),
+    }
+
+
+class DummyConn:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+    async def fetch(self, query, *args):
+        self.queries.append((query, args))
+        if 'WHERE id >' in query:
+            return [r for r in self.rows if r['id'] > args[0] or (len(args) > 1 and r['updated_at'] > args[1])]
+        return list(self.rows)
+    async def __aenter__(self): return self
+    async def __aexit__(self, exc_type, exc, tb): pass
+
+
+class DummyPool:
+    def __init__(self, conn): self._conn = conn
+    def acquire(self): return self._conn
+    async def close(self): pass
+
+
+@pytest.fixture
+def rows():
+    return [
+        # Ticker 'FB' reused: instrument 1 until 2022-06-08, then instrument 2 under 'META'
+        xref(1, 1, 10, 'FB', datetime(2012, 5, 18), datetime(2022, 6, 8)),
+        xref(2, 2, 10, 'META', datetime(2022, 6, 9)),
+        xref(3, 3, 10, 'FB', datetime(2023, 1, 1)),
+        xref(4, 4, 20, 'FB', datetime(2010, 1, 1)),
+    ]
+
+
+@pytest.fixture
+def resolver(monkeypatch, rows):
+    conn = DummyConn(rows)
+    async def create_pool(db_url):
+        return DummyPool(conn)
+    monkeypatch.setattr('asyncpg.create_pool', create_pool)
+    r = InstrumentResolver(Environment(EnvironmentType.TEST))
+    r.conn = conn
+    return r
+
+
+@pytest.mark.asyncio
+async def test_resolve_point_in_time(resolver):
+    await resolver.load()
+    assert resolver.resolve('FB', 10, date(2020, 1, 2)) == 1
+    assert resolver.resolve('FB', 10, date(2022, 6, 8)) == 1
+    assert resolver.resolve('FB', 10, date(2024, 1, 2)) == 3
+    assert resolver.resolve('META', 10, date(2024, 1, 2)) == 2
+    # Without vendor the latest covering interval across vendors wins
+    assert resolver.resolve('FB', None, date(2020, 1, 2)) == 1
+    assert resolver.resolve('FB', 20, date(2020, 1, 2)) == 4
+    # Without a date the latest interval wins
+    assert resolver.resolve('FB', 10) == 3
+    with pytest.raises(ValueError):
+        resolver.resolve('FB', 10, date(2022, 10, 1))
+    with pytest.raises(ValueError):
+        resolver.resolve('NOPE', 10, date(2020, 1, 2))
+
+
+@pytest.mark.asyncio
+async def test_resolve_many_matches_resolve(resolver):
+    await resolver.load()
+    symbols = ['FB', 'FB', 'META', 'FB', 'NOPE', 'FB']
+    dates = [date(2020, 1, 2), date(2024, 1, 2), date(2024, 1, 2), date(2022, 10, 1), date(2020, 1, 2), None]
+    assert resolver.resolve_many(symbols, dates, vendor_id=10) == [1, 3, 2, None, None, 3]
+    assert resolver.resolve_many(['FB', 'META'], date(2024, 1, 2), vendor_id=10) == [3, 2]
+
+
+@pytest.mark.asyncio
+async def test_lookup_refreshes_incrementally_on_miss(resolver, rows):
+    assert await resolver.lookup('FB', 10, date(2020, 1, 2)) == 1
+    rows.append(xref(5, 5, 10, 'NEW', datetime(2024, 1, 1)))
+    assert await resolver.lookup('NEW', 10, date(2024, 2, 1)) == 5
+    assert 'WHERE id >' in resolver.conn.queries[-1][0]
+    # An updated interval replaces the old one for the same xref id
+    rows[0] = xref(1, 1, 10, 'FB', datetime(2012, 5, 18), datetime(2019, 1, 1), updated_at=datetime(2024, 6, 1))
+    await resolver.refresh()
+    with pytest.raises(ValueError):
+        resolver.resolve('FB', 10, date(2020, 1, 2))
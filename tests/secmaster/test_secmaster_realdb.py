@@ -25,11 +25,11 @@ async def test_get_spy_membership_real_db(unit_test_db):
         await conn.execute(f"INSERT INTO {env.get_table_name('universe')} (name, description) VALUES ('S&P 500', 'S&P 500 index') RETURNING id")
         universe_id_row = await conn.fetchrow(f"SELECT id FROM {env.get_table_name('universe')} WHERE name = 'S&P 500'")
         universe_id = universe_id_row['id']
-        await conn.execute(f"INSERT INTO {env.get_table_name('universe_membership')} (universe_id, symbol, start_at) VALUES ($1, 'AAPL', $2)", universe_id, date(2025, 7, 1))
+        await conn.execute(f"INSERT INTO {env.get_table_name('universe_membership')} (universe_id, symbol, instrument_id, start_at) VALUES ($1, 'AAPL', $2, $3)", universe_id, 101, date(2025, 7, 1))
 
     # Now test get_spy_membership
     members = await secm.get_spy_membership()
-    assert 'AAPL' in members
+    assert 101 in members
 
     # Clean up
     async with pool.acquire() as conn:
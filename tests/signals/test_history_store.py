@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from calendars.time_duration import TimeDuration
+from config.environment import Environment, EnvironmentType
+from signals.history_store import HistoryStore, IntervalRing, bars_for_days
+from signals.indicator import UniverseState
+from signals.indicator_config import IndicatorConfig
+from signals.indicator_engine import compute_indicators, history_arrays
+from state.instrument_interval import InstrumentInterval
+from state.universe_interval import UniverseInterval
+
+
+def make_interval(k, ids, bad=()):
+    start = datetime(2024, 1, 2, 9, 30) + timedelta(minutes=5 * k)
+    end = start + timedelta(minutes=5)
+    return UniverseInterval(start_date_time=start, end_date_time=end, instrument_intervals={
+        iid: InstrumentInterval(iid, start, end, 100 + k, 101 + k + iid, 99 + k, 100.5 + k, 10 * k, 1000 * k,
+                                'invalid' if iid in bad else 'ok')
+        for iid in ids
+    })
+
+
+def test_ring_windows_are_bounded_read_only_views():
+    ring = IntervalRing(capacity=4, instrument_capacity=1)
+    for k in range(10):
+        ids = [1, 2] if k < 7 else [1, 2, 3]
+        ring.append(make_interval(k, ids, bad={2} if k == 8 else ()))
+    assert len(ring) == 4 and ring.appended == 10
+    close = ring.window('close')
+    assert close.shape == (4, 3)
+    np.testing.assert_array_equal(close[:, 0], [106.5, 107.5, 108.5, 109.5])
+    assert np.isnan(ring.window('high', 2)).sum() == 0
+    assert ring.window('ok')[:, 1].tolist() == [True, True, False, True]
+    # id 3 first appears at k=7, after the oldest held interval
+    assert not ring.window('ok')[0, 2] and np.isnan(close[0, 2]) and close[1, 2] == 107.5
+    assert ring.times(1)[0] == np.datetime64(datetime(2024, 1, 2, 9, 30) + timedelta(minutes=45))
+    assert np.shares_memory(close, ring._data['close'])
+    with pytest.raises(ValueError):
+        close[0, 0] = 1.0
+    size = ring.nbytes()
+    for k in range(10, 200):
+        ring.append(make_interval(k, [1, 2, 3]))
+    assert ring.nbytes() == size
+
+
+def test_history_arrays_match_object_history():
+    ring = IntervalRing(capacity=6)
+    state = UniverseState(history=ring)
+    for k in range(40):
+        state.add_interval(make_interval(k, [1, 2, 3], bad={3} if k % 7 == 0 else ()))
+    assert len(state.intervals) <= 12 and all(len(h) <= 12 for h in state.instrument_history.values())
+    from_ring = ring.history_arrays(5)
+    from_objects = history_arrays(state.instrument_history, 5)
+    for a, b in zip(from_ring, from_objects):
+        np.testing.assert_array_equal(a, b)
+    short = IntervalRing(capacity=6)
+    short.append(make_interval(0, [1]))
+    arrays = short.history_arrays(4)
+    results = compute_indicators(arrays.high, arrays.low, arrays.close, arrays.ok)
+    assert results['OneOneDot'][1].tolist() == [True] and results['PL'][1].tolist() == [False]
+
+
+def test_reset_clears_history_ring():
+    ring = IntervalRing(capacity=4)
+    state = UniverseState(history=ring)
+    for k in range(6):
+        state.add_interval(make_interval(k, [1, 2]))
+    state.reset()
+    assert len(ring) == 0 and ring.instrument_ids == []
+    assert ring.window('close').shape == (0, 0)
+    state.add_interval(make_interval(10, [3]))
+    assert ring.window('close').tolist() == [[110.5]]
+    assert ring.history_arrays(2).ok.tolist() == [[False, True]]
+
+
+def test_store_sized_from_environment():
+    env = Environment(EnvironmentType.TEST)
+    durations = [TimeDuration.create_5_minutes(), TimeDuration.create_daily()]
+    store = HistoryStore.from_environment(env, durations)
+    days = int(env.get('trading', 'indicator_lookback_days'))
+    assert store.capacities == {'5m': days * 78, '1d': days}
+    assert bars_for_days(TimeDuration.create_weekly(), 252) == 51
+    # Indicator requirements win when the configured lookback is shorter
+    env.get = lambda section, key, default=None: 0 if key == 'indicator_lookback_days' else default
+    store = HistoryStore.from_environment(env, durations, IndicatorConfig.default_config())
+    assert store.capacities == {'5m': 4, '1d': 4}
+    store.append('1d', make_interval(0, [1]))
+    assert store.window('1d', 'close').shape == (1, 1)
+    with pytest.raises(KeyError):
+        store.append('1w', make_interval(0, [1]))
@@ -0,0 +1,68 @@
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from signals.indicator import PL, OneOneHigh, OneOneLow, OneOneDot, EBot, ETop
+from signals.indicator_engine import INDICATOR_LOOKBACK, compute_indicators, history_arrays, to_indicator_intervals
+from state.instrument_interval import InstrumentInterval
+
+CLASSES = {'PL': PL, 'OneOneHigh': OneOneHigh, 'OneOneLow': OneOneLow,
+           'OneOneDot': OneOneDot, 'EBot': EBot, 'ETop': ETop}
+
+
+def random_history(n_instruments, seed=0):
+    rng = random.Random(seed)
+    base = datetime(2024, 1, 1)
+    history = {}
+    for iid in range(n_instruments):
+        intervals = []
+        for d in range(rng.randint(0, 7)):
+            low = rng.uniform(50, 100)
+            high = low + rng.uniform(0, 5)
+            close = rng.uniform(low, high)
+            status = 'ok' if rng.random() > 0.15 else rng.choice(['invalid', 'halted', None])
+            t = base + timedelta(days=d)
+            intervals.append(InstrumentInterval(iid, t, t, low, high, low, close, 100, 1000, status))
+        history[iid] = intervals
+    return history
+
+
+def test_matches_per_object_indicators():
+    history = random_history(400)
+    arrays = history_arrays(history, lookback=5)
+    results = compute_indicators(arrays.high, arrays.low, arrays.close, arrays.ok)
+    assert set(results) == set(INDICATOR_LOOKBACK)
+    for row, iid in enumerate(arrays.instrument_ids):
+        for name, cls in CLASSES.items():
+            indicator = cls()
+            indicator.update(history[iid])
+            values, valid = results[name]
+            assert valid[row] == (indicator.status == 'ok'), (name, iid)
+            if indicator.status == 'ok':
+                assert values[row] == pytest.approx(indicator.get_value(), rel=1e-12)
+            else:
+                assert np.isnan(values[row])
+
+
+def test_short_lookback_and_unknown_name():
+    history = random_history(20, seed=1)
+    arrays = history_arrays(history, lookback=3)
+    results = compute_indicators(arrays.high, arrays.low, arrays.close, arrays.ok, names=['EBot', 'PL'])
+    assert not results['EBot'][1].any()
+    with pytest.raises(KeyError):
+        compute_indicators(arrays.high, arrays.low, arrays.close, arrays.ok, names=['RSI'])
+
+
+def test_to_indicator_intervals():
+    history = random_history(10, seed=2)
+    arrays = history_arrays(history, lookback=4)
+    results = compute_indicators(arrays.high, arrays.low, arrays.close, arrays.ok, names=['OneOneDot'])
+    start, end = datetime(2024, 1, 8), datetime(2024, 1, 9)
+    intervals = to_indicator_intervals(arrays.instrument_ids, results, start, end)
+    for row, iid in enumerate(arrays.instrument_ids.tolist()):
+        dot = OneOneDot()
+        dot.update(history[iid])
+        assert intervals[iid].get_indicator_status('OneOneDot') == dot.status
+        assert intervals[iid].get_indicator_value('OneOneDot') == dot.get_value()
@@ -0,0 +1,87 @@
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from signals.indicator import PL, EBot
+from signals.indicator_config import IndicatorConfig
+from signals.indicator_graph import IndicatorNode, IndicatorPlan
+from state.instrument_interval import InstrumentInterval
+
+
+def random_bars(n_instruments, n_bars, seed=0):
+    rng = random.Random(seed)
+    base = datetime(2024, 1, 1)
+    bars = []
+    for d in range(n_bars):
+        row = []
+        for iid in range(n_instruments):
+            low = rng.uniform(50, 100)
+            high = low + rng.uniform(0, 5)
+            status = 'ok' if rng.random() > 0.1 else 'invalid'
+            t = base + timedelta(days=d)
+            row.append(InstrumentInterval(iid, t, t, low, high, low, rng.uniform(low, high), 100, 1000, status))
+        bars.append(row)
+    return bars
+
+
+def columns(row):
+    return ({'high': np.array([i.high for i in row]), 'low': np.array([i.low for i in row]),
+             'close': np.array([i.close for i in row])},
+            np.array([i.status == 'ok' for i in row]))
+
+
+def test_plan_matches_list_based_indicators():
+    config = IndicatorConfig.default_config()
+    plan = config.build_plan()
+    names = [node.name for node in plan.nodes]
+    assert names.index('dot') < names.index('OneOneLow') < names.index('EBot')
+    state = plan.new_state()
+    bars = random_bars(30, 40)
+    histories = {iid: [] for iid in range(30)}
+    for row in bars:
+        results = plan.update(state, *columns(row))
+        for iid, interval in enumerate(row):
+            histories[iid].append(interval)
+            for name, cls in config.indicators.items():
+                reference = cls()
+                reference.update(histories[iid])
+                values, valid = results[name]
+                assert valid[iid] == (reference.status == 'ok'), (name, iid)
+                if valid[iid]:
+                    assert values[iid] == reference.get_value()
+    # The shared typical price is evaluated once per bar, not once per consumer
+    assert plan.evaluations['dot'] == len(bars)
+    assert state.depths['dot'] == 3 and state.depths['OneOneLow'] == 4 and len(state.values['dot']) == 3
+
+
+def test_custom_nodes_aliases_and_errors():
+    config = IndicatorConfig(indicators={'pl': PL})
+    config.add_node(IndicatorNode('Range', ('high', 'low'), lambda high, low: high - low))
+    config.add_node(IndicatorNode('EBotMinusPL', ('EBot', 'PL'), lambda ebot, pl: ebot - pl))
+    plan = config.build_plan()
+    assert plan.outputs == ['pl', 'Range', 'EBotMinusPL']
+    state = plan.new_state()
+    history = []
+    for row in random_bars(1, 10, seed=4):
+        for interval in row:
+            interval.status = 'ok'
+        history.append(row[0])
+        results = plan.update(state, *columns(row))
+        ebot, pl = EBot(), PL()
+        ebot.update(history)
+        pl.update(history)
+        assert results['Range'][0][0] == row[0].high - row[0].low
+        assert results['pl'][0][0] == pytest.approx(pl.get_value() if pl.status == 'ok' else np.nan, nan_ok=True)
+        if ebot.status == 'ok':
+            assert results['EBotMinusPL'][0][0] == pytest.approx(ebot.get_value() - pl.get_value())
+        else:
+            assert not results['EBotMinusPL'][1][0]
+
+    config.add_node(IndicatorNode('A', ('B',), lambda b: b))
+    config.add_node(IndicatorNode('B', ('A',), lambda a: a))
+    with pytest.raises(ValueError):
+        config.build_plan()
+    with pytest.raises(KeyError):
+        IndicatorPlan.build({'X': IndicatorNode('X', ('nope',), lambda v: v)}, ['X'])
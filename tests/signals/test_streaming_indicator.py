@@ -0,0 +1,52 @@
+import random
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+from signals.indicator_config import IndicatorConfig
+from signals.streaming_indicator import StreamingPL, StreamingEBot
+from state.instrument_interval import InstrumentInterval
+
+
+def random_intervals(n, seed=0):
+    rng = random.Random(seed)
+    base = datetime(2024, 1, 1)
+    out = []
+    for d in range(n):
+        low = rng.uniform(50, 100)
+        high = low + rng.uniform(0, 5)
+        status = 'ok' if rng.random() > 0.1 else rng.choice(['invalid', None])
+        t = base + timedelta(minutes=d)
+        out.append(InstrumentInterval(1, t, t, low, high, low, rng.uniform(low, high), 100, 1000, status))
+    return out
+
+
+def test_streaming_matches_list_based_indicators():
+    config = IndicatorConfig.default_config()
+    streaming = config.create_streaming_instances()
+    history = []
+    for interval in random_intervals(300):
+        history.append(interval)
+        for name, indicator in streaming.items():
+            indicator.update(interval)
+            reference = config.indicators[name]()
+            reference.update(history)
+            assert indicator.status == reference.status, (name, len(history))
+            assert indicator.get_value() == reference.get_value(), (name, len(history))
+
+
+def test_slots_and_reset():
+    ebot = StreamingEBot()
+    assert not hasattr(ebot, '__dict__')
+    footprint = sys.getsizeof(ebot) + sys.getsizeof(ebot._terms) + sys.getsizeof(ebot._ok)
+    assert footprint < 400
+    for interval in random_intervals(5, seed=3):
+        interval.status = 'ok'
+        ebot.update(interval)
+    assert ebot.status == 'ok'
+    ebot.reset()
+    assert ebot.status is None and ebot.get_value() is None
+    pl = StreamingPL()
+    with pytest.raises(AttributeError):
+        pl.extra = 1
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from datetime import datetime, timedelta
+
+from calendars.time_duration import TimeDuration
+from state.bar_rollup import BarRollup
+
+
+def bar(o, h, l, c, v):
+    return {'open': np.array(o, float), 'high': np.array(h, float), 'low': np.array(l, float),
+            'close': np.array(c, float), 'volume': np.array(v, float)}
+
+
+def durations(*names):
+    return [TimeDuration(n) for n in names]
+
+
+def test_intraday_buckets_complete_on_last_base_bar():
+    rollup = BarRollup(TimeDuration('5m'), durations('5m', '15m', '1d'))
+    t0 = datetime(2024, 1, 2, 9, 30)
+    emitted = []
+    for k, price in enumerate([10.0, 12.0, 11.0]):
+        emitted.append(rollup.update(t0 + timedelta(minutes=5 * k), [1, 2],
+                                     bar([price, 100], [price + 1, 101], [price - 1, 99], [price, np.nan], [100, 0])))
+    assert [sorted(e) for e in emitted] == [['5m'], ['5m'], ['15m', '5m']]
+    bar15 = emitted[2]['15m']
+    assert (bar15.start_date_time, bar15.end_date_time) == (t0, t0 + timedelta(minutes=15))
+    inst = bar15.instrument_intervals
+    assert list(inst) == [1]
+    assert (inst[1].open, inst[1].high, inst[1].low, inst[1].close) == (10.0, 13.0, 9.0, 11.0)
+    assert inst[1].traded_volume == 300 and inst[1].traded_dollar == 100 * (10 + 12 + 11)
+    daily = rollup.close_day()
+    assert list(daily) == ['1d'] and daily['1d'].instrument_intervals[1].close == 11.0
+    assert rollup.flush() == {}
+
+
+def test_date_buckets_emit_on_boundary_and_handle_universe_changes():
+    rollup = BarRollup(TimeDuration('1d'), durations('1d', '1w', '1m'))
+    # Thu 2024-02-29, Fri 03-01, Mon 03-04
+    r1 = rollup.update(datetime(2024, 2, 29, 9, 30), [1], bar([10], [11], [9], [10], [5]))
+    # The last day of February closes the monthly bucket with its own bar
+    assert sorted(r1) == ['1d', '1m']
+    assert r1['1m'].start_date_time == datetime(2024, 2, 1) and list(r1['1m'].instrument_intervals) == [1]
+    r2 = rollup.update(datetime(2024, 3, 1, 9, 30), [2, 1], bar([50, 10], [52, 12], [49, 8], [51, 11], [1, 5]))
+    assert list(r2) == ['1d']
+    r3 = rollup.update(datetime(2024, 3, 4, 9, 30), [1], bar([12], [13], [11], [12], [5]))
+    week = r3['1w']
+    assert week.start_date_time == datetime(2024, 2, 26) and week.end_date_time == datetime(2024, 3, 4)
+    assert week.instrument_intervals[1].high == 12 and week.instrument_intervals[1].open == 10
+    assert week.instrument_intervals[2].open == 50
+    assert sorted(r3) == ['1d', '1w']
+    rest = rollup.flush()
+    assert sorted(rest) == ['1m', '1w']
+    assert set(rest['1m'].instrument_intervals) == {1, 2}
+
+
+def test_rejects_incompatible_durations():
+    with pytest.raises(ValueError):
+        BarRollup(TimeDuration('1d'), durations('60m'))
+    with pytest.raises(ValueError):
+        BarRollup(TimeDuration('15m'), durations('5m'))